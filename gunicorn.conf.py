@@ -0,0 +1,52 @@
+"""
+멀티 워커 실행 설정 (gunicorn + uvicorn 워커)
+
+    gunicorn -c gunicorn.conf.py --bind 0.0.0.0:8000 src.main:app
+
+- preload_app: 마스터에서 앱을 import 하고 읽기 전용 상태를 만든 뒤 fork (src/utils/preload.py)
+- fork 직후 마스터에서 만들어진 asyncio DB/Redis 풀을 워커 것으로 초기화 (post_fork)
+- 워커별 LLM/DB 연결 풀 준비는 앱 startup 이벤트에서 실행
+- /metrics 는 METRICS_MULTIPROC_DIR 의 워커별 스냅샷을 합산해서 응답 (src/utils/metrics_multiproc.py)
+"""
+import multiprocessing
+import os
+import tempfile
+
+# settings 를 읽기 전에 지정해야 마스터와 모든 워커가 같은 디렉터리를 사용
+os.environ.setdefault("METRICS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "ai-trinity-metrics"))
+
+from src.config import settings  # noqa: E402
+
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = settings.WORKERS or multiprocessing.cpu_count()
+preload_app = True
+timeout = settings.WORKER_TIMEOUT
+graceful_timeout = 30
+keepalive = 5
+
+
+def on_starting(server):
+    # 이전 실행의 워커 메트릭 파일 정리
+    from src.utils.metrics_multiproc import multiprocess_metrics
+    multiprocess_metrics.reset_directory()
+
+
+def when_ready(server):
+    # 워커 fork 직전 (preload_app 으로 앱 import 는 이미 끝난 상태)
+    from src.utils.preload import preload_shared_state
+    preload_shared_state()
+    server.log.info(f"워커 {workers}개 시작")
+
+
+def post_fork(server, worker):
+    from src.utils.preload import reset_after_fork
+    reset_after_fork()
+
+
+def child_exit(server, worker):
+    # 종료된 워커의 카운터는 dead.json 에 합쳐 합계가 줄어들지 않도록
+    from src.utils.metrics_multiproc import multiprocess_metrics
+    try:
+        multiprocess_metrics.retire(worker.pid)
+    except Exception as e:
+        server.log.warning(f"워커 {worker.pid} 메트릭 보관 실패: {e}")
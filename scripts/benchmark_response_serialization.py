@@ -0,0 +1,128 @@
+"""
+체력 분석 응답 직렬화 벤치마크 (FastAPI 응답 경로와 같은 순서로 실행)
+
+- legacy: 중첩 dict 조립 -> data: Dict[str, Any] 모델 검증/직렬화 -> json.dumps (JSONResponse)
+- typed:  프로필 dict 를 PercentileResponse 로 한 번 검증 -> model_response (재검증 없이 orjson.dumps)
+
+사용 예:
+    python -m scripts.benchmark_response_serialization --requests 20000
+"""
+import argparse
+import json
+import random
+import time
+from typing import Any, Dict
+
+from pydantic import BaseModel, TypeAdapter
+
+from src.api.models.response import PercentileResponse, PercentileData, model_response
+
+COMPONENTS = ['근력', '심폐지구력', '코어', '유연성', '민첩성', '체성분']
+
+
+class LegacyPercentileResponse(BaseModel):
+    """기존 응답 모델 (data 가 Dict[str, Any])"""
+
+    status: str
+    data: Dict[str, Any]
+    message: str
+
+
+LEGACY_ADAPTER = TypeAdapter(LegacyPercentileResponse)
+
+
+def make_profile():
+    profile = {
+        'user_info': {'gender': 'M', 'age': random.randint(20, 69), 'bmi': 23.5, 'age_group': '20-29세'},
+        'percentiles': {
+            component: {'percentile': random.randint(1, 99), 'grade': '평균'} for component in COMPONENTS
+        },
+        'average_score': 52.3,
+    }
+    persona = {
+        'name': '두 개의 심장 타입',
+        'emoji': '🏃',
+        'description': '심폐지구력이 탁월한 지구력형 타입',
+        'characteristics': ['뛰어난 심폐지구력', '장거리 운동에 강함', '러닝/사이클링 등 유산소 운동 선호'],
+        'recommendation': '근력 운동을 추가하여 부상을 예방하세요.',
+        'type': 'CARDIO_MASTER',
+    }
+    return profile, persona, '체력 측정을 완료했어요! 💪\n\n' * 20
+
+
+def build_legacy(profile, persona, llm_report):
+    """기존 calculate_percentile 응답 조립"""
+    api_percentiles = {}
+    for component, data in profile['percentiles'].items():
+        api_percentiles[component] = {'percentile': data['percentile']}
+    api_persona = {
+        'name': persona['name'],
+        'emoji': persona['emoji'],
+        'description': persona['description'],
+        'characteristics': persona['characteristics'],
+        'recommendation': persona['recommendation']
+    }
+    response_data = {
+        "user_info": profile['user_info'],
+        "average_score": profile.get('average_score'),
+        "percentiles": api_percentiles,
+        "persona": api_persona,
+        "llm_report": llm_report,
+    }
+    return LegacyPercentileResponse(status="success", data=response_data, message="백분위 계산이 완료되었습니다.")
+
+
+def build_typed(profile, persona, llm_report):
+    """현재 calculate_percentile 응답 조립"""
+    return PercentileResponse(
+        status="success",
+        data=PercentileData(
+            user_info=profile['user_info'],
+            average_score=profile.get('average_score'),
+            percentiles=profile['percentiles'],
+            persona=persona,
+            llm_report=llm_report
+        ),
+        message="백분위 계산이 완료되었습니다."
+    )
+
+
+def render_legacy(model):
+    # response_model 재검증 -> JSON 호환 값 -> JSONResponse.render
+    content = LEGACY_ADAPTER.dump_python(LEGACY_ADAPTER.validate_python(model.model_dump()), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def render_typed(model):
+    return model_response(model).body
+
+
+def run_case(name, build_fn, render_fn, samples, n):
+    size = 0
+    started = time.perf_counter()
+    for i in range(n):
+        body = render_fn(build_fn(*samples[i % len(samples)]))
+        size += len(body)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<8} {n:>7}회  {elapsed * 1e6 / n:>8.1f} us/응답  {size / n:>7.0f} bytes/응답")
+
+
+def main(args):
+    random.seed(42)
+    samples = [make_profile() for _ in range(100)]
+
+    # 두 방식의 응답 본문이 같은지 먼저 확인
+    legacy_body = json.loads(render_legacy(build_legacy(*samples[0])))
+    typed_body = json.loads(render_typed(build_typed(*samples[0])))
+    assert legacy_body == typed_body, "응답 본문이 다릅니다"
+
+    print(f"응답 {args.requests}회 조립 + 검증 + 직렬화")
+    print("-" * 56)
+    run_case("legacy", build_legacy, render_legacy, samples, args.requests)
+    run_case("typed", build_typed, render_typed, samples, args.requests)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="체력 분석 응답 직렬화 벤치마크")
+    parser.add_argument("--requests", type=int, default=20000)
+    main(parser.parse_args())
@@ -0,0 +1,124 @@
+"""
+주간 루틴 저장 방식 벤치마크 (SQLite)
+
+- legacy: SELECT -> DELETE x2 -> 일자별 ExercisePlan INSERT + flush -> ExerciseList 개별 add
+- bulk:   DELETE x2 -> exercise_plan 다중 행 INSERT -> exercise_list 다중 행 INSERT
+
+사용 예:
+    python -m scripts.benchmark_routine_persistence --users 200 --rounds 5
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import event, select, delete
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from src.database.models import Base, ExercisePlan, ExerciseList
+from src.database.repository import ExercisePlanRepository
+
+
+def make_plans(exercise_ids, per_day=5):
+    return [
+        {
+            "day": day,
+            "title": f"{day}일차",
+            "description": "벤치마크 루틴",
+            "image": "https://example.com/1.png",
+            "exercises": [
+                {"exercise_id": ex_id, "sequence": seq}
+                for seq, ex_id in enumerate(random.sample(exercise_ids, per_day), 1)
+            ]
+        }
+        for day in range(1, 8)
+    ]
+
+
+async def save_legacy(db, user_id, plans):
+    """기존 create_new_routine 저장 로직"""
+    existing_plans = (await db.execute(
+        select(ExercisePlan.id).where(ExercisePlan.user_id == user_id)
+    )).scalars().all()
+
+    if existing_plans:
+        await db.execute(
+            delete(ExerciseList).where(ExerciseList.exercise_plan_id.in_(list(existing_plans)))
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(
+            delete(ExercisePlan).where(ExercisePlan.user_id == user_id)
+            .execution_options(synchronize_session=False)
+        )
+
+    for plan in plans:
+        new_plan = ExercisePlan(
+            user_id=user_id,
+            day=plan["day"],
+            title=plan["title"],
+            description=plan["description"],
+            progress=False,
+            image=plan["image"]
+        )
+        db.add(new_plan)
+        await db.flush()
+
+        for item in plan["exercises"]:
+            db.add(ExerciseList(
+                exercise_plan_id=new_plan.id,
+                exercise_id=item["exercise_id"],
+                sequence=item["sequence"]
+            ))
+
+
+async def save_bulk(db, user_id, plans):
+    await ExercisePlanRepository(db).replace_weekly_routine(user_id, plans)
+
+
+async def run_case(name, save_fn, session_factory, users, rounds, exercise_ids, counter):
+    counter["n"] = 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for user_id in range(1, users + 1):
+            async with session_factory() as db:
+                await save_fn(db, user_id, make_plans(exercise_ids))
+                await db.commit()
+    elapsed = time.perf_counter() - started
+    total = users * rounds
+    print(f"{name:<8} {total:>6}회  {elapsed * 1000 / total:>8.3f} ms/루틴  "
+          f"{counter['n'] / total:>6.1f} statements/루틴")
+
+
+async def main(args):
+    random.seed(42)
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    counter = {"n": 0}
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_statements(*_):
+        counter["n"] += 1
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    exercise_ids = list(range(1, 81))
+
+    print(f"SQLite: {path}")
+    print(f"사용자 {args.users}명 x {args.rounds}회 저장")
+    print("-" * 64)
+    for name, fn in [("legacy", save_legacy), ("bulk", save_bulk)]:
+        await run_case(name, fn, session_factory, args.users, args.rounds, exercise_ids, counter)
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="주간 루틴 저장 방식 벤치마크")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
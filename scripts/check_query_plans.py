@@ -0,0 +1,173 @@
+"""
+서비스 쿼리 실행 계획 점검
+
+인증/추천/루틴/체력 분석 서비스가 실제로 실행하는 SQL 을 한 트랜잭션 안에서 수집한 뒤
+(마지막에 롤백하므로 데이터는 바뀌지 않음) 각 SQL 의 EXPLAIN 결과를 출력합니다.
+카탈로그 테이블(전체를 메모리에 올리는 것이 의도된 동작) 외의 테이블을 전체 스캔하는
+쿼리가 있으면 종료 코드 1 로 끝나므로 CI/배포 전 점검에 사용할 수 있습니다.
+
+- SQLite: EXPLAIN QUERY PLAN 의 'SCAN <table>' 을 전체 스캔으로 판단
+- MySQL : EXPLAIN 의 type 이 ALL(테이블 전체) / index(인덱스 전체) 이면 전체 스캔으로 판단
+  (MySQL 옵티마이저는 행 수가 아주 적으면 인덱스를 쓰지 않을 수 있으므로 운영과 비슷한 규모의 로컬 DB 에서 실행)
+
+사용 예:
+    python -m scripts.migrate && python -m scripts.check_query_plans
+
+CI 에서는 임시 SQLite DB 로 같은 점검을 하는 tests/test_query_plans.py 를 실행합니다.
+이 스크립트는 운영과 비슷한 규모의 MySQL DB 를 점검할 때 사용합니다.
+"""
+import asyncio
+import re
+import sys
+from datetime import datetime
+
+from sqlalchemy import event, select
+
+from src.database.database import async_engine, AsyncSessionLocal
+from src.database.models import Base, Exercise, Health, User, ANALYSIS_COMPONENT_COLUMNS
+from src.database.repository import AnalyzeResultRepository, AnalysisHistoryRepository, ExercisePlanRepository
+from src.recommendation.routine_preparation import RoutinePreparationService
+from src.utils.auth_cache import get_user_id_by_login, invalidate_login
+
+# 전체 스캔을 허용하는 테이블 (운동 카탈로그는 버전 확인/인덱스 로드 시 통째로 읽음)
+ALLOWED_SCANS = {"exercise", "exercise_restricts"}
+
+TABLES = set(Base.metadata.tables)
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.label = None
+        self.enabled = True
+        self.queries = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if not self.enabled or statement.lstrip().upper().startswith("INSERT"):
+            return
+        if executemany:
+            parameters = parameters[0]
+        self.queries.append((self.label, statement, parameters))
+
+
+def _table_name(name: str) -> str:
+    """SQLAlchemy 별칭(user_restricts_1 등) -> 테이블 이름"""
+    name = name.strip("`\"")
+    if name in TABLES:
+        return name
+    return re.sub(r"_\d+$", "", name)
+
+
+async def explain(conn, dialect_name: str, statement: str, parameters):
+    """(계획 출력 줄 목록, 전체 스캔 테이블 목록)"""
+    if dialect_name == "sqlite":
+        rows = (await conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)).all()
+        lines = [row[3] for row in rows]
+        scans = []
+        for detail in lines:
+            match = re.match(r"SCAN (\S+)", detail)
+            if match and _table_name(match.group(1)) in TABLES:
+                scans.append(_table_name(match.group(1)))
+        return lines, scans
+
+    if dialect_name == "mysql":
+        rows = (await conn.exec_driver_sql("EXPLAIN " + statement, parameters)).mappings().all()
+        lines = [f"table={r['table']} type={r['type']} key={r['key']} rows={r['rows']}" for r in rows]
+        scans = [_table_name(r["table"]) for r in rows if r["type"] in ("ALL", "index") and r["table"]]
+        return lines, scans
+
+    raise NotImplementedError(f"실행 계획 점검을 지원하지 않는 DB 입니다: {dialect_name}")
+
+
+async def run_services(db, recorder: QueryRecorder):
+    login_id, user_id = (await db.execute(
+        select(User.login_id, User.id).join(Health, Health.user_id == User.id).limit(1)
+    )).first() or ("unknown", 0)
+    exercise_id = (await db.execute(select(Exercise.id).limit(1))).scalar() or 1
+    recorder.queries.clear()
+
+    recorder.label = "auth.get_user_id_by_login"
+    await invalidate_login(login_id)  # 캐시를 비워 DB 조회까지 내려가도록
+    await get_user_id_by_login(db, login_id)
+
+    prep = RoutinePreparationService(db)
+    recorder.label = "routine_preparation.aget_user_data"
+    try:
+        user_data = await prep.aget_user_data(user_id)
+    except ValueError:
+        user_data = None
+
+    if user_data is not None:
+        recorder.label = "routine_preparation.aget_candidate_exercises"
+        await prep.aget_candidate_exercises(user_data)
+
+    recorder.label = "AnalyzeResultRepository.save"
+    await AnalyzeResultRepository(db).save(
+        user_id,
+        average_score=0,
+        llm_report="",
+        persona="BEGINNER",
+        **{column: 0 for column in ANALYSIS_COMPONENT_COLUMNS.values()}
+    )
+
+    recorder.label = "AnalysisHistoryRepository.list_before"
+    await AnalysisHistoryRepository(db).list_before(user_id, 21, (datetime.now(), 2 ** 62))
+
+    recorder.label = "ExercisePlanRepository.replace_weekly_routine"
+    await ExercisePlanRepository(db).replace_weekly_routine(user_id, [
+        {
+            "day": day, "title": "", "description": "", "image": None,
+            "exercises": [{"exercise_id": exercise_id, "sequence": 1}]
+        }
+        for day in range(1, 8)
+    ])
+
+
+async def collect_plans(engine, session_factory):
+    """
+    서비스 쿼리를 한 트랜잭션에서 실행(마지막에 롤백)하고 각 쿼리의 실행 계획을 반환
+    [(라벨, SQL, 계획 출력 줄 목록, 허용되지 않은 전체 스캔 테이블 목록)]
+    """
+    recorder = QueryRecorder()
+    event.listen(engine.sync_engine, "before_cursor_execute", recorder)
+    plans = []
+    try:
+        async with session_factory() as db:
+            try:
+                await run_services(db, recorder)
+                recorder.enabled = False
+
+                conn = await db.connection()
+                for label, statement, parameters in recorder.queries:
+                    lines, scans = await explain(conn, engine.dialect.name, statement, parameters)
+                    plans.append((label, statement, lines, sorted(set(scans) - ALLOWED_SCANS)))
+            finally:
+                await db.rollback()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", recorder)
+    return plans
+
+
+async def main() -> int:
+    plans = await collect_plans(async_engine, AsyncSessionLocal)
+    await async_engine.dispose()
+
+    violations = []
+    for label, statement, lines, bad in plans:
+        print(f"[{'FAIL' if bad else 'OK'}] {label}")
+        print("    " + " ".join(statement.split())[:160])
+        for line in lines:
+            print(f"      - {line}")
+        if bad:
+            violations.append((label, bad))
+
+    print("-" * 80)
+    if violations:
+        for label, tables in violations:
+            print(f"전체 스캔: {label} -> {', '.join(tables)}")
+        return 1
+    print(f"{len(plans)}개 쿼리 모두 인덱스를 사용합니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,175 @@
+"""
+전체 사용자 일일 추천 운동 일괄 생성 배치 (푸시 알림용)
+
+사용자마다 RecommendationService 를 호출하면 사용자당 쿼리 여러 번이 필요하므로,
+- health LEFT JOIN analyze_result 를 health.id 순서로 청크 단위 조회 (keyset, 청크당 쿼리 1번)
+- 같은 id 범위의 user_restricts 를 범위 조건으로 한 번에 조회 (청크당 쿼리 1번)
+- 사용자를 세그먼트(장소, 숙련도, 부상 부위)로 묶어 세그먼트마다 행렬 연산 한 번으로 채점/선정
+- 결과는 Redis 해시 recommend:daily:{YYYYMMDD} (field=user_id, value="[운동ID, ...]") 에
+  청크마다 파이프라인으로 저장
+
+시드가 (사용자, 날짜) 로 고정되어 있어 입력이 바뀌지 않았다면 같은 날 /fit/exercise 응답과 같은 결과입니다.
+
+사용 예:
+    python -m scripts.generate_daily_recommendations
+    python -m scripts.generate_daily_recommendations --date 2026-01-01 --chunk-size 10000
+    python -m scripts.generate_daily_recommendations --dry-run --limit 1000
+"""
+import argparse
+import logging
+import time
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, List
+
+import numpy as np
+import orjson
+from sqlalchemy import select
+
+from src.database.database import SessionLocal
+from src.database.models import AnalyzeResult, Health, UserRestrict
+from src.database.redis import get_redis
+from src.recommendation.catalog_index import get_catalog_index
+from src.recommendation.exercises_recommendation import DEFAULT_WEAKEST_PART, RECOMMEND_COUNT, WEAKNESS_COLUMNS
+from src.recommendation.ranking import COMPONENTS, daily_seed, rank_segment, segment_needs
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("generate_daily_recommendations")
+
+
+def daily_recommendations_key(day: date) -> str:
+    return f"recommend:daily:{day:%Y%m%d}"
+
+
+def fetch_chunk(session, after_id: int, chunk_size: int):
+    """health.id > after_id 인 사용자 chunk_size 명과 그 범위의 제한 부위"""
+    stmt = (
+        select(
+            Health.id,
+            Health.user_id,
+            Health.place,
+            Health.proficiency,
+            AnalyzeResult.id,
+            *[getattr(AnalyzeResult, WEAKNESS_COLUMNS[component]) for component in COMPONENTS],
+        )
+        .outerjoin(AnalyzeResult, AnalyzeResult.user_id == Health.user_id)
+        .where(Health.id > after_id)
+        .order_by(Health.id)
+        .limit(chunk_size)
+    )
+    rows = session.execute(stmt).all()
+    if not rows:
+        return rows, {}
+
+    injuries: Dict[int, List[str]] = defaultdict(list)
+    restrict_stmt = select(UserRestrict.health_id, UserRestrict.user_restrict).where(
+        UserRestrict.health_id > after_id,
+        UserRestrict.health_id <= rows[-1][0],
+    )
+    for health_id, restrict in session.execute(restrict_stmt):
+        injuries[health_id].append(restrict)
+    return rows, injuries
+
+
+def rank_chunk(index, rows, injuries, day: date, seen: set) -> Dict[int, List[int]]:
+    """청크 사용자를 세그먼트별로 묶어 세그먼트마다 한 번에 랭킹"""
+    segments: Dict[tuple, List[int]] = defaultdict(list)
+    for i, row in enumerate(rows):
+        health_id, user_id, place, proficiency = row[:4]
+        # 건강 정보가 여러 개인 사용자는 먼저 조회된 것만 사용
+        if user_id is None or user_id in seen:
+            continue
+        seen.add(user_id)
+        segments[index.segment_key(place, proficiency, injuries.get(health_id, ()))].append(i)
+
+    results: Dict[int, List[int]] = {}
+    for key, positions in segments.items():
+        percentiles = np.array(
+            [[np.nan if v is None else v for v in rows[i][5:]] for i in positions],
+            dtype=np.float64
+        )
+        has_analysis = np.array([rows[i][4] is not None for i in positions], dtype=bool)
+        user_ids = [rows[i][1] for i in positions]
+        needs, target_difficulty = segment_needs(percentiles, has_analysis, key[1], DEFAULT_WEAKEST_PART)
+        ranked = rank_segment(
+            index,
+            index.segment_candidates(key),
+            needs,
+            target_difficulty,
+            [daily_seed(user_id, day) for user_id in user_ids],
+            k=RECOMMEND_COUNT,
+        )
+        results.update(zip(user_ids, ranked))
+    return results
+
+
+def write_chunk(redis, key: str, results: Dict[int, List[int]], ttl_seconds: int):
+    """청크 결과를 HSET 1번 + EXPIRE 를 파이프라인으로 저장"""
+    if not results:
+        return
+    pipe = redis.pipeline(transaction=False)
+    pipe.hset(key, mapping={user_id: orjson.dumps(ids) for user_id, ids in results.items()})
+    pipe.expire(key, ttl_seconds)
+    pipe.execute()
+
+
+def run(args):
+    day = datetime.strptime(args.date, "%Y-%m-%d").date() if args.date else date.today()
+    key = daily_recommendations_key(day)
+    redis = None if args.dry_run else get_redis()
+    logger.info(f"일일 추천 생성 시작 (date={day}, key={key}, chunk={args.chunk_size})")
+
+    stats = {"users": 0, "empty": 0, "db": 0.0, "rank": 0.0, "write": 0.0}
+    seen: set = set()
+    after_id = 0
+
+    with SessionLocal() as session:
+        index = get_catalog_index(session)
+        started = time.perf_counter()
+        while args.limit is None or stats["users"] < args.limit:
+            chunk_size = args.chunk_size if args.limit is None else min(args.chunk_size, args.limit - stats["users"])
+
+            t = time.perf_counter()
+            rows, injuries = fetch_chunk(session, after_id, chunk_size)
+            stats["db"] += time.perf_counter() - t
+            if not rows:
+                break
+            after_id = rows[-1][0]
+
+            t = time.perf_counter()
+            results = rank_chunk(index, rows, injuries, day, seen)
+            stats["rank"] += time.perf_counter() - t
+
+            t = time.perf_counter()
+            if redis is not None:
+                write_chunk(redis, key, results, args.ttl_hours * 3600)
+            stats["write"] += time.perf_counter() - t
+
+            stats["users"] += len(results)
+            stats["empty"] += sum(1 for ids in results.values() if not ids)
+            logger.info(f"청크 처리: {len(results)}명 (누적 {stats['users']}명, last_health_id={after_id})")
+
+    elapsed = time.perf_counter() - started
+    rate = stats["users"] / elapsed if elapsed else 0.0
+    logger.info(
+        f"일일 추천 생성 완료: {stats['users']}명 ({rate:,.0f}명/초, 세그먼트 {index.segment_count}개, "
+        f"후보 없음 {stats['empty']}명), {elapsed:.1f}초 "
+        f"(DB {stats['db']:.1f}초 / 랭킹 {stats['rank']:.1f}초 / Redis {stats['write']:.1f}초)"
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="전체 사용자 일일 추천 운동 일괄 생성")
+    parser.add_argument("--date", default=None, help="추천 날짜 YYYY-MM-DD (기본: 오늘, 시드와 Redis 키에 사용)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="청크당 사용자 수 (조회/저장 단위)")
+    parser.add_argument("--limit", type=int, default=None, help="처리할 최대 사용자 수")
+    parser.add_argument("--ttl-hours", type=int, default=48, help="Redis 결과 보관 시간")
+    parser.add_argument("--dry-run", action="store_true", help="Redis 에 쓰지 않음")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    run(parse_args())
@@ -0,0 +1,36 @@
+"""
+스키마 마이그레이션 실행 (src/database/migrations.py)
+
+사용 예:
+    python -m scripts.migrate            # 미적용 버전 적용
+    python -m scripts.migrate --status   # 적용/미적용 버전 확인만
+"""
+import argparse
+import logging
+
+from src.database.database import engine
+from src.database.migrations import MIGRATIONS, applied_versions, upgrade
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def print_status():
+    applied = set(applied_versions(engine))
+    for version, description, _ in MIGRATIONS:
+        mark = "적용됨" if version in applied else "미적용"
+        print(f"{version}  [{mark}]  {description}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="스키마 마이그레이션")
+    parser.add_argument("--status", action="store_true", help="적용 상태만 출력")
+    args = parser.parse_args()
+
+    if args.status:
+        print_status()
+    else:
+        done = upgrade(engine)
+        print(f"적용 완료: {', '.join(done)}" if done else "적용할 마이그레이션이 없습니다.")
@@ -0,0 +1,261 @@
+"""
+AnalyzeResult.llm_report 일괄 재생성 배치
+
+프롬프트(create_prompt)나 OPENAI_MODEL 이 바뀌었을 때 저장된 리포트를 다시 생성합니다.
+- analyze_result 를 id 순서대로 keyset 청크(id > last_id LIMIT n) 단위로 조회
+- 저장된 백분위/페르소나와 Health 정보로 프롬프트 입력을 재구성
+- 동시 요청 수(--concurrency)와 초당 요청 수(--rps)를 제한하여 비동기 호출
+- 배치 단위로 UPDATE 후 체크포인트(마지막 id, 재시도 후에도 실패한 id)를 기록하므로 중단 후 이어서 실행 가능
+  (다음 실행은 실패한 id 부터 다시 처리)
+
+사용 예:
+    python -m scripts.regenerate_reports --concurrency 8 --rps 5
+    python -m scripts.regenerate_reports --base-url http://localhost:8080/v1   # 로컬 mock LLM
+    python -m scripts.regenerate_reports --mock --limit 100                     # LLM 호출 없이 검증 (DB 에 쓰지 않음)
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import select, update
+
+from src.config import settings
+from src.database.database import SessionLocal
+from src.database.models import AnalyzeResult, Health, ANALYSIS_COMPONENT_COLUMNS
+from src.utils.llm_reporter import FitnessReportGenerator
+from src.utils.percentile_calculator import get_age_group, get_grade
+from src.utils.persona_classifier import classify_persona
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("regenerate_reports")
+
+DEFAULT_CHECKPOINT = Path("outputs/regenerate_reports.checkpoint.json")
+
+
+class RateLimiter:
+    """초당 요청 수 제한 (요청 간 최소 간격 보장)"""
+
+    def __init__(self, rps: float):
+        self.interval = 1.0 / rps if rps > 0 else 0.0
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_at > now:
+                await asyncio.sleep(self._next_at - now)
+            self._next_at = max(now, self._next_at) + self.interval
+
+
+class MockReportGenerator(FitnessReportGenerator):
+    """LLM 호출 없이 기본 리포트를 반환 (파이프라인 검증용)"""
+
+    def __init__(self):
+        # 클라이언트는 만들기만 하고 호출하지 않음 (기반 클래스 속성이 모두 있도록)
+        super().__init__(api_key="mock", model="mock")
+
+    async def agenerate_report(self, data, **kwargs):
+        return self._get_fallback_report(data)
+
+
+def load_checkpoint(path: Path):
+    """(마지막으로 처리한 id, 재시도 후에도 실패한 id 목록)"""
+    if not path.exists():
+        return 0, []
+    with open(path, 'r', encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    return int(checkpoint.get("last_id", 0)), [int(i) for i in checkpoint.get("failed_ids", [])]
+
+
+def save_checkpoint(path: Path, last_id: int, failed_ids, stats: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({"last_id": last_id, "failed_ids": sorted(failed_ids), **stats}, f, ensure_ascii=False)
+    tmp.replace(path)
+
+
+def get_age(birth):
+    """birth('YYYY-MM-DD' / 'YYYYMMDD') -> 만 나이 근사값"""
+    if not birth or len(birth) < 4 or not birth[:4].isdigit():
+        return None
+    return date.today().year - int(birth[:4])
+
+
+def build_report_input(analysis, gender, birth, height, weight) -> dict:
+    """저장된 분석 결과로 generate_report 입력(data)을 재구성"""
+    percentiles = {}
+    for component, column in ANALYSIS_COMPONENT_COLUMNS.items():
+        value = getattr(analysis, column)
+        percentiles[component] = {'percentile': value, 'grade': get_grade(value)}
+
+    age = get_age(birth)
+    bmi = round(weight / ((height / 100) ** 2), 1) if height and weight else None
+
+    return {
+        'user_info': {
+            'gender': gender,
+            'age': age,
+            'bmi': bmi,
+            'age_group': get_age_group(age) if age is not None else None
+        },
+        'percentiles': percentiles,
+        'persona': classify_persona(percentiles),
+        'average_score': analysis.average_score
+    }
+
+
+def _rows_query():
+    return (
+        select(AnalyzeResult, Health.gender, Health.birth, Health.height, Health.weight)
+        .outerjoin(Health, Health.user_id == AnalyzeResult.user_id)
+        .order_by(AnalyzeResult.id)
+    )
+
+
+def select_rows(session, after_id: int, chunk_size: int):
+    """analyze_result.id > after_id 인 행 chunk_size 개 (keyset, 배치마다 짧은 쿼리 1번)"""
+    return session.execute(_rows_query().where(AnalyzeResult.id > after_id).limit(chunk_size)).all()
+
+
+def select_rows_by_id(session, ids):
+    """체크포인트에 남은 실패 행 조회"""
+    return session.execute(_rows_query().where(AnalyzeResult.id.in_(ids))).all()
+
+
+async def regenerate_one(generator, limiter, semaphore, row, args):
+    analysis, gender, birth, height, weight = row
+    data = build_report_input(analysis, gender, birth, height, weight)
+    for attempt in range(1, args.retries + 1):
+        # 동시 실행 슬롯은 호출하는 동안만 잡음 (백오프 대기 중에는 다른 행이 사용)
+        async with semaphore:
+            await limiter.wait()
+            try:
+                report = await generator.agenerate_report(
+                    data,
+                    max_tokens=settings.OPENAI_MAX_TOKENS,
+                    temperature=settings.OPENAI_TEMPERATURE
+                )
+                return {"id": analysis.id, "llm_report": report}
+            except Exception as e:
+                logger.warning(f"리포트 생성 실패 (id={analysis.id}, {attempt}/{args.retries}): {e}")
+        if attempt < args.retries:
+            await asyncio.sleep(min(2 ** attempt, 30))
+    return None
+
+
+def write_batch(results):
+    """재생성된 리포트를 PK 기준 executemany UPDATE 한 번으로 반영"""
+    if not results:
+        return
+    with SessionLocal() as write_session:
+        write_session.execute(update(AnalyzeResult), results)
+        write_session.commit()
+
+
+async def run(args):
+    if args.mock:
+        generator = MockReportGenerator()
+    else:
+        generator = FitnessReportGenerator(
+            api_key=settings.OPENAI_API_KEY,
+            model=args.model,
+            base_url=args.base_url
+        )
+
+    checkpoint_path = Path(args.checkpoint)
+    last_id, failed_ids = (0, []) if args.restart else load_checkpoint(checkpoint_path)
+    failed_ids = set(failed_ids)
+    logger.info(f"재생성 시작 (model={generator.model}, last_id={last_id}, 이전 실패 {len(failed_ids)}건)")
+
+    limiter = RateLimiter(args.rps)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    stats = {"model": generator.model, "updated": 0, "failed": 0}
+    started = time.perf_counter()
+
+    def checkpoint():
+        # dry-run 은 DB 에 쓰지 않으므로 진행 위치도 남기지 않음 (이후 실제 실행이 건너뛰지 않도록)
+        if not args.dry_run:
+            save_checkpoint(checkpoint_path, last_id, failed_ids, stats)
+
+    # 이전 실행에서 재시도 후에도 실패한 행을 먼저 다시 처리 (삭제된 행은 목록에서 제외)
+    if failed_ids:
+        with SessionLocal() as read_session:
+            retry_rows = select_rows_by_id(read_session, sorted(failed_ids))
+        failed_ids.intersection_update(row[0].id for row in retry_rows)
+        for i in range(0, len(retry_rows), args.batch_size):
+            await process_batch(generator, limiter, semaphore, retry_rows[i:i + args.batch_size], args, stats, failed_ids)
+            checkpoint()
+
+    # 배치마다 keyset 으로 읽고 바로 커넥션을 반납 (LLM 호출을 기다리는 동안 커서를 열어 두지 않음)
+    remaining = args.limit
+    while remaining is None or remaining > 0:
+        chunk_size = args.batch_size if remaining is None else min(args.batch_size, remaining)
+        with SessionLocal() as read_session:
+            batch = select_rows(read_session, last_id, chunk_size)
+        if not batch:
+            break
+        last_id = await process_batch(generator, limiter, semaphore, batch, args, stats, failed_ids)
+        checkpoint()
+        if remaining is not None:
+            remaining -= len(batch)
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"재생성 완료: 갱신 {stats['updated']}건, 실패 {stats['failed']}건, {elapsed:.1f}초 "
+        f"(last_id={last_id}, 다음 실행에서 재시도할 실패 {len(failed_ids)}건)"
+    )
+
+
+async def process_batch(generator, limiter, semaphore, batch, args, stats, failed_ids: set) -> int:
+    """배치를 처리하고 마지막 id 반환 (재시도 후에도 실패한 id 는 failed_ids 에 남겨 다음 실행에서 다시 처리)"""
+    results = await asyncio.gather(*[
+        regenerate_one(generator, limiter, semaphore, row, args) for row in batch
+    ])
+    updates = [r for r in results if r is not None]
+    if not args.dry_run:
+        write_batch(updates)
+    for row, result in zip(batch, results):
+        if result is None:
+            failed_ids.add(row[0].id)
+        else:
+            failed_ids.discard(row[0].id)
+    stats["updated"] += len(updates)
+    stats["failed"] += len(batch) - len(updates)
+    batch_last_id = batch[-1][0].id
+    logger.info(f"배치 처리: {len(updates)}/{len(batch)}건 (last_id={batch_last_id})")
+    return batch_last_id
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="AnalyzeResult.llm_report 일괄 재생성")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 LLM 요청 수")
+    parser.add_argument("--rps", type=float, default=5.0, help="초당 최대 LLM 요청 수 (0: 제한 없음)")
+    parser.add_argument("--batch-size", type=int, default=100, help="UPDATE/체크포인트 단위")
+    parser.add_argument("--retries", type=int, default=3, help="행 단위 최대 시도 횟수")
+    parser.add_argument("--limit", type=int, default=None, help="처리할 최대 행 수")
+    parser.add_argument("--model", default=settings.OPENAI_MODEL)
+    parser.add_argument("--base-url", default=settings.OPENAI_BASE_URL, help="OpenAI 호환 서버 주소 (로컬 mock LLM)")
+    parser.add_argument("--mock", action="store_true", help="LLM 호출 없이 기본 리포트로 대체 (--dry-run 포함)")
+    parser.add_argument("--dry-run", action="store_true", help="DB 에 쓰지 않음")
+    parser.add_argument("--checkpoint", default=str(DEFAULT_CHECKPOINT))
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터 실행")
+    args = parser.parse_args()
+    # mock 리포트(기본 문구)로 실제 llm_report 를 덮어쓰지 않도록
+    if args.mock:
+        args.dry_run = True
+    return args
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
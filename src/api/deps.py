@@ -1,10 +1,12 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError
-from sqlalchemy.orm import Session
-from src.config import settings
-from src.database.database import get_db
-from src.database.models import User
+from jose import JWTError
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database.database import AsyncSessionLocal, READ_REPLICA_ENABLED, get_async_read_db
+from src.database.redis import get_async_redis
+from src.database.routing import read_session_factory
+from src.utils.auth_cache import decode_token, get_user_id_by_login
 
 security = HTTPBearer(auto_error=False)
 
@@ -17,31 +19,47 @@ def get_token(credentials: HTTPAuthorizationCredentials = Depends(security)) ->
         )
     return credentials.credentials
 
-def get_current_user_id(
+async def get_current_user_id(
     token: str = Depends(get_token),
-    db: Session = Depends(get_db) 
+    db: AsyncSession = Depends(get_async_read_db)
 ) -> int:
     try:
-        payload = jwt.decode(
-            token, 
-            settings.SECRET_KEY, 
-            algorithms=[settings.ALGORITHM]
-        )
+        # 검증된 claims 는 토큰 만료 시각까지 캐시
+        payload = decode_token(token)
         
         login_id = payload.get("loginId")
         
         if login_id is None:
             raise HTTPException(status_code=401, detail="토큰에 로그인 ID 정보가 없습니다.")
         
-        user = db.query(User).filter(User.login_id == login_id).first()
+        # 프로세스 내 LRU -> Redis -> DB (토큰 발급 전에 캐시된 매핑은 DB 에서 다시 확인)
+        issued_at = payload.get("iat")
+        user_id = await get_user_id_by_login(db, login_id, issued_at)
+        
+        # 방금 가입한 사용자가 아직 복제본에 없을 수 있으므로 primary 에서 한 번 더 확인
+        if user_id is None and READ_REPLICA_ENABLED:
+            async with AsyncSessionLocal() as primary_db:
+                user_id = await get_user_id_by_login(primary_db, login_id, issued_at)
         
-        if not user:
+        if user_id is None:
             raise HTTPException(status_code=404, detail="해당 로그인 ID를 가진 사용자가 DB에 없습니다.")
             
-        return user.id
+        return user_id
         
+    except HTTPException:
+        raise
     except JWTError:
         raise HTTPException(status_code=401, detail="토큰이 만료되었거나 유효하지 않습니다.")
     except Exception as e:
         print(f"Auth Error: {e}")
-        raise HTTPException(status_code=500, detail="인증 처리 중 서버 오류가 발생했습니다.")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="인증 처리 중 서버 오류가 발생했습니다.")
+
+
+async def get_user_read_db(
+    user_id: int = Depends(get_current_user_id),
+    redis: Redis = Depends(get_async_redis)
+):
+    """읽기 전용 요청용 세션 (복제본, 최근 쓰기가 있던 사용자는 primary)"""
+    session_factory = await read_session_factory(redis, user_id)
+    async with session_factory() as db:
+        yield db
@@ -1,42 +1,61 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from sqlalchemy.orm import Session
-from src.database.database import get_db
-from src.api.deps import get_current_user_id
-from src.database.models import AnalyzeResult
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from redis.asyncio import Redis
+from src.database.database import get_async_db
+from src.database.redis import get_async_redis
+from src.database.routing import mark_user_write
+from src.database.repository import AnalyzeResultRepository, AnalysisHistoryRepository
+from src.api.deps import get_current_user_id, get_user_read_db
+from src.database.models import ANALYSIS_COMPONENT_COLUMNS
 from src.api.models.request import PercentileRequest
-from src.api.models.response import PercentileResponse
+from src.api.models.response import (
+    PercentileResponse, PercentileData, AnalysisHistoryResponse, AnalysisHistoryPage,
+    AnalysisHistoryItem, ComponentHistory, model_response
+)
 from src.utils.percentile_calculator import PercentileCalculator, create_user_fitness_profile
 from src.utils.persona_classifier import classify_persona
 from src.utils.llm_reporter import FitnessReportGenerator
+from src.recommendation.exercises_recommendation import invalidate_if_basis_changed
 from src.config import settings
+from datetime import datetime
 from pathlib import Path
+import base64
 import logging
+import threading
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 calculator = None
 report_generator = None
+# 동기 엔드포인트/스레드풀에서 동시에 처음 호출돼도 한 번만 초기화
+_init_lock = threading.Lock()
 
 #백분위 계산기 인스턴스 반환
 def get_calculator():
     global calculator
     if calculator is None:
-        reference_path = Path(settings.REFERENCE_DATA_PATH)
-        if not reference_path.exists():
-            logger.error(f"참조 데이터 파일을 찾을 수 없습니다: {reference_path}")
-            raise FileNotFoundError(f"참조 데이터 파일을 찾을 수 없습니다: {reference_path}")
-        calculator = PercentileCalculator(str(reference_path))
-        logger.info(f"백분위 계산기 초기화 완료: {reference_path}")
+        with _init_lock:
+            if calculator is None:
+                reference_path = Path(settings.REFERENCE_DATA_PATH)
+                if not reference_path.exists():
+                    logger.error(f"참조 데이터 파일을 찾을 수 없습니다: {reference_path}")
+                    raise FileNotFoundError(f"참조 데이터 파일을 찾을 수 없습니다: {reference_path}")
+                calculator = PercentileCalculator(str(reference_path))
+                logger.info(f"백분위 계산기 초기화 완료: {reference_path}")
     return calculator
 
 def get_report_generator():
     global report_generator
     if report_generator is None:
-        report_generator = FitnessReportGenerator(
-            api_key=settings.OPENAI_API_KEY,
-            model=settings.OPENAI_MODEL
-        )
+        with _init_lock:
+            if report_generator is None:
+                report_generator = FitnessReportGenerator(
+                    api_key=settings.OPENAI_API_KEY,
+                    model=settings.OPENAI_MODEL,
+                    base_url=settings.OPENAI_BASE_URL
+                )
     return report_generator
 
 
@@ -48,7 +67,8 @@ def get_report_generator():
 async def calculate_percentile(
     request: PercentileRequest,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    redis: Redis = Depends(get_async_redis)
 ):
     try:
         logger.info(f"체력 분석 시작")
@@ -76,28 +96,6 @@ async def calculate_percentile(
         persona = classify_persona(profile['percentiles'])
         profile['persona'] = persona
         
-        api_percentiles = {}
-        for component, data in profile['percentiles'].items():
-            api_percentiles[component] = {
-                'percentile': data['percentile']
-                # grade 제거
-            }
-        
-        api_persona = {
-            'name': persona['name'],
-            'emoji': persona['emoji'],
-            'description': persona['description'],
-            'characteristics': persona['characteristics'],
-            'recommendation': persona['recommendation']
-        }
-        
-        response_data = {
-            "user_info": profile['user_info'],
-            "average_score": profile.get('average_score'),
-            "percentiles": api_percentiles,
-            "persona": api_persona
-        }
-        
         try:
             logger.info("LLM 리포트 생성 시작")
             report_gen = get_report_generator()
@@ -108,59 +106,64 @@ async def calculate_percentile(
                 'persona': persona
             }
                 
-            llm_report = report_gen.generate_report(
+            # 동기 OpenAI 호출이 이벤트 루프를 막지 않도록 스레드풀에서 실행
+            llm_report = await run_in_threadpool(
+                report_gen.generate_report,
                 data=llm_data,
                 max_tokens=settings.OPENAI_MAX_TOKENS,
                 temperature=settings.OPENAI_TEMPERATURE
             )
                 
-            response_data["llm_report"] = llm_report
             logger.info(f"LLM 리포트 생성 완료 ({len(llm_report)}자)")
                 
         except Exception as e:
             logger.error(f"LLM 생성 실패 (백분위는 정상): {str(e)}")
-            response_data["llm_report"] = "체력 측정을 완료했어요! 💪\n\n꾸준히 운동하면 더 좋아질 거예요. 화이팅!"
+            llm_report = "체력 측정을 완료했어요! 💪\n\n꾸준히 운동하면 더 좋아질 거예요. 화이팅!"
             logger.info("기본 리포트로 대체")
         
         logger.info("=== 체력 분석 완료 ===")
         
-        # DB 저장
+        # DB 저장 (user_id 기준 단일 upsert)
         try:
-            db.query(AnalyzeResult).filter(AnalyzeResult.user_id == user_id).delete()
-            
             def get_p_val(key):
                 return int(profile['percentiles'].get(key, {}).get('percentile', 0) or 0)
 
-            new_analysis = AnalyzeResult(
-                user_id=user_id,
-                average_score=profile.get('average_score', 0) or 0,
-                llm_report=llm_report,
+            result_values = {
+                'average_score': profile.get('average_score', 0) or 0,
                 
                 # 백분위 매핑 (한글 키 -> DB 컬럼)
-                per_strength=get_p_val('근력'),
-                per_cardio=get_p_val('심폐지구력'),
-                per_core=get_p_val('코어'),
-                per_flexibility=get_p_val('유연성'),
-                per_agility=get_p_val('민첩성'),
-                per_body_composition=get_p_val('체성분'),
+                **{column: get_p_val(component) for component, column in ANALYSIS_COMPONENT_COLUMNS.items()},
                 
-                persona=persona.get('type', 'BEGINNER') 
-            )
+                'persona': persona.get('type', 'BEGINNER')
+            }
             
-            db.add(new_analysis)
-            db.commit()
+            # 최신 결과(upsert) + 이력(append) 을 한 트랜잭션으로 저장
+            await AnalyzeResultRepository(db).save(user_id, llm_report=llm_report, **result_values)
+            await AnalysisHistoryRepository(db).append(user_id, **result_values)
+            await db.commit()
+            # 직후의 추천/루틴 조회가 복제 지연으로 이전 분석 결과를 읽지 않도록 primary 로 고정
+            await mark_user_write(redis, user_id)
+            # 백분위가 바뀌었으면 캐시된 추천 운동 무효화
+            await invalidate_if_basis_changed(user_id, result_values)
             logger.info(f"DB 저장 완료 (User ID: {user_id})")
             
         except Exception as db_e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"DB 저장 중 오류 발생: {str(db_e)}")
             raise HTTPException(status_code=500, detail="결과 저장 중 오류가 발생했습니다.")
         
-        return PercentileResponse(
+        # 프로필/페르소나 dict 를 그대로 검증 (응답 모델에 없는 grade, type 등은 제외됨)
+        return model_response(PercentileResponse(
             status="success",
-            data=response_data,
+            data=PercentileData(
+                user_info=profile['user_info'],
+                average_score=profile.get('average_score'),
+                percentiles=profile['percentiles'],
+                persona=persona,
+                llm_report=llm_report
+            ),
             message="백분위 계산이 완료되었습니다."
-        )
+        ))
         
         
     except FileNotFoundError as e:
@@ -182,4 +185,66 @@ async def calculate_percentile(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="백분위 계산 중 오류가 발생했습니다."
-        )
\ No newline at end of file
+        )
+
+
+def encode_history_cursor(created_at: datetime, history_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{history_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_history_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, history_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(history_id)
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="잘못된 cursor 값입니다.")
+
+
+@router.get(
+    "/score/history",
+    response_model=AnalysisHistoryResponse,
+    status_code=status.HTTP_200_OK
+)
+async def get_score_history(
+    limit: int = Query(20, ge=1, le=100, description="페이지 크기"),
+    cursor: str = Query(None, description="이전 응답의 next_cursor"),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_user_read_db)
+):
+    """
+    체력 분석 이력을 최신순으로 반환합니다. (직전 측정 대비 변화량 포함)
+    변화량 계산용으로 한 행을 더 읽으므로 페이지마다 인덱스 범위 조회 1번으로 처리됩니다.
+    """
+    before = decode_history_cursor(cursor) if cursor else None
+    rows = await AnalysisHistoryRepository(db).list_before(user_id, limit + 1, before)
+
+    items = []
+    for i, row in enumerate(rows[:limit]):
+        prev = rows[i + 1] if i + 1 < len(rows) else None
+        percentiles = {}
+        for component, column in ANALYSIS_COMPONENT_COLUMNS.items():
+            value = getattr(row, column)
+            percentiles[component] = ComponentHistory(
+                percentile=value,
+                delta=value - getattr(prev, column) if prev else None
+            )
+        items.append(AnalysisHistoryItem(
+            measured_at=row.created_at,
+            average_score=row.average_score,
+            average_score_delta=round(row.average_score - prev.average_score, 1) if prev else None,
+            percentiles=percentiles,
+            persona=row.persona
+        ))
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_history_cursor(last.created_at, last.id)
+
+    return model_response(AnalysisHistoryResponse(
+        status="success",
+        data=AnalysisHistoryPage(items=items, next_cursor=next_cursor),
+        message="체력 분석 이력 조회가 완료되었습니다."
+    ))
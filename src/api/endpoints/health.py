@@ -1,34 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from src.api.models.response import HealthCheckResponse
 from src.config import settings
-from src.database.database import get_db
+from src.utils.readiness import readiness
 
 router = APIRouter()
 
 
+@router.get("/livez", tags=["Health"])
+# 프로세스 생존 확인 (I/O 없음, docker healthcheck 용)
+async def liveness_check():
+    return {"status": "alive"}
+
+
+@router.get("/readyz", tags=["Health"])
+# 의존성 준비 상태 (백그라운드에서 갱신한 스냅샷 반환, 프로브가 DB 에 쿼리를 보내지 않음)
+async def readiness_check():
+    snapshot = readiness.snapshot or {"status": "not_ready", "components": {}}
+    if readiness.is_stale():
+        snapshot = {**snapshot, "status": "not_ready", "stale": True}
+
+    status_code = 503 if snapshot["status"] == "not_ready" else 200
+    return JSONResponse(status_code=status_code, content=snapshot)
+
+
 @router.get("/health", response_model=HealthCheckResponse, tags=["Health"])
 # API 헬스체크
-# 서버 상태 확인용
-def health_check(db: Session = Depends(get_db)):
+# 서버 상태 확인용 (기존 응답 형식 유지, DB 상태는 /readyz 스냅샷 기준)
+async def health_check():
     """
     서버 상태와 DB 연결 상태를 확인합니다.
     """
     db_status = "disconnected"
     status_msg = "unhealthy"
-    
-    try:
-        db.execute(text("SELECT 1"))
+
+    database = (readiness.snapshot or {}).get("components", {}).get("database")
+    if database and database["status"] == "ok":
         db_status = "connected"
         status_msg = "healthy"
-    except Exception as e:
-        print(f"DB Connection Error: {e}")
-        db_status = f"error: {str(e)}"
+    elif database:
+        db_status = f"error: {database['error']}"
 
     return HealthCheckResponse(
         status=status_msg,
         version=settings.VERSION,
         message="AI-TRINITY API is running",
         db_status=db_status
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,29 @@
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
+from src.api.models.request import LoginInvalidateRequest
+from src.config import settings
+from src.utils.auth_cache import invalidate_login
+
+router = APIRouter()
+
+
+def _verify_internal_token(token: Optional[str]):
+    if not settings.INTERNAL_API_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not token or not hmac.compare_digest(token, settings.INTERNAL_API_TOKEN):
+        raise HTTPException(status_code=403, detail="내부 호출 토큰이 유효하지 않습니다.")
+
+
+@router.post("/internal/auth/invalidate", include_in_schema=False)
+# login_id -> user_id 캐시 무효화 (Redis 와 이 워커의 로컬 캐시)
+# 다른 워커의 로컬 캐시는 남아 있어도 토큰 발급(iat) 이후에 확인한 매핑만 사용하므로 새 토큰은 DB 에서 다시 확인
+async def invalidate_auth_cache(
+    request: LoginInvalidateRequest,
+    x_internal_token: Optional[str] = Header(None)
+):
+    _verify_internal_token(x_internal_token)
+    for login_id in request.login_ids:
+        await invalidate_login(login_id)
+    return {"status": "success", "invalidated": len(request.login_ids)}
@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from src.utils.metrics_multiproc import multiprocess_metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+# Prometheus 스크레이프용 메트릭 (멀티 워커면 모든 워커 합계)
+def get_metrics():
+    return PlainTextResponse(
+        multiprocess_metrics.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,32 +1,42 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from src.database.database import get_db
-from src.api.deps import get_current_user_id
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from redis.asyncio import Redis
+from src.database.database import get_async_db
+from src.database.redis import get_async_redis
+from src.database.routing import mark_user_write
+from src.database.repository import ExercisePlanRepository
+from src.api.deps import get_current_user_id, get_user_read_db
 from src.recommendation.routine_preparation import RoutinePreparationService
 from src.recommendation.routine_generator import RoutineGeneratorService
-from src.database.models import ExercisePlan, ExerciseList
 from src.api.models.routine import SimpleRoutineResponse
+from src.api.models.response import model_response
 
 router = APIRouter()
 
 @router.post("/routine", response_model=SimpleRoutineResponse, status_code=status.HTTP_201_CREATED)
-def create_new_routine(
+async def create_new_routine(
     user_id: int = Depends(get_current_user_id),  
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_user_read_db),
+    redis: Redis = Depends(get_async_redis)
 ):
-    prep_service = RoutinePreparationService(db)
+    # 사용자/카탈로그 조회는 복제본, 루틴 저장은 primary
+    prep_service = RoutinePreparationService(read_db)
     gen_service = RoutineGeneratorService()
 
     try:
-        user_data = prep_service.get_user_data(user_id)
-        candidates = prep_service.get_candidate_exercises(user_data)
+        user_data = await prep_service.aget_user_data(user_id)
+        candidates = await prep_service.aget_candidate_exercises(user_data)
         
         if not candidates:
             raise HTTPException(status_code=400, detail="수행 가능한 운동이 하나도 없습니다. 설정(부상 부위 등)을 확인해주세요.")
 
         strategy_text = prep_service.determine_strategy(user_data)
         
-        weekly_routine_data = gen_service.generate_weekly_routine(
+        # 동기 OpenAI 호출이 이벤트 루프를 막지 않도록 스레드풀에서 실행
+        weekly_routine_data = await run_in_threadpool(
+            gen_service.generate_weekly_routine,
             user_profile=user_data["profile"],
             candidates=candidates,
             strategy=strategy_text
@@ -36,18 +46,8 @@ def create_new_routine(
         
         DEFAULT_IMAGE_URL = "https://mofit-image.s3.ap-northeast-2.amazonaws.com/exercises/1.png"
 
-        # DB 저장
-        existing_plans = db.query(ExercisePlan).filter(ExercisePlan.user_id == user_id).all()
-        
-        if existing_plans:
-            plan_ids = [p.id for p in existing_plans]
-            
-            # 자식 테이블 먼저 삭제
-            db.query(ExerciseList).filter(ExerciseList.exercise_plan_id.in_(plan_ids)).delete(synchronize_session=False)
-            
-            # 부모 테이블 삭제
-            db.query(ExercisePlan).filter(ExercisePlan.user_id == user_id).delete(synchronize_session=False)
-        
+        # DB 저장 (기존 루틴 삭제 + 다중 행 INSERT, 한 트랜잭션)
+        plans = []
         for daily in weekly_routine_data.routines:
             
             thumbnail_url = None
@@ -59,34 +59,28 @@ def create_new_routine(
                 if not thumbnail_url:
                     thumbnail_url = DEFAULT_IMAGE_URL
             
-            new_plan = ExercisePlan(
-                user_id=user_id,
-                day=daily.day,
-                title=daily.title,
-                description=daily.description,
-                progress=False,
-                image=thumbnail_url
-            )
-            db.add(new_plan)
-            db.flush()
-            
-            for ex_item in daily.exercises:
-                new_list = ExerciseList(
-                    exercise_plan_id=new_plan.id,
-                    exercise_id=ex_item.exercise_id,
-                    sequence=ex_item.order
-                )
-                db.add(new_list)
+            plans.append({
+                "day": daily.day,
+                "title": daily.title,
+                "description": daily.description,
+                "image": thumbnail_url,
+                "exercises": [
+                    {"exercise_id": ex_item.exercise_id, "sequence": ex_item.order}
+                    for ex_item in daily.exercises
+                ]
+            })
         
-        db.commit()
+        await ExercisePlanRepository(db).replace_weekly_routine(user_id, plans)
+        await db.commit()
+        await mark_user_write(redis, user_id)
         print("루틴 저장 완료")
         
-        return SimpleRoutineResponse(
-        status="success",
-        message="새로운 7일 맞춤 루틴이 생성되었습니다."
-        )
+        return model_response(SimpleRoutineResponse(
+            status="success",
+            message="새로운 7일 맞춤 루틴이 생성되었습니다."
+        ), status_code=status.HTTP_201_CREATED)
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"루틴 생성 실패: {str(e)}")
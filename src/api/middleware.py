@@ -0,0 +1,242 @@
+import base64
+import logging
+import time
+from datetime import datetime, timedelta
+from starlette.responses import JSONResponse
+from src.utils.auth_cache import decode_token
+from src.utils.idempotency import IDEMPOTENT_ENDPOINTS, MAX_KEY_LENGTH, IdempotencyStore, idempotency_store
+from src.utils.metrics import HTTP_REQUEST_LATENCY, IDEMPOTENCY_REQUESTS
+from src.utils.rate_limit import ENDPOINT_LIMITS, LLMQuota, current_llm_quota, rate_limiter
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """엔드포인트별 요청 지연 시간을 수집하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # 라우트 템플릿 기준으로 집계 (경로 파라미터로 라벨이 폭증하지 않도록)
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUEST_LATENCY.labels(scope["method"], path, status_code).observe(
+                time.perf_counter() - start
+            )
+
+
+def _client_identity(scope) -> str:
+    """요청 제한 단위: JWT loginId (검증된 claims 캐시 사용, DB 조회 없음), 토큰이 없거나 유효하지 않으면 클라이언트 IP"""
+    headers = dict(scope.get("headers") or [])
+    scheme, _, token = headers.get(b"authorization", b"").decode("latin-1").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            login_id = decode_token(token).get("loginId")
+            if login_id is not None:
+                return f"user:{login_id}"
+        except Exception:
+            pass
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+def _seconds_until_tomorrow() -> int:
+    now = datetime.now()
+    tomorrow = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return int((tomorrow - now).total_seconds()) + 1
+
+
+def _too_many_requests(detail: str, retry_after: int) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"detail": detail},
+        headers={"Retry-After": str(max(retry_after, 1))},
+    )
+
+
+class RateLimitMiddleware:
+    """
+    LLM 을 호출하는 엔드포인트(ENDPOINT_LIMITS)의 사용자별 요청 제한 ASGI 미들웨어
+    - 토큰 버킷이 비었으면 429 (Retry-After)
+    - 하루 LLM 토큰 예산을 넘었으면 fallback 이 있는 엔드포인트는 LLM 없이 처리, 없으면 429
+    - 요청 중 LLM 응답의 usage 를 모아 응답 후 예산에 누적
+    """
+
+    def __init__(self, app, limits=None):
+        self.app = app
+        self.limits = ENDPOINT_LIMITS if limits is None else limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get((scope.get("method"), scope.get("path"))) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        identity = _client_identity(scope)
+        decision = await rate_limiter.check(identity, limit)
+        if not decision.allowed:
+            response = _too_many_requests("요청이 너무 많습니다. 잠시 후 다시 시도해주세요.", decision.retry_after)
+            await response(scope, receive, send)
+            return
+        if decision.budget_exhausted and not limit["budget_fallback"]:
+            response = _too_many_requests(
+                "오늘 사용할 수 있는 AI 생성 한도를 모두 사용했습니다. 내일 다시 시도해주세요.",
+                _seconds_until_tomorrow()
+            )
+            await response(scope, receive, send)
+            return
+
+        quota = LLMQuota(identity, exhausted=decision.budget_exhausted)
+        token = current_llm_quota.set(quota)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_llm_quota.reset(token)
+            if quota.tokens:
+                await rate_limiter.record_usage(identity, quota.tokens)
+
+
+async def _read_body(receive):
+    """요청 본문 전체 (클라이언트 연결이 끊기면 None)"""
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            return None
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+def _replay_receive(body: bytes, receive):
+    """이미 읽은 본문을 앱에 다시 전달하고, 이후에는 원래 receive(연결 종료 감지)로 위임"""
+    replayed = False
+
+    async def replay():
+        nonlocal replayed
+        if not replayed:
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
+
+
+class IdempotencyMiddleware:
+    """
+    Idempotency-Key 헤더가 있는 POST(IDEMPOTENT_ENDPOINTS) 재시도를 한 번만 처리하는 ASGI 미들웨어
+    (src/utils/idempotency.py). 요청 제한보다 바깥에 두어 재시도/재전송은 버킷 토큰을 쓰지 않습니다.
+    """
+
+    def __init__(self, app, store: IdempotencyStore = None, endpoints=None):
+        self.app = app
+        self.store = idempotency_store if store is None else store
+        self.endpoints = IDEMPOTENT_ENDPOINTS if endpoints is None else endpoints
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or (scope.get("method"), scope.get("path")) not in self.endpoints:
+            await self.app(scope, receive, send)
+            return
+
+        raw_key = dict(scope.get("headers") or []).get(b"idempotency-key")
+        if raw_key is None:
+            await self.app(scope, receive, send)
+            return
+
+        endpoint = scope["path"]
+        idempotency_key = raw_key.decode("latin-1").strip()
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            IDEMPOTENCY_REQUESTS.labels(endpoint, "invalid").inc()
+            response = JSONResponse(
+                status_code=400,
+                content={"detail": f"Idempotency-Key 는 1~{MAX_KEY_LENGTH}자여야 합니다."}
+            )
+            await response(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        if body is None:
+            return
+        receive = _replay_receive(body, receive)
+
+        key = self.store.key(_client_identity(scope), endpoint, idempotency_key)
+        fingerprint = self.store.fingerprint(body)
+        try:
+            owner, record = await self.store.acquire(key, fingerprint)
+        except Exception as e:
+            # Redis 장애 시에는 중복 방지 없이 처리
+            IDEMPOTENCY_REQUESTS.labels(endpoint, "error").inc()
+            logger.warning(f"Idempotency 확인 실패 (그대로 처리): {e}")
+            await self.app(scope, receive, send)
+            return
+
+        if record is None:
+            IDEMPOTENCY_REQUESTS.labels(endpoint, "new").inc()
+            await self._process(key, owner, fingerprint, scope, receive, send)
+        elif record["fp"] != fingerprint:
+            IDEMPOTENCY_REQUESTS.labels(endpoint, "mismatch").inc()
+            response = JSONResponse(
+                status_code=422,
+                content={"detail": "같은 Idempotency-Key 가 다른 요청 본문으로 사용되었습니다."}
+            )
+            await response(scope, receive, send)
+        elif record["state"] == IdempotencyStore.DONE:
+            IDEMPOTENCY_REQUESTS.labels(endpoint, "replayed").inc()
+            await send({
+                "type": "http.response.start",
+                "status": record["status"],
+                "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in record["headers"]]
+                + [(b"idempotent-replayed", b"true")],
+            })
+            await send({"type": "http.response.body", "body": base64.b64decode(record["body"])})
+        else:
+            IDEMPOTENCY_REQUESTS.labels(endpoint, "in_progress").inc()
+            response = JSONResponse(
+                status_code=409,
+                content={"detail": "같은 요청을 아직 처리하고 있습니다. 잠시 후 다시 시도해주세요."},
+                headers={"Retry-After": "5"},
+            )
+            await response(scope, receive, send)
+
+    async def _process(self, key: str, owner: str, fingerprint: str, scope, receive, send):
+        status_code = None
+        headers = []
+        chunks = []
+
+        async def send_wrapper(message):
+            nonlocal status_code, headers
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = [(k.decode("latin-1"), v.decode("latin-1")) for k, v in message.get("headers", [])]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException:
+            await self.store.discard(key, owner)
+            raise
+
+        # 서버 오류/요청 제한은 재시도하면 결과가 달라질 수 있으므로 저장하지 않음
+        if status_code is None or status_code >= 500 or status_code == 429:
+            await self.store.discard(key, owner)
+        else:
+            await self.store.complete(key, owner, fingerprint, status_code, headers, b"".join(chunks))
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from typing import List, Optional
 
 
 # 사용자 체력 테스트 입력
@@ -58,4 +58,10 @@ class PercentileRequest(BaseModel):
                     "balance": 55
                 }
             }
-        }
\ No newline at end of file
+        }
+
+
+# 인증 캐시 무효화 요청 (사용자 삭제/로그인 ID 변경 시 사용자 관리 서비스가 호출)
+class LoginInvalidateRequest(BaseModel):
+    
+    login_ids: List[str] = Field(..., min_length=1, max_length=1000, description="무효화할 로그인 ID (변경 시 이전/새 ID 모두)")
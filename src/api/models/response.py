@@ -1,15 +1,13 @@
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
-from pydantic import BaseModel
+from typing import Optional, Dict, List
+from datetime import datetime
 
 
 #체력요소별 백분위 정보
 class ComponentPercentile(BaseModel):
     
-    percentile: Optional[float] = Field(None, description="백분위 점수 (0-100)")
-    grade: Optional[str] = Field(None, description="등급 (하위/평균/상위)")
-    reference_group: str = Field(..., description="참조 그룹")
-    error: Optional[str] = Field(None, description="에러 메시지")
+    percentile: Optional[int] = Field(None, description="백분위 점수 (0-100, 측정값이 없으면 null)")
 
 
 # 사용자 기본 정보
@@ -17,15 +15,34 @@ class UserInfo(BaseModel):
     
     gender: str = Field(..., description="성별")
     age: int = Field(..., description="나이")
+    bmi: Optional[float] = Field(None, description="BMI")
     age_group: str = Field(..., description="연령대")
-    reference_group: str = Field(..., description="참조 그룹")
+
+
+# 페르소나 정보
+class PersonaInfo(BaseModel):
+    
+    name: str = Field(..., description="페르소나 이름")
+    emoji: str = Field(..., description="이모지")
+    description: str = Field(..., description="설명")
+    characteristics: List[str] = Field(..., description="특징")
+    recommendation: str = Field(..., description="운동 조언")
+
+
+class PercentileData(BaseModel):
+    
+    user_info: UserInfo = Field(..., description="사용자 기본 정보")
+    average_score: Optional[float] = Field(None, description="종합 점수")
+    percentiles: Dict[str, ComponentPercentile] = Field(..., description="체력요소별 백분위")
+    persona: PersonaInfo = Field(..., description="페르소나 정보")
+    llm_report: str = Field(..., description="AI 리포트")
 
 
 class PercentileResponse(BaseModel):
     """백분위 계산 응답"""
     
     status: str
-    data: Dict[str, Any]
+    data: PercentileData
     message: str
     
     class Config:
@@ -111,4 +128,51 @@ class HealthCheckResponse(BaseModel):
     status: str
     version: str
     message: str
-    db_status: str = "unknown"
\ No newline at end of file
+    db_status: str = "unknown"
+
+
+# 체력 분석 이력 (GET /fit/score/history)
+class ComponentHistory(BaseModel):
+    
+    percentile: int = Field(..., description="백분위 점수 (0-100)")
+    delta: Optional[int] = Field(None, description="직전 측정 대비 변화량 (첫 측정이면 null)")
+
+
+class AnalysisHistoryItem(BaseModel):
+    
+    measured_at: datetime = Field(..., description="측정 시각")
+    average_score: float = Field(..., description="종합 점수")
+    average_score_delta: Optional[float] = Field(None, description="직전 측정 대비 종합 점수 변화량")
+    percentiles: Dict[str, ComponentHistory] = Field(..., description="체력요소별 백분위와 변화량")
+    persona: Optional[str] = Field(None, description="페르소나 타입")
+
+
+class AnalysisHistoryPage(BaseModel):
+    
+    items: List[AnalysisHistoryItem] = Field(..., description="최신순 측정 이력")
+    next_cursor: Optional[str] = Field(None, description="다음(더 과거) 페이지 커서. 없으면 마지막 페이지")
+
+
+class AnalysisHistoryResponse(BaseModel):
+    """체력 분석 이력 응답"""
+    
+    status: str
+    data: AnalysisHistoryPage
+    message: str
+
+
+class RecommendationResponse(BaseModel):
+    """맞춤 추천 운동 응답"""
+    
+    status: str
+    data: List[int] = Field(..., description="추천 운동 ID 목록")
+    message: str
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> ORJSONResponse:
+    """
+    이미 검증된 typed 응답 모델을 orjson 으로 바로 직렬화
+    모델 인스턴스를 그대로 반환하면 FastAPI 가 model_dump 후 response_model 로 한 번 더 검증하므로,
+    라우트의 response_model 은 OpenAPI 스키마용으로만 두고 Response 를 직접 반환합니다.
+    """
+    return ORJSONResponse(model.model_dump(mode="json"), status_code=status_code)
@@ -1,5 +1,6 @@
+from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -14,28 +15,108 @@ class Settings(BaseSettings):
     PORT: int = 8001
     DEBUG: bool = True
     
+    # 멀티 워커 실행 (gunicorn.conf.py, 0 이면 CPU 코어 수)
+    WORKERS: int = 0
+    WORKER_TIMEOUT: int = 120             # 응답 없는 워커 재시작 기준 (초, 가장 긴 LLM 호출보다 길게)
+    WORKER_WARM_DB_CONNECTIONS: int = 2   # 워커 시작 시 미리 열어 둘 DB 연결 수 (primary/복제본 각각)
+    # 워커별 메트릭 스냅샷 디렉터리 (비어 있으면 /metrics 는 응답한 프로세스 값만, gunicorn.conf.py 에서 기본값 지정)
+    METRICS_MULTIPROC_DIR: str = ""
+    METRICS_FLUSH_INTERVAL: float = 5.0   # 워커가 스냅샷을 기록하는 주기 (초, 다른 워커 값은 이만큼 늦게 반영)
+    
     # CORS 설정
     ALLOWED_ORIGINS: str = "https://mefoweb.com,https://api.mefoweb.com,http://localhost:5173,https://fit.mefoweb.com"
     
     # 데이터 경로
     REFERENCE_DATA_PATH: str = "outputs/reference_percentiles_real.json"
     
+    # 운동 카탈로그 인덱스 버전 확인 주기 (초)
+    CATALOG_VERSION_CHECK_INTERVAL: int = 60
+    CATALOG_SEGMENT_CACHE_SIZE: int = 4096  # (장소, 숙련도, 부상 부위) 세그먼트별 후보군 메모 상한
+    
     # OpenAI 설정
     OPENAI_API_KEY: str
     OPENAI_MODEL: str = "gpt-4o-mini"
+    OPENAI_BASE_URL: Optional[str] = None  # 로컬 mock LLM 등 OpenAI 호환 서버
     OPENAI_MAX_TOKENS: int = 800
     OPENAI_TEMPERATURE: float = 0.7
     
+    # LLM 서킷 브레이커 (연속 실패 시 일정 시간 호출 차단 후 fallback)
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    LLM_CIRCUIT_RESET_SECONDS: int = 30
+    
+    # LLM 엔드포인트 요청 제한 (사용자별 토큰 버킷, 분당 보충량 / 연속 허용 횟수)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_ROUTINE_PER_MINUTE: float = 1.0
+    RATE_LIMIT_ROUTINE_BURST: int = 3
+    RATE_LIMIT_SCORE_PER_MINUTE: float = 4.0
+    RATE_LIMIT_SCORE_BURST: int = 5
+    # 사용자별 하루 LLM 토큰 예산 (0 이면 무제한, 초과 시 /score 는 기본 리포트, /routine 은 429)
+    LLM_DAILY_TOKEN_BUDGET: int = 100000
+    
+    # Idempotency-Key (POST /routine, /score 재시도 중복 처리 방지)
+    IDEMPOTENCY_LOCK_TTL: int = 120          # 처리 중 기록 유지 시간 (초, 가장 긴 LLM 호출보다 길게)
+    IDEMPOTENCY_RESULT_TTL: int = 86400      # 완료된 응답 보관 시간 (초)
+    IDEMPOTENCY_WAIT_SECONDS: float = 60.0   # 재시도가 처리 중인 원 요청을 기다리는 최대 시간 (초)
+    
+    # LangSmith 트레이싱 설정 (API 키가 없으면 비활성화)
+    LANGSMITH_TRACING: bool = True
+    LANGSMITH_API_KEY: str = Field("", validation_alias=AliasChoices("LANGSMITH_API_KEY", "LANGCHAIN_API_KEY"))
+    LANGSMITH_ENDPOINT: str = Field(
+        "https://api.smith.langchain.com",
+        validation_alias=AliasChoices("LANGSMITH_ENDPOINT", "LANGCHAIN_ENDPOINT")
+    )
+    LANGSMITH_PROJECT: str = Field("default", validation_alias=AliasChoices("LANGSMITH_PROJECT", "LANGCHAIN_PROJECT"))
+    LANGSMITH_TRACING_SAMPLE_RATE: float = 0.1
+    LANGSMITH_MAX_PENDING_RUNS: int = 1000
+    
     # MYSQL 설정
     DATABASE_URL: str
+    DATABASE_READ_URL: Optional[str] = None  # 읽기 전용 복제본 (없으면 primary 사용)
+    # 쓰기 후 해당 사용자의 읽기를 primary 로 고정하는 시간 (초, 복제 지연 상한보다 길게)
+    DATABASE_READ_STICKY_SECONDS: int = 10
     
     # REDIS 설정
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     REDIS_PASSWORD: str = ""
+    REDIS_MAX_CONNECTIONS: int = 50      # 워커당 연결 풀 크기
+    REDIS_POOL_TIMEOUT: float = 2.0      # 풀이 가득 찼을 때 빈 연결을 기다리는 시간 (초)
+    REDIS_SOCKET_TIMEOUT: float = 2.0    # asyncio 클라이언트 명령 응답 대기 시간 (초)
     
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
+    
+    # 캐시 계층 설정 (코덱: orjson / msgpack(별도 설치), 압축: zstd / none)
+    CACHE_CODEC: str = "orjson"
+    CACHE_COMPRESSION: str = "none"
+    CACHE_COMPRESSION_MIN_BYTES: int = 512
+    RECOMMEND_CACHE_TTL: int = 1800
+    RECOMMEND_LOCAL_CACHE_TTL: float = 2.0
+    CATALOG_CACHE_TTL: int = 86400
+    REPORT_CACHE_TTL: int = 604800
+    REPORT_LOCAL_CACHE_TTL: float = 300.0
+
+    # 추천 사전 계산 (만료 전에 최근 활동 사용자의 추천을 미리 갱신)
+    RECOMMEND_PREWARM_ENABLED: bool = True
+    RECOMMEND_PREWARM_INTERVAL: int = 60            # 실행 주기 (초)
+    RECOMMEND_PREWARM_LEAD_SECONDS: int = 300       # 만료 몇 초 전부터 갱신할지 (주기보다 길게)
+    RECOMMEND_PREWARM_ACTIVE_WINDOW: int = 86400    # 이 시간 안에 조회한 사용자만 대상 (초)
+    RECOMMEND_PREWARM_BATCH_SIZE: int = 200         # 배치당 사용자 수 (DB 조회 2번 + 파이프라인 1번)
+    RECOMMEND_PREWARM_CONCURRENCY: int = 2          # 동시에 처리할 배치 수 (DB 연결 사용 수)
+    RECOMMEND_PREWARM_MAX_USERS: int = 20000        # 1회 실행당 최대 사용자 수
+    
+    # 인증 캐시 설정
+    AUTH_CLAIMS_CACHE_SIZE: int = 10000
+    AUTH_CLAIMS_CACHE_MAX_TTL: int = 300
+    AUTH_USER_CACHE_SIZE: int = 10000
+    AUTH_USER_CACHE_TTL: int = 300
+    AUTH_USER_REDIS_TTL: int = 3600
+    # 사용자 관리 서비스가 캐시 무효화를 호출할 때 쓰는 토큰 (X-Internal-Token, 비어 있으면 내부 엔드포인트 비활성)
+    INTERNAL_API_TOKEN: str = ""
+    
+    # 헬스체크 (/readyz 스냅샷 갱신 주기, 개별 점검 타임아웃)
+    READINESS_REFRESH_INTERVAL: int = 10
+    READINESS_CHECK_TIMEOUT: float = 2.0
 
     
     @property
@@ -1,4 +1,6 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 import os
 from dotenv import load_dotenv
@@ -18,6 +20,56 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 비동기 드라이버 매핑 (DATABASE_ASYNC_URL 이 없으면 DATABASE_URL 에서 유도)
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+SQLALCHEMY_ASYNC_DATABASE_URL = os.getenv("DATABASE_ASYNC_URL") or to_async_url(SQLALCHEMY_DATABASE_URL)
+
+async_engine = create_async_engine(
+    SQLALCHEMY_ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# 읽기 전용 복제본 (DATABASE_READ_URL 이 없으면 primary 를 그대로 사용)
+SQLALCHEMY_READ_DATABASE_URL = os.getenv("DATABASE_READ_URL")
+READ_REPLICA_ENABLED = bool(SQLALCHEMY_READ_DATABASE_URL)
+
+if READ_REPLICA_ENABLED:
+    read_async_engine = create_async_engine(
+        os.getenv("DATABASE_READ_ASYNC_URL") or to_async_url(SQLALCHEMY_READ_DATABASE_URL),
+        pool_pre_ping=True,
+        pool_recycle=3600,
+    )
+    AsyncReadSessionLocal = async_sessionmaker(
+        bind=read_async_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+else:
+    read_async_engine = async_engine
+    AsyncReadSessionLocal = AsyncSessionLocal
+
 Base = declarative_base()
 
 def get_db():
@@ -25,4 +77,15 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    """복제본 세션 (사용자별 read-your-writes 가 필요하면 deps.get_user_read_db 사용)"""
+    async with AsyncReadSessionLocal() as db:
+        yield db
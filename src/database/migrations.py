@@ -0,0 +1,94 @@
+import logging
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, select
+from sqlalchemy.engine import Connection, Engine
+
+from src.database.models import Base, AnalysisHistory
+
+logger = logging.getLogger(__name__)
+
+# 버전 관리 스키마 마이그레이션 (전진 전용)
+# - 적용 이력은 schema_migrations 테이블에 기록
+# - 각 버전은 자체 트랜잭션에서 실행되며, 실패 시 해당 버전부터 다시 실행 가능하도록 멱등하게 작성
+# - 새 버전은 MIGRATIONS 끝에 추가만 하고, 이미 배포된 버전은 수정하지 않습니다.
+
+_meta = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _meta,
+    Column("version", String(64), primary_key=True),
+    Column("description", String(255)),
+    Column("applied_at", DateTime(6), nullable=False),
+)
+
+
+def _model_index(table_name: str, index_name: str):
+    table = Base.metadata.tables[table_name]
+    return next(i for i in table.indexes if i.name == index_name)
+
+
+def _has_leading_index(conn: Connection, table_name: str, column_name: str) -> bool:
+    """해당 컬럼으로 시작하는 인덱스/PK/유니크 제약이 이미 있는지 (MySQL 은 FK 생성 시 인덱스를 자동 생성)"""
+    inspector = inspect(conn)
+    candidates = [i["column_names"] for i in inspector.get_indexes(table_name)]
+    candidates += [u["column_names"] for u in inspector.get_unique_constraints(table_name)]
+    candidates.append(inspector.get_pk_constraint(table_name)["constrained_columns"])
+    return any(cols and cols[0] == column_name for cols in candidates)
+
+
+def _ensure_index(conn: Connection, table_name: str, index_name: str):
+    index = _model_index(table_name, index_name)
+    column_name = index.columns[0].name
+    if _has_leading_index(conn, table_name, column_name):
+        logger.info(f"인덱스 생략 ({table_name}.{column_name} 에 이미 인덱스 존재)")
+        return
+    index.create(conn)
+    logger.info(f"인덱스 생성: {index_name}")
+
+
+def _0001_service_lookup_indexes(conn: Connection):
+    _ensure_index(conn, "user", "ix_user_login_id")
+    _ensure_index(conn, "health", "ix_health_user_id")
+    _ensure_index(conn, "exercise_plan", "ix_exercise_plan_user_id")
+    _ensure_index(conn, "exercise_list", "ix_exercise_list_exercise_plan_id")
+    _ensure_index(conn, "exercise_restricts", "ix_exercise_restricts_exercise_restrict")
+
+
+def _0002_analysis_history(conn: Connection):
+    AnalysisHistory.__table__.create(conn, checkfirst=True)
+
+
+MIGRATIONS: List[Tuple[str, str, Callable[[Connection], None]]] = [
+    ("0001", "서비스 조회 컬럼 보조 인덱스", _0001_service_lookup_indexes),
+    ("0002", "체력 분석 이력 테이블 (analysis_history)", _0002_analysis_history),
+]
+
+
+def applied_versions(engine: Engine) -> List[str]:
+    _meta.create_all(engine, tables=[schema_migrations])
+    with engine.connect() as conn:
+        return list(conn.execute(select(schema_migrations.c.version).order_by(schema_migrations.c.version)).scalars())
+
+
+def pending_migrations(engine: Engine):
+    applied = set(applied_versions(engine))
+    return [m for m in MIGRATIONS if m[0] not in applied]
+
+
+def upgrade(engine: Engine) -> List[str]:
+    """미적용 버전을 순서대로 적용하고 적용한 버전 목록을 반환"""
+    done = []
+    for version, description, apply in pending_migrations(engine):
+        logger.info(f"마이그레이션 적용: {version} ({description})")
+        with engine.begin() as conn:
+            apply(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=version,
+                description=description,
+                applied_at=datetime.now()
+            ))
+        done.append(version)
+    return done
@@ -1,17 +1,20 @@
-from sqlalchemy import Column, Integer, String, Float, Enum, ForeignKey, DateTime, Boolean, BigInteger
+from sqlalchemy import Column, Integer, String, Float, Enum, ForeignKey, DateTime, Boolean, BigInteger, SmallInteger, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
 Base = declarative_base()
 
+# MySQL 에서는 BIGINT, 로컬 SQLite 에서는 autoincrement 가 동작하는 INTEGER PRIMARY KEY
+BigIntPK = BigInteger().with_variant(Integer, "sqlite")
+
 class User(Base):
     __tablename__ = "user"
 
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(BigIntPK, primary_key=True, autoincrement=True)
     created_at = Column(DateTime(6))
     updated_at = Column(DateTime(6))
-    login_id = Column(String(255), nullable=False)
+    login_id = Column(String(255), nullable=False, index=True)
     name = Column(String(255), nullable=False)
     password = Column(String(255), nullable=True)
     picture = Column(String(255), nullable=True)
@@ -22,7 +25,7 @@ class User(Base):
 class Exercise(Base):
     __tablename__ = "exercise"
     
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(BigIntPK, primary_key=True, autoincrement=True)
     created_at = Column(DateTime(6))
     updated_at = Column(DateTime(6))
 
@@ -48,7 +51,8 @@ class ExerciseRestrict(Base):
     __tablename__ = "exercise_restricts"
     
     exercise_id = Column(BigInteger, ForeignKey("exercise.id"), primary_key=True) 
-    exercise_restrict = Column(String(50), primary_key=True)
+    # 복합 PK(exercise_id, exercise_restrict) 는 제한 부위 단독 조회에 쓰이지 않으므로 별도 인덱스
+    exercise_restrict = Column(String(50), primary_key=True, index=True)
     
     exercise = relationship("Exercise", back_populates="restricts")
 
@@ -56,10 +60,10 @@ class ExerciseRestrict(Base):
 class Health(Base):
     __tablename__ = "health"
     
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(BigIntPK, primary_key=True, autoincrement=True)
     created_at = Column(DateTime(6))
     updated_at = Column(DateTime(6))
-    user_id = Column(BigInteger, ForeignKey("user.id"))
+    user_id = Column(BigInteger, ForeignKey("user.id"), index=True)
     birth = Column(String(10))
     gender = Column(String(10))
     height = Column(Float, nullable=False)
@@ -84,11 +88,11 @@ class UserRestrict(Base):
 class ExercisePlan(Base):
     __tablename__ = "exercise_plan"
     
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(BigIntPK, primary_key=True, autoincrement=True)
     created_at = Column(DateTime(6), default=datetime.now)
     updated_at = Column(DateTime(6), default=datetime.now, onupdate=datetime.now)
     
-    user_id = Column(BigInteger, ForeignKey("user.id"))
+    user_id = Column(BigInteger, ForeignKey("user.id"), index=True)
     day = Column(Integer, nullable=False)
     title = Column(String(255))
     description = Column(String(255))
@@ -102,11 +106,11 @@ class ExercisePlan(Base):
 class ExerciseList(Base):
     __tablename__ = "exercise_list"
     
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(BigIntPK, primary_key=True, autoincrement=True)
     created_at = Column(DateTime(6), default=datetime.now)
     updated_at = Column(DateTime(6), default=datetime.now, onupdate=datetime.now)
     
-    exercise_plan_id = Column(BigInteger, ForeignKey("exercise_plan.id"))
+    exercise_plan_id = Column(BigInteger, ForeignKey("exercise_plan.id"), index=True)
     exercise_id = Column(BigInteger, ForeignKey("exercise.id"))
     sequence = Column(Integer, nullable=False)
 
@@ -117,7 +121,7 @@ class ExerciseList(Base):
 class AnalyzeResult(Base):
     __tablename__ = "analyze_result"
 
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(BigIntPK, primary_key=True, autoincrement=True)
     created_at = Column(DateTime(6), default=datetime.now)
     updated_at = Column(DateTime(6), default=datetime.now, onupdate=datetime.now)
     
@@ -135,4 +139,43 @@ class AnalyzeResult(Base):
 
     persona = Column(String(50)) 
     
-    # user = relationship("User", back_populates="analyze_result") 
\ No newline at end of file
+    # user = relationship("User", back_populates="analyze_result")
+
+
+class AnalysisHistory(Base):
+    """
+    체력 분석 이력 (추가 전용)
+    AnalyzeResult 는 사용자별 최신 결과 1건(빠른 조회용)이고, 측정할 때마다 여기에 1행씩 쌓입니다.
+    리포트 본문은 저장하지 않고 (user_id, created_at) 범위 조회에 필요한 값만 작은 타입으로 보관합니다.
+    """
+    __tablename__ = "analysis_history"
+    __table_args__ = (
+        Index("ix_analysis_history_user_id_created_at", "user_id", "created_at"),
+    )
+
+    id = Column(BigIntPK, primary_key=True, autoincrement=True)
+    user_id = Column(BigInteger, ForeignKey("user.id"), nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+
+    average_score = Column(Float, nullable=False)
+
+    # 백분위 (0-100)
+    per_agility = Column(SmallInteger, nullable=False)
+    per_body_composition = Column(SmallInteger, nullable=False)
+    per_cardio = Column(SmallInteger, nullable=False)
+    per_core = Column(SmallInteger, nullable=False)
+    per_flexibility = Column(SmallInteger, nullable=False)
+    per_strength = Column(SmallInteger, nullable=False)
+
+    persona = Column(String(50))
+
+
+# 체력요소(한글 키) -> AnalyzeResult 백분위 컬럼
+ANALYSIS_COMPONENT_COLUMNS = {
+    '근력': 'per_strength',
+    '심폐지구력': 'per_cardio',
+    '코어': 'per_core',
+    '유연성': 'per_flexibility',
+    '민첩성': 'per_agility',
+    '체성분': 'per_body_composition',
+}
@@ -1,12 +1,56 @@
 import redis
+import redis.asyncio as aioredis
 from src.config import settings
 
 redis_client = redis.Redis(
     host=settings.REDIS_HOST,
     port=settings.REDIS_PORT,
     password=settings.REDIS_PASSWORD,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
     decode_responses=True
 )
 
 def get_redis():
-    return redis_client
\ No newline at end of file
+    return redis_client
+
+
+# 캐시 계층(src/utils/cache.py)용: 압축/바이너리 코덱 값을 그대로 주고받도록 bytes 응답
+redis_binary_client = redis.Redis(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    password=settings.REDIS_PASSWORD,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    decode_responses=False
+)
+
+def get_redis_binary():
+    return redis_binary_client
+
+
+# 요청 경로(async 엔드포인트)용 asyncio 클라이언트
+# - 스레드풀 슬롯을 쓰지 않으므로 LLM 호출(루틴 생성)과 스레드풀을 두고 경쟁하지 않음
+# - 워커당 최대 REDIS_MAX_CONNECTIONS 개 연결, 모두 사용 중이면 REDIS_POOL_TIMEOUT 초까지 대기
+def _async_pool(decode_responses: bool) -> aioredis.BlockingConnectionPool:
+    return aioredis.BlockingConnectionPool(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        password=settings.REDIS_PASSWORD,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        decode_responses=decode_responses
+    )
+
+async_redis_client = aioredis.Redis(connection_pool=_async_pool(True))
+async_redis_binary_client = aioredis.Redis(connection_pool=_async_pool(False))
+
+def get_async_redis():
+    return async_redis_client
+
+def get_async_redis_binary():
+    return async_redis_binary_client
+
+async def close_async_redis():
+    """서버 종료 시 asyncio 연결 풀 정리"""
+    for client in (async_redis_client, async_redis_binary_client):
+        await client.connection_pool.disconnect()
@@ -0,0 +1,159 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, insert, delete, and_, or_
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models import AnalyzeResult, AnalysisHistory, ExercisePlan, ExerciseList
+
+
+def build_upsert(model, dialect_name: str, values: Dict[str, Any], conflict_column: str, update_columns):
+    """
+    단일 INSERT ... ON DUPLICATE KEY UPDATE (MySQL) / ON CONFLICT DO UPDATE (SQLite) 문 생성
+    """
+    if dialect_name == "mysql":
+        stmt = mysql.insert(model).values(**values)
+        return stmt.on_duplicate_key_update({col: stmt.inserted[col] for col in update_columns})
+
+    if dialect_name == "sqlite":
+        stmt = sqlite.insert(model).values(**values)
+        return stmt.on_conflict_do_update(
+            index_elements=[conflict_column],
+            set_={col: stmt.excluded[col] for col in update_columns}
+        )
+
+    raise NotImplementedError(f"upsert 를 지원하지 않는 DB 입니다: {dialect_name}")
+
+
+class AnalyzeResultRepository:
+    """AnalyzeResult 저장소 (user_id 당 최신 결과 1건)"""
+
+    # 재측정 시 갱신하는 컬럼 (id, user_id, created_at 은 유지)
+    UPDATE_COLUMNS = (
+        "updated_at", "average_score", "llm_report",
+        "per_agility", "per_body_composition", "per_cardio",
+        "per_core", "per_flexibility", "per_strength", "persona",
+    )
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def save(self, user_id: int, **values):
+        now = datetime.now()
+        stmt = build_upsert(
+            AnalyzeResult,
+            self.db.bind.dialect.name,
+            {"user_id": user_id, "created_at": now, "updated_at": now, **values},
+            conflict_column="user_id",
+            update_columns=self.UPDATE_COLUMNS,
+        )
+        await self.db.execute(stmt)
+
+
+class AnalysisHistoryRepository:
+    """체력 분석 이력 (추가 전용, (user_id, created_at) 인덱스로 범위 조회)"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def append(self, user_id: int, **values):
+        await self.db.execute(
+            # created_at 은 초 단위 DATETIME (키셋 커서의 동일 시각 구분은 id 로 처리)
+            insert(AnalysisHistory).values(user_id=user_id, created_at=datetime.now().replace(microsecond=0), **values)
+        )
+
+    async def list_before(self, user_id: int, limit: int, before: Optional[Tuple[datetime, int]] = None):
+        """
+        최신순 키셋 페이지네이션
+        before: 이전 페이지 마지막 행의 (created_at, id). 없으면 가장 최근부터
+        """
+        stmt = select(AnalysisHistory).where(AnalysisHistory.user_id == user_id)
+        if before is not None:
+            created_at, history_id = before
+            stmt = stmt.where(or_(
+                AnalysisHistory.created_at < created_at,
+                and_(AnalysisHistory.created_at == created_at, AnalysisHistory.id < history_id)
+            ))
+        stmt = stmt.order_by(AnalysisHistory.created_at.desc(), AnalysisHistory.id.desc()).limit(limit)
+        return list((await self.db.execute(stmt)).scalars().all())
+
+
+class ExercisePlanRepository:
+    """주간 루틴(ExercisePlan 7건 + ExerciseList) 저장소"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def replace_weekly_routine(self, user_id: int, plans: List[Dict[str, Any]]):
+        """
+        기존 루틴을 지우고 새 루틴을 저장합니다. (커밋은 호출자가 수행)
+        plans: [{"day", "title", "description", "image", "exercises": [{"exercise_id", "sequence"}]}]
+
+        - 삭제: 자식/부모 각각 user_id 조건 DELETE 1번씩 (사전 SELECT 없음)
+        - 저장: exercise_plan 다중 행 INSERT 1번 + exercise_list 다중 행 INSERT 1번
+        """
+        plan_ids_of_user = select(ExercisePlan.id).where(ExercisePlan.user_id == user_id)
+        await self.db.execute(
+            delete(ExerciseList)
+            .where(ExerciseList.exercise_plan_id.in_(plan_ids_of_user))
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.execute(
+            delete(ExercisePlan)
+            .where(ExercisePlan.user_id == user_id)
+            .execution_options(synchronize_session=False)
+        )
+
+        now = datetime.now()
+        plan_rows = [
+            {
+                "user_id": user_id,
+                "day": plan["day"],
+                "title": plan["title"],
+                "description": plan["description"],
+                "image": plan["image"],
+                "progress": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for plan in plans
+        ]
+        plan_ids = await self._insert_plans(user_id, plan_rows)
+        # 재조회 결과에 다른 요청이 넣은 행이 섞이면 요일이 어긋나므로 저장하지 않음 (호출자가 롤백)
+        if len(plan_ids) != len(plan_rows):
+            raise RuntimeError(
+                f"저장한 루틴 수({len(plan_rows)})와 조회된 id 수({len(plan_ids)})가 다릅니다 (user_id={user_id})"
+            )
+
+        list_rows = [
+            {
+                "exercise_plan_id": plan_id,
+                "exercise_id": item["exercise_id"],
+                "sequence": item["sequence"],
+                "created_at": now,
+                "updated_at": now,
+            }
+            for plan, plan_id in zip(plans, plan_ids)
+            for item in plan["exercises"]
+        ]
+        if list_rows:
+            await self.db.execute(insert(ExerciseList), list_rows)
+
+    async def _insert_plans(self, user_id: int, plan_rows: List[Dict[str, Any]]) -> List[int]:
+        """다중 행 INSERT 후 plan_rows 순서대로 생성된 id 반환"""
+        dialect = self.db.bind.dialect
+        if dialect.insert_executemany_returning_sort_by_parameter_order:
+            result = await self.db.execute(
+                insert(ExercisePlan).returning(ExercisePlan.id, sort_by_parameter_order=True),
+                plan_rows
+            )
+            return list(result.scalars().all())
+
+        # MySQL 은 RETURNING 미지원 -> 같은 트랜잭션에서 user_id 인덱스로 재조회
+        # (기존 행은 이미 삭제했고, 단일 INSERT 문의 auto_increment 값은 행 순서대로 증가)
+        await self.db.execute(insert(ExercisePlan), plan_rows)
+        result = await self.db.execute(
+            select(ExercisePlan.id).where(ExercisePlan.user_id == user_id).order_by(ExercisePlan.id)
+        )
+        return list(result.scalars().all())
@@ -0,0 +1,51 @@
+import logging
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.config import settings
+from src.database.database import AsyncSessionLocal, AsyncReadSessionLocal, READ_REPLICA_ENABLED
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# 읽기/쓰기 세션 라우팅
+# - 쓰기: 항상 primary (AsyncSessionLocal)
+# - 읽기: 복제본 (AsyncReadSessionLocal)
+# - read-your-writes: 사용자가 쓰기를 한 직후 DATABASE_READ_STICKY_SECONDS 동안은
+#   그 사용자의 읽기도 primary 로 보냄 (프로세스 내 캐시 + 워커 간 공유를 위한 Redis 키)
+
+_sticky_users = TTLCache(maxsize=10000, ttl=settings.DATABASE_READ_STICKY_SECONDS)
+
+
+def _sticky_key(user_id: int) -> str:
+    return f"db:sticky:{user_id}"
+
+
+async def mark_user_write(redis: Redis, user_id: int):
+    """사용자 데이터를 primary 에 커밋한 직후 호출"""
+    if not READ_REPLICA_ENABLED:
+        return
+    _sticky_users.set(user_id, True)
+    try:
+        await redis.set(_sticky_key(user_id), 1, ex=settings.DATABASE_READ_STICKY_SECONDS)
+    except Exception as e:
+        logger.warning(f"read-your-writes 표시(Redis) 실패: {e}")
+
+
+async def is_sticky(redis: Redis, user_id: int) -> bool:
+    if _sticky_users.get(user_id):
+        return True
+    try:
+        return bool(await redis.exists(_sticky_key(user_id)))
+    except Exception as e:
+        # 쓰기 여부를 알 수 없으면 최신 데이터를 보장하는 primary 로 보냄
+        logger.warning(f"read-your-writes 확인(Redis) 실패: {e}")
+        return True
+
+
+async def read_session_factory(redis: Redis, user_id: int) -> async_sessionmaker:
+    """해당 사용자의 읽기 전용 요청에 사용할 세션 팩토리"""
+    if not READ_REPLICA_ENABLED or await is_sticky(redis, user_id):
+        return AsyncSessionLocal
+    return AsyncReadSessionLocal
@@ -1,7 +1,16 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from src.config import settings
-from src.api.endpoints import health, fitness, routine, recommendation
+from src.api.endpoints import health, fitness, routine, recommendation, metrics, internal
+from src.api.middleware import IdempotencyMiddleware, MetricsMiddleware, RateLimitMiddleware
+from src.database.database import AsyncReadSessionLocal
+from src.database.redis import close_async_redis
+from src.recommendation.catalog_index import aget_catalog_index
+from src.recommendation.prewarm import prewarmer
+from src.utils.preload import warm_worker
+from src.utils.metrics_multiproc import multiprocess_metrics
+from src.utils.readiness import readiness
 import logging
 
 # 로깅 설정
@@ -17,9 +26,18 @@ app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    # 기본 응답 직렬화는 orjson (typed 응답은 src/api/models/response.py 의 model_response 사용)
+    default_response_class=ORJSONResponse
 )
 
+# LLM 엔드포인트 사용자별 요청 제한 / 하루 토큰 예산 (CORS 안쪽에 두어 429 응답에도 CORS 헤더가 붙도록)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
+# Idempotency-Key 재시도 중복 처리 방지 (요청 제한 바깥: 재시도/재전송은 버킷 토큰을 쓰지 않음)
+app.add_middleware(IdempotencyMiddleware)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -29,11 +47,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청 지연 시간 메트릭
+app.add_middleware(MetricsMiddleware)
+
 # 라우터 등록
 app.include_router(health.router, prefix="", tags=["Health"])
+app.include_router(metrics.router, prefix="", tags=["Metrics"])
 app.include_router(fitness.router, prefix=settings.API_V1_PREFIX, tags=["건강정보"])
 app.include_router(routine.router, prefix=settings.API_V1_PREFIX, tags=["운동루틴"])
 app.include_router(recommendation.router, prefix=settings.API_V1_PREFIX, tags=["운동추천"])
+app.include_router(internal.router, prefix=settings.API_V1_PREFIX, tags=["내부"])
 
 
 @app.on_event("startup")
@@ -45,12 +68,37 @@ async def startup_event():
     logger.info(f"API 문서: http://{settings.HOST}:{settings.PORT}/docs")
     logger.info(f"ReDoc: http://{settings.HOST}:{settings.PORT}/redoc")
     logger.info("=" * 80)
+    
+    # 운동 카탈로그 인덱스 미리 로드 (gunicorn preload 로 이미 로드됐으면 버전 확인만, 실패 시 첫 요청에서 다시 시도)
+    try:
+        async with AsyncReadSessionLocal() as db:
+            await aget_catalog_index(db)
+    except Exception as e:
+        logger.error(f"운동 카탈로그 인덱스 로드 실패: {e}")
+    
+    # LLM 클라이언트 / DB 연결 풀 준비 (gunicorn 멀티 워커에서는 워커마다 실행)
+    await warm_worker()
+    
+    # 준비 상태 스냅샷 첫 갱신 후 백그라운드 주기 갱신 시작
+    await readiness.refresh()
+    readiness.start()
+    
+    # 워커 메트릭 스냅샷 주기 기록 (멀티 워커 /metrics 합산용)
+    multiprocess_metrics.start()
+    
+    # 추천 캐시 사전 계산 (여러 워커 중 Redis 리더 키를 잡은 하나만 실행)
+    if settings.RECOMMEND_PREWARM_ENABLED:
+        prewarmer.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """서버 종료 시 실행"""
     logger.info("서버를 종료합니다...")
+    await readiness.stop()
+    await prewarmer.stop()
+    await multiprocess_metrics.stop()
+    await close_async_redis()
 
 
 @app.get("/")
@@ -0,0 +1,276 @@
+import hashlib
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.database.models import Exercise, ExerciseRestrict
+from src.utils.cache import catalog_cache
+from src.utils.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+# 홈트레이닝에서 제외하는 장비 (기존 SQL 의 NOT LIKE '%...%' 조건과 동일)
+HOME_EXCLUDED_EQUIPMENT = ("MACHINE", "PULL_UP_BAR", "BARBELL", "BENCH")
+
+# (장소, 숙련도, 정렬된 부상 부위)
+SegmentKey = Tuple[Optional[str], Optional[str], Tuple[str, ...]]
+
+
+class CatalogIndex:
+    """
+    운동 카탈로그 인메모리 인덱스
+    운동마다 비트 위치를 부여하고 장비/난이도/제한 부위별 비트셋(int)을 미리 계산해 두어,
+    (장소, 숙련도, 부상 부위) 조합의 후보군 필터링을 비트 연산 몇 번으로 처리합니다.
+    필터 결과는 세그먼트 키별로 메모해 두며, 카탈로그 버전이 바뀌면 인덱스와 함께 새로 만들어집니다.
+    """
+
+    def __init__(self, exercises: List[Dict[str, Any]], restricts: Iterable[Tuple[int, str]], version: tuple):
+        self.version = version
+        self.exercises = exercises
+        self.positions = {ex["id"]: pos for pos, ex in enumerate(exercises)}
+        self.all_mask = (1 << len(exercises)) - 1
+
+        self.equipment_masks: Dict[Optional[str], int] = {}
+        self.difficulty_masks: Dict[Optional[str], int] = {}
+        self.restrict_masks: Dict[str, int] = {}
+
+        for pos, ex in enumerate(exercises):
+            bit = 1 << pos
+            self.equipment_masks[ex["equipment"]] = self.equipment_masks.get(ex["equipment"], 0) | bit
+            self.difficulty_masks[ex["difficulty"]] = self.difficulty_masks.get(ex["difficulty"], 0) | bit
+
+        for exercise_id, restrict in restricts:
+            pos = self.positions.get(exercise_id)
+            if pos is not None:
+                self.restrict_masks[restrict] = self.restrict_masks.get(restrict, 0) | (1 << pos)
+
+        # SQL 의 NULL 비교 결과와 맞추기 위해 장비/난이도가 NULL 인 운동도 제외 대상에 포함
+        self.home_excluded_mask = 0
+        for equipment, mask in self.equipment_masks.items():
+            if equipment is None or any(k in equipment for k in HOME_EXCLUDED_EQUIPMENT):
+                self.home_excluded_mask |= mask
+        self.beginner_excluded_mask = self.difficulty_masks.get("HARD", 0) | self.difficulty_masks.get(None, 0)
+
+        # 세그먼트 키 -> 후보 운동 (사용자 수와 무관하게 (장소, 숙련도, 부상 부위 조합) 수만큼만 생김)
+        self._segments: Dict[SegmentKey, Tuple[Dict[str, Any], ...]] = {}
+
+    def segment_key(self, place: Optional[str], proficiency: Optional[str], injuries: Iterable[str]) -> SegmentKey:
+        """
+        후보군을 결정하는 입력만 남긴 정규화 키
+        장소/숙련도는 필터에 쓰이는 값이 아니면 None 으로, 부상 부위는 제한 어휘에 있는 것만 정렬해서 사용
+        """
+        return (
+            place if place == "HOME" else None,
+            proficiency if proficiency == "BEGINNER" else None,
+            tuple(sorted({injury for injury in injuries if injury in self.restrict_masks})),
+        )
+
+    def filter_mask(self, place: Optional[str], proficiency: Optional[str], injuries: Iterable[str]) -> int:
+        mask = self.all_mask
+        if place == "HOME":
+            mask &= ~self.home_excluded_mask
+        if proficiency == "BEGINNER":
+            mask &= ~self.beginner_excluded_mask
+        for injury in injuries:
+            mask &= ~self.restrict_masks.get(injury, 0)
+        return mask
+
+    def from_mask(self, mask: int) -> List[Dict[str, Any]]:
+        """비트셋 -> 운동 dict 리스트 (id 순서). dict 는 공유 객체이므로 수정하지 말 것"""
+        result = []
+        while mask:
+            low = mask & -mask
+            result.append(self.exercises[low.bit_length() - 1])
+            mask ^= low
+        return result
+
+    def segment_candidates(self, key: SegmentKey) -> Tuple[Dict[str, Any], ...]:
+        cached = self._segments.get(key)
+        if cached is not None:
+            CACHE_REQUESTS.labels("catalog_segment", "local_hit").inc()
+            return cached
+
+        CACHE_REQUESTS.labels("catalog_segment", "miss").inc()
+        result = tuple(self.from_mask(self.filter_mask(*key)))
+        if len(self._segments) >= settings.CATALOG_SEGMENT_CACHE_SIZE:
+            # 비정상적으로 조합이 많아지면 메모를 비우고 다시 채움 (메모리 상한)
+            self._segments.clear()
+        self._segments[key] = result
+        return result
+
+    def candidates(self, place: Optional[str], proficiency: Optional[str], injuries: Iterable[str]) -> List[Dict[str, Any]]:
+        return list(self.segment_candidates(self.segment_key(place, proficiency, injuries)))
+
+    @property
+    def segment_count(self) -> int:
+        return len(self._segments)
+
+
+def _version_query(dialect_name: str):
+    # 운동 테이블의 행 수/최대 id/최종 수정 시각 + 제한 테이블의 행 수와 내용 지문으로 카탈로그 버전을 판단
+    # (행 수가 같아도 제한 부위가 바뀌면 버전이 달라져야 부상 부위 필터가 이전 값으로 남지 않음)
+    columns = [
+        select(func.count(Exercise.id)).scalar_subquery(),
+        select(func.max(Exercise.id)).scalar_subquery(),
+        select(func.max(Exercise.updated_at)).scalar_subquery(),
+        select(func.count()).select_from(ExerciseRestrict).scalar_subquery(),
+    ]
+    if dialect_name == "mysql":
+        # 행 순서와 무관한 지문: 행별 CRC32 의 XOR (PK 가 (exercise_id, exercise_restrict) 라 중복 행 없음)
+        row_crc = func.crc32(func.concat(ExerciseRestrict.exercise_id, ":", ExerciseRestrict.exercise_restrict))
+        columns.append(select(func.coalesce(func.bit_xor(row_crc), 0)).scalar_subquery())
+    return select(*columns)
+
+
+def _restrict_fingerprint(restrict_rows) -> str:
+    """CRC32 집계가 없는 DB(SQLite 등)용: 제한 행을 읽어 프로세스에서 지문 계산"""
+    digest = hashlib.sha1()
+    for exercise_id, restrict in sorted((int(e), str(r)) for e, r in restrict_rows):
+        digest.update(f"{exercise_id}:{restrict}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def _exercise_query():
+    return select(
+        Exercise.id,
+        Exercise.exercise_name,
+        Exercise.target_area,
+        Exercise.difficulty,
+        Exercise.equipment,
+        Exercise.type,
+        Exercise.mets,
+        Exercise.image
+    ).order_by(Exercise.id)
+
+
+def _restrict_query():
+    return select(ExerciseRestrict.exercise_id, ExerciseRestrict.exercise_restrict)
+
+
+def _to_exercise_dict(row) -> Dict[str, Any]:
+    return {
+        "id": row["id"],
+        "name": row["exercise_name"],
+        "part": row["target_area"],
+        "difficulty": row["difficulty"],
+        "equipment": row["equipment"],
+        "type": row["type"],
+        "mets": row["mets"],
+        "image": row["image"]
+    }
+
+
+_index: Optional[CatalogIndex] = None
+_checked_at = 0.0
+
+
+def _needs_check() -> bool:
+    return _index is None or time.monotonic() - _checked_at >= settings.CATALOG_VERSION_CHECK_INTERVAL
+
+
+# 캐시에 저장하는 운동 dict 형식이 바뀌면 올림 (이전 형식 캐시를 읽지 않도록)
+CATALOG_FORMAT = 2
+
+
+def _version_key(version: tuple) -> str:
+    return ":".join([f"v{CATALOG_FORMAT}", *(str(v) for v in version)])
+
+
+def _install(version: tuple, exercises: List[Dict[str, Any]], restricts) -> CatalogIndex:
+    global _index
+    _index = CatalogIndex(exercises, [tuple(r) for r in restricts], version)
+    logger.info(f"운동 카탈로그 인덱스 로드 완료 ({len(_index.exercises)}개, version={version})")
+    return _index
+
+
+def _load_cached(version: tuple) -> Optional[CatalogIndex]:
+    # 같은 버전을 다른 워커가 이미 읽었다면 DB 대신 Redis 에서 로드
+    cached = catalog_cache.get(_version_key(version))
+    if cached is None:
+        return None
+    return _install(version, cached["exercises"], cached["restricts"])
+
+
+async def _aload_cached(version: tuple) -> Optional[CatalogIndex]:
+    cached = await catalog_cache.aget(_version_key(version))
+    if cached is None:
+        return None
+    return _install(version, cached["exercises"], cached["restricts"])
+
+
+def _serialize(exercise_rows, restrict_rows) -> Dict[str, Any]:
+    return {
+        "exercises": [_to_exercise_dict(r) for r in exercise_rows],
+        "restricts": [[exercise_id, restrict] for exercise_id, restrict in restrict_rows],
+    }
+
+
+def _store(version: tuple, exercise_rows, restrict_rows) -> CatalogIndex:
+    payload = _serialize(exercise_rows, restrict_rows)
+    catalog_cache.set(_version_key(version), payload)
+    return _install(version, payload["exercises"], payload["restricts"])
+
+
+async def _astore(version: tuple, exercise_rows, restrict_rows) -> CatalogIndex:
+    payload = _serialize(exercise_rows, restrict_rows)
+    await catalog_cache.aset(_version_key(version), payload)
+    return _install(version, payload["exercises"], payload["restricts"])
+
+
+def get_catalog_index(db: Session) -> CatalogIndex:
+    """프로세스 전역 카탈로그 인덱스 (버전이 바뀌면 Redis -> DB 순서로 다시 로드)"""
+    global _checked_at
+    if not _needs_check():
+        return _index
+
+    dialect_name = db.get_bind().dialect.name
+    version = tuple(db.execute(_version_query(dialect_name)).one())
+    if dialect_name != "mysql":
+        version += (_restrict_fingerprint(db.execute(_restrict_query()).all()),)
+    _checked_at = time.monotonic()
+    if _index is not None and _index.version == version:
+        return _index
+
+    index = _load_cached(version)
+    if index is not None:
+        return index
+    exercise_rows = db.execute(_exercise_query()).mappings().all()
+    restrict_rows = db.execute(_restrict_query()).all()
+    return _store(version, exercise_rows, restrict_rows)
+
+
+async def aget_catalog_index(db: AsyncSession) -> CatalogIndex:
+    global _checked_at
+    if not _needs_check():
+        return _index
+
+    dialect_name = db.get_bind().dialect.name
+    version = tuple((await db.execute(_version_query(dialect_name))).one())
+    if dialect_name != "mysql":
+        version += (_restrict_fingerprint((await db.execute(_restrict_query())).all()),)
+    _checked_at = time.monotonic()
+    if _index is not None and _index.version == version:
+        return _index
+
+    index = await _aload_cached(version)
+    if index is not None:
+        return index
+    exercise_rows = (await db.execute(_exercise_query())).mappings().all()
+    restrict_rows = (await db.execute(_restrict_query())).all()
+    return await _astore(version, exercise_rows, restrict_rows)
+
+
+def loaded_catalog_version() -> Optional[tuple]:
+    """현재 프로세스에 로드된 카탈로그 버전 (로드 전이면 None, DB 조회 없음)"""
+    return _index.version if _index is not None else None
+
+
+def invalidate_catalog_index():
+    """다음 조회 시 버전을 다시 확인하도록 강제"""
+    global _checked_at
+    _checked_at = 0.0
@@ -1,80 +1,352 @@
-import json
+import asyncio
+import hashlib
+import math
 import random
-from sqlalchemy.orm import Session
-from redis import Redis
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from redis.asyncio import Redis
+import logging
+from src.recommendation.catalog_index import CatalogIndex, aget_catalog_index
+from src.recommendation.ranking import daily_seed, rank_exercises
 from src.recommendation.routine_preparation import RoutinePreparationService
+from src.utils.cache import recommend_cache
+from src.utils.metrics import CACHE_REQUESTS
+
+# Redis 캐시 TTL (1800초 = 30분, RECOMMEND_CACHE_TTL)
+CACHE_TTL_SECONDS = recommend_cache.redis_ttl
+
+# 캐시 미스 시 재계산 단일화 (워커 간 Redis 락)
+LOCK_TTL_MS = 5000
+LOCK_WAIT_SECONDS = 1.0
+LOCK_POLL_SECONDS = 0.05
+
+# 락이 아직 내 토큰일 때만 삭제 (GET 후 DEL 사이에 TTL 이 지나 다른 요청이 잡은 락을 지우지 않도록)
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+_release_lock_script = None
+
+# 조기 확률적 만료 (XFetch): 만료가 가까울수록, 계산이 오래 걸릴수록 미리 갱신할 확률이 커짐
+XFETCH_BETA = 1.0
+
+# 프로세스 내 single-flight (user_id -> 진행 중인 계산)
+_inflight: Dict[int, asyncio.Future] = {}
+
+
+class LeaderCancelled(Exception):
+    """single-flight 계산을 맡은 요청이 취소됨 (기다리던 요청은 직접 계산)"""
+
+# 약점 판단에 쓰는 체력요소 (동점이면 앞쪽 우선)
+WEAKNESS_COLUMNS = {
+    "근력": "per_strength",
+    "심폐지구력": "per_cardio",
+    "유연성": "per_flexibility",
+    "코어": "per_core",
+}
+DEFAULT_WEAKEST_PART = "코어"
+
+# 즉시 추천 운동 개수
+RECOMMEND_COUNT = 3
+
+# 사전 계산(src/recommendation/prewarm.py)용 추적 키
+# - recommend:active : 최근 추천을 조회한 사용자 (score = 마지막 조회 시각)
+# - recommend:expiry : 캐시된 추천의 만료 시각 (score = exp)
+ACTIVE_USERS_KEY = "recommend:active"
+EXPIRY_KEY = "recommend:expiry"
+
+logger = logging.getLogger(__name__)
+
+
+def _lock_key(user_id: int) -> str:
+    return f"recommend:lock:{user_id}"
+
+
+def _version_key(user_id: int) -> str:
+    return f"recommend:ver:{user_id}"
+
+
+def weakest_part(scores: Optional[Dict[str, Any]]) -> str:
+    """{per_* 컬럼: 백분위} -> 가장 낮은 체력요소 (분석 결과가 없으면 '코어')"""
+    if not scores:
+        return DEFAULT_WEAKEST_PART
+    values = {part: scores[column] for part, column in WEAKNESS_COLUMNS.items()}
+    return min(values, key=values.get)
+
+
+def ranking_basis(scores: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    랭킹 입력 중 분석 결과에서 오는 값(체력요소 백분위 4개)의 지문
+    랭킹은 백분위 벡터 전체와 평균(목표 난이도)을 쓰므로 약점이 같아도 값이 바뀌면 결과가 달라질 수 있음
+    (숙련도/장소/부상 부위는 Health 쪽 변경 시 버전 증가로 무효화)
+    """
+    if not scores:
+        return None
+    raw = "|".join(str(scores[column]) for column in WEAKNESS_COLUMNS.values())
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def analysis_scores(analysis) -> Optional[Dict[str, Any]]:
+    if analysis is None:
+        return None
+    return {column: getattr(analysis, column) for column in WEAKNESS_COLUMNS.values()}
+
+
+async def invalidate_recommendations(user_id: int):
+    """
+    사용자별 추천 캐시 무효화 (버전 증가)
+    추천 입력(Health 의 장소/숙련도, UserRestrict 부상 부위, 약점 체력요소)을 바꾸는 쪽에서 호출합니다.
+    다른 서비스(회원/설문 백엔드)는 커밋 후 Redis 에 `INCR recommend:ver:{user_id}` 를 실행하면 됩니다.
+    (다른 워커의 로컬 계층에는 RECOMMEND_LOCAL_CACHE_TTL 이내로 반영)
+    """
+    recommend_cache.delete_local(user_id)
+    await recommend_cache.aredis.incr(_version_key(user_id))
+
+
+async def invalidate_if_basis_changed(user_id: int, scores: Dict[str, Any]):
+    """
+    새 분석 결과의 백분위가 캐시된 추천을 계산할 때의 값과 다를 때만 무효화
+    (캐시가 없으면 계산 중인 결과가 이전 분석으로 저장되지 않도록 무효화)
+    """
+    try:
+        cached_data, version = await recommend_cache.aredis.mget([recommend_cache.key(user_id), _version_key(user_id)])
+        entry = recommend_cache.decode(cached_data)
+        if (
+            isinstance(entry, dict)
+            and entry.get("ver") == int(version or 0)
+            and entry.get("basis") == ranking_basis(scores)
+        ):
+            return
+        await invalidate_recommendations(user_id)
+    except Exception as e:
+        logger.warning(f"추천 캐시 무효화 실패 (user_id={user_id}): {e}")
+
+
+def should_refresh_early(entry: Dict[str, Any], now: Optional[float] = None) -> bool:
+    """XFetch: now - delta * beta * ln(rand) >= expiry 이면 만료 전에 미리 갱신"""
+    now = time.time() if now is None else now
+    return now - entry["delta"] * XFETCH_BETA * math.log(1.0 - random.random()) >= entry["exp"]
+
+
+def select_exercises(index: CatalogIndex, user_id: int, user_data: Dict[str, Any]) -> List[int]:
+    """
+    세그먼트 후보군 + 카탈로그 특성 행렬 랭킹으로 3개 선정 (src/recommendation/ranking.py)
+    같은 날 같은 입력이면 같은 결과가 나오도록 사용자/날짜로 시드를 고정
+    """
+    candidates = RoutinePreparationService.filter_candidates(index, user_data)
+    scores = analysis_scores(user_data.get("analysis"))
+    percentiles = {part: scores[column] for part, column in WEAKNESS_COLUMNS.items()} if scores else None
+    return rank_exercises(
+        index,
+        candidates,
+        percentiles,
+        user_data["profile"]["proficiency"],
+        k=RECOMMEND_COUNT,
+        seed=daily_seed(user_id),
+        default_component=DEFAULT_WEAKEST_PART,
+    )
+
+
+def build_entry(recommendations: List[int], delta: float, version: int, user_data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "value": recommendations,
+        "delta": round(delta, 4),
+        "exp": time.time() + CACHE_TTL_SECONDS,
+        "ver": version,
+        "basis": ranking_basis(analysis_scores(user_data.get("analysis"))),
+    }
+
 
 class RecommendationService:
-    def __init__(self, db: Session, redis: Redis):
+    def __init__(self, db: AsyncSession, redis: Redis):
         self.db = db
         self.redis = redis
         self.prep_service = RoutinePreparationService(db)
+        # 캐시 조회 시 읽은 사용자별 버전 (계산 결과는 계산 시작 전 버전으로 저장)
+        self._versions: Dict[int, int] = {}
 
-    def get_instant_recommendations(self, user_id: int):
-        cache_key = f"recommend:user:{user_id}"
+    async def aget_instant_recommendations(self, user_id: int):
+        """동시 요청은 계산 1번을 공유 (프로세스 내 future + 워커 간 Redis 락)"""
+        entry = await self._get_entry(user_id)
+        if entry is not None and not should_refresh_early(entry):
+            return entry["value"]
 
-        cached_data = self.redis.get(cache_key)
-        if cached_data:
-            print("Cache HIT by Redis)")
-            return json.loads(cached_data)
+        inflight = _inflight.get(user_id)
+        if inflight is not None:
+            CACHE_REQUESTS.labels("recommend", "coalesced").inc()
+            try:
+                return await asyncio.shield(inflight)
+            except LeaderCancelled:
+                return await self._arefresh(user_id, entry)
 
-        print("Cache MISS... Creating")
-        new_recommendations = self._generate_new_recommendations(user_id)
+        future = asyncio.get_running_loop().create_future()
+        _inflight[user_id] = future
+        try:
+            result = await self._arefresh(user_id, entry)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 기다리는 요청이 없어도 경고가 남지 않도록 조회 처리
+            raise
+        finally:
+            if not future.done():
+                # 계산하던 요청이 취소돼도 기다리던 요청까지 취소되지 않도록 (각자 다시 계산)
+                future.set_exception(LeaderCancelled())
+                future.exception()
+            _inflight.pop(user_id, None)
 
-        # Redis에 저장 (TTL: 1800초 = 30분)
-        self.redis.set(
-            name=cache_key,
-            value=json.dumps(new_recommendations, ensure_ascii=False),
-            ex=1800 
-        )
+    async def _arefresh(self, user_id: int, entry: Optional[Dict[str, Any]]):
+        token = uuid.uuid4().hex
+        locked = await self._acquire_lock(user_id, token)
+        if not locked:
+            if entry is not None:
+                CACHE_REQUESTS.labels("recommend", "stale").inc()
+                return entry["value"]
+            deadline = time.monotonic() + LOCK_WAIT_SECONDS
+            while time.monotonic() < deadline:
+                await asyncio.sleep(LOCK_POLL_SECONDS)
+                entry = await self._get_entry(user_id)
+                if entry is not None:
+                    CACHE_REQUESTS.labels("recommend", "coalesced").inc()
+                    return entry["value"]
 
-        return new_recommendations
+        if entry is not None:
+            CACHE_REQUESTS.labels("recommend", "early_refresh").inc()
+        released = False
+        try:
+            start = time.perf_counter()
+            user_data = await self.prep_service.aget_user_data(user_id)
+            index = await aget_catalog_index(self.db)
+            new_recommendations = select_exercises(index, user_id, user_data)
+            released = await self._set_entry(
+                user_id, new_recommendations, time.perf_counter() - start, user_data,
+                lock_token=token if locked else None
+            )
+            return new_recommendations
+        finally:
+            if locked and not released:
+                await self._release_lock(user_id, token)
 
-    def _generate_new_recommendations(self, user_id: int):
+    async def arefresh_many(self, user_ids: List[int]) -> Dict[int, List[int]]:
         """
-        1. 안전한 운동 후보군 추출
-        2. 약점 보완 / 유산소 / 랜덤 섞어서 3개 선정
+        여러 사용자의 추천을 한 번에 다시 계산해서 저장 (사전 계산용, 락/single-flight 없음)
+        버전 MGET -> 사용자 데이터 일괄 조회 -> 세그먼트 후보 + 랭킹 -> 파이프라인 SET
+        건강 정보가 없는 사용자는 결과에서 빠집니다.
         """
-        user_data = self.prep_service.get_user_data(user_id)
-        candidates = self.prep_service.get_candidate_exercises(user_data)
-        
-        if len(candidates) < 3:
-            return candidates
-
-        selected_exercises = []
-        
-        # 약점 반영 (없으면 기본값 '코어')
-        analysis = user_data.get("analysis")
-        weakest_part = "코어" # 기본값
-        
-        if analysis:
-            # 가장 낮은 점수 찾기 
-            scores = {
-                "근력": analysis.per_strength,
-                "심폐지구력": analysis.per_cardio,
-                "유연성": analysis.per_flexibility,
-                "코어": analysis.per_core
-            }
-            weakest_part = min(scores, key=scores.get)
-
-        # 1번 운동: 약점 보완 운동
-        weakness_candidates = [ex for ex in candidates if weakest_part in str(ex.get('part', ''))]
-        if weakness_candidates:
-            pick = random.choice(weakness_candidates)
-            selected_exercises.append(pick)
-            candidates.remove(pick) # 중복 방지
-
-        # 2번 운동: 유산소성 운동
-        cardio_candidates = [ex for ex in candidates if ex.get('type') == 'CARDIO' or ex.get('type') == '유산소']
-        if cardio_candidates:
-            pick = random.choice(cardio_candidates)
-            selected_exercises.append(pick)
-            candidates.remove(pick)
-
-        # 3번 운동: 남은 것 중 완전 랜덤
-        while len(selected_exercises) < 3 and candidates:
-            pick = random.choice(candidates)
-            selected_exercises.append(pick)
-            candidates.remove(pick)
-
-        return [ex["id"] for ex in selected_exercises]
\ No newline at end of file
+        if not user_ids:
+            return {}
+        versions = await self.redis.mget([_version_key(user_id) for user_id in user_ids])
+
+        start = time.perf_counter()
+        users_data = await self.prep_service.aget_users_data(user_ids)
+        index = await aget_catalog_index(self.db)
+        results = {user_id: select_exercises(index, user_id, data) for user_id, data in users_data.items()}
+        delta = (time.perf_counter() - start) / max(len(results), 1)
+        if not results:
+            return results
+
+        entries = {
+            user_id: build_entry(results[user_id], delta, int(version or 0), users_data[user_id])
+            for user_id, version in zip(user_ids, versions)
+            if user_id in results
+        }
+        pipe = self.redis.pipeline(transaction=False)
+        for user_id, entry in entries.items():
+            pipe.set(recommend_cache.key(user_id), recommend_cache.codec.dumps(entry), ex=CACHE_TTL_SECONDS)
+        pipe.zadd(EXPIRY_KEY, {user_id: entry["exp"] for user_id, entry in entries.items()})
+        await pipe.execute()
+        recommend_cache.record("set", len(entries))
+        return results
+
+    async def _get_entry(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """
+        캐시 엔트리 {"value", "delta"(계산 소요 초), "exp"(만료 시각), "ver", "basis"} 반환
+        로컬 계층 -> Redis 순서. Redis 에서는 엔트리와 사용자 버전을 MGET 한 번으로 읽고,
+        버전이 다르면(무효화됨) 미스로 처리. 이전 형식(추천 결과만 저장)은 버전 0, 조기 갱신 없이 사용
+        """
+        entry = recommend_cache.get_local(user_id)
+        if entry is not None:
+            recommend_cache.record("local_hit")
+            self._versions[user_id] = entry["ver"]
+            return entry
+
+        try:
+            # 엔트리/버전 조회와 최근 조회 시각 기록(사전 계산 대상)을 왕복 1번으로
+            pipe = recommend_cache.aredis.pipeline(transaction=False)
+            pipe.mget([recommend_cache.key(user_id), _version_key(user_id)])
+            pipe.zadd(ACTIVE_USERS_KEY, {user_id: time.time()})
+            (cached_data, version), _ = await pipe.execute()
+        except Exception as e:
+            recommend_cache.record("error")
+            logger.warning(f"추천 캐시(Redis) 조회 실패: {e}")
+            cached_data, version = None, None
+        version = int(version or 0)
+        self._versions[user_id] = version
+
+        data = recommend_cache.decode(cached_data)
+        if data is not None and not (isinstance(data, dict) and "exp" in data):
+            data = {"value": data, "delta": 0.0, "exp": float("inf"), "ver": 0}
+        if data is not None and data.get("ver", 0) != version:
+            CACHE_REQUESTS.labels("recommend", "invalidated").inc()
+            data = None
+
+        if data is None:
+            recommend_cache.record("miss")
+            return None
+        recommend_cache.record("redis_hit")
+        recommend_cache.set_local(user_id, data)
+        return data
+
+    async def _set_entry(
+        self,
+        user_id: int,
+        recommendations,
+        delta: float,
+        user_data: Dict[str, Any],
+        lock_token: Optional[str] = None
+    ) -> bool:
+        """
+        엔트리 저장(+ 만료 시각 기록)과 락 해제(토큰이 같을 때만 삭제)를 파이프라인 한 번으로 처리
+        저장까지 마치면 True (락을 따로 해제할 필요가 없음) 반환
+        """
+        entry = build_entry(recommendations, delta, self._versions.get(user_id, 0), user_data)
+        recommend_cache.set_local(user_id, entry)
+        recommend_cache.record("set")
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.set(recommend_cache.key(user_id), recommend_cache.codec.dumps(entry), ex=CACHE_TTL_SECONDS)
+            pipe.zadd(EXPIRY_KEY, {user_id: entry["exp"]})
+            if lock_token is not None:
+                await self._release_script()(keys=[_lock_key(user_id)], args=[lock_token], client=pipe)
+            await pipe.execute()
+        except Exception as e:
+            recommend_cache.record("error")
+            logger.warning(f"추천 캐시(Redis) 저장 실패: {e}")
+            return False
+        return True
+
+    async def _acquire_lock(self, user_id: int, token: str) -> bool:
+        try:
+            return bool(await self.redis.set(_lock_key(user_id), token, nx=True, px=LOCK_TTL_MS))
+        except Exception:
+            # 락을 잡을 수 없으면 단일화 없이 계산 (가용성 우선)
+            return True
+
+    def _release_script(self):
+        global _release_lock_script
+        if _release_lock_script is None:
+            # EVALSHA 로 호출하고 스크립트 캐시에 없으면(NOSCRIPT) 자동으로 EVAL
+            _release_lock_script = self.redis.register_script(RELEASE_LOCK_SCRIPT)
+        return _release_lock_script
+
+    async def _release_lock(self, user_id: int, token: str):
+        # 락 TTL 이 지나 다른 요청이 잡은 락은 지우지 않음
+        try:
+            await self._release_script()(keys=[_lock_key(user_id)], args=[token], client=self.redis)
+        except Exception:
+            pass
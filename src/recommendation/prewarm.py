@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import List, Optional
+
+from src.config import settings
+from src.database import redis as redis_module
+from src.database.database import AsyncSessionLocal
+from src.recommendation.exercises_recommendation import ACTIVE_USERS_KEY, EXPIRY_KEY, RecommendationService
+from src.utils.metrics import PREWARM_ACTIVE_USERS, PREWARM_DUE_USERS, PREWARM_RUN_DURATION, PREWARM_USERS
+
+logger = logging.getLogger(__name__)
+
+
+class RecommendationPrewarmer:
+    """
+    추천 캐시 refresh-ahead 워커
+    최근 ACTIVE_WINDOW 안에 추천을 조회한 사용자 중 캐시 만료가 LEAD 초 이내로 남은 사용자를
+    배치 단위(사용자 데이터 일괄 조회 + 랭킹 + 파이프라인 저장)로 미리 다시 계산합니다.
+    워커 프로세스가 여러 개여도 Redis 리더 키를 잡은 프로세스 하나만 실행합니다.
+    """
+
+    LEADER_KEY = "recommend:prewarm:leader"
+
+    def __init__(
+        self,
+        interval: float,
+        lead: float,
+        active_window: float,
+        batch_size: int,
+        concurrency: int,
+        max_users: int,
+    ):
+        self.interval = interval
+        self.lead = lead
+        self.active_window = active_window
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_users = max_users
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def redis(self):
+        return redis_module.get_async_redis()
+
+    async def _acquire_leadership(self) -> bool:
+        # 다음 실행 전에 만료되도록 주기보다 조금 짧게
+        ttl_ms = max(int(self.interval * 1000 * 0.9), 1000)
+        return bool(await self.redis.set(self.LEADER_KEY, uuid.uuid4().hex, nx=True, px=ttl_ms))
+
+    async def due_users(self, now: float) -> List[int]:
+        """만료가 임박했고 최근에 활동한 사용자 (비활동 사용자는 만료 추적에서 제거)"""
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.zremrangebyscore(ACTIVE_USERS_KEY, "-inf", now - self.active_window)
+        pipe.zcard(ACTIVE_USERS_KEY)
+        pipe.zrangebyscore(EXPIRY_KEY, "-inf", now + self.lead, start=0, num=self.max_users)
+        _, active_count, due = await pipe.execute()
+        PREWARM_ACTIVE_USERS.set(active_count)
+        if not due:
+            PREWARM_DUE_USERS.set(0)
+            return []
+
+        last_seen = await self.redis.zmscore(ACTIVE_USERS_KEY, due)
+        active = [int(member) for member, seen in zip(due, last_seen) if seen is not None]
+        inactive = [member for member, seen in zip(due, last_seen) if seen is None]
+        if inactive:
+            # 다음 조회 때 캐시 미스로 계산되면 다시 추적됨
+            await self.redis.zrem(EXPIRY_KEY, *inactive)
+            PREWARM_USERS.labels("inactive").inc(len(inactive))
+        PREWARM_DUE_USERS.set(len(active))
+        return active
+
+    async def _refresh_batch(self, user_ids: List[int], semaphore: asyncio.Semaphore) -> int:
+        async with semaphore:
+            try:
+                # 복제 지연으로 이전 데이터를 캐시하지 않도록 primary 에서 읽음 (배치당 쿼리 2~3번)
+                async with AsyncSessionLocal() as db:
+                    results = await RecommendationService(db, self.redis).arefresh_many(user_ids)
+            except Exception as e:
+                PREWARM_USERS.labels("error").inc(len(user_ids))
+                logger.warning(f"추천 사전 계산 배치 실패 ({len(user_ids)}명): {e}")
+                return 0
+
+            missing = [user_id for user_id in user_ids if user_id not in results]
+            if missing:
+                # 건강 정보가 없어진 사용자
+                await self.redis.zrem(EXPIRY_KEY, *missing)
+                PREWARM_USERS.labels("missing").inc(len(missing))
+            PREWARM_USERS.labels("refreshed").inc(len(results))
+            return len(results)
+
+    async def run_once(self, now: Optional[float] = None) -> int:
+        """만료 임박 사용자를 갱신하고 갱신한 사용자 수 반환"""
+        with PREWARM_RUN_DURATION.labels().time():
+            user_ids = await self.due_users(time.time() if now is None else now)
+            if not user_ids:
+                return 0
+            semaphore = asyncio.Semaphore(self.concurrency)
+            batches = [user_ids[i:i + self.batch_size] for i in range(0, len(user_ids), self.batch_size)]
+            refreshed = await asyncio.gather(*[self._refresh_batch(batch, semaphore) for batch in batches])
+        logger.info(f"추천 사전 계산: {sum(refreshed)}/{len(user_ids)}명 갱신")
+        return sum(refreshed)
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                if await self._acquire_leadership():
+                    await self.run_once()
+            except Exception as e:
+                logger.error(f"추천 사전 계산 실패: {e}")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+prewarmer = RecommendationPrewarmer(
+    interval=settings.RECOMMEND_PREWARM_INTERVAL,
+    lead=settings.RECOMMEND_PREWARM_LEAD_SECONDS,
+    active_window=settings.RECOMMEND_PREWARM_ACTIVE_WINDOW,
+    batch_size=settings.RECOMMEND_PREWARM_BATCH_SIZE,
+    concurrency=settings.RECOMMEND_PREWARM_CONCURRENCY,
+    max_users=settings.RECOMMEND_PREWARM_MAX_USERS,
+)
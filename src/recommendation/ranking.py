@@ -0,0 +1,228 @@
+import logging
+import threading
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.recommendation.catalog_index import CatalogIndex
+
+logger = logging.getLogger(__name__)
+
+# 체력요소 -> 운동 특성 매핑 (type 일치 1.0, target_area 일치 0.5)
+# 카탈로그 값은 scripts/create_exercises.py 의 ENUM 매핑 기준
+# AnalyzeResult 의 per_agility(민첩성), per_body_composition(체성분) 은 랭킹에 쓰지 않음:
+# 카탈로그 type/target_area 에 대응하는 값이 없고, 기존 약점 판단(WEAKNESS_COLUMNS)도 이 4개 요소만 사용
+COMPONENT_FEATURES = {
+    "근력": {"types": ("STRENGTH_TRAINING",), "areas": ()},
+    "심폐지구력": {"types": ("CARDIO", "PLYOMETRICS"), "areas": ("CARDIO", "FULL_BODY")},
+    "유연성": {"types": ("STRETCHING",), "areas": ()},
+    "코어": {"types": ("CORE", "BALANCE"), "areas": ("ABDOMEN",)},
+}
+COMPONENTS = tuple(COMPONENT_FEATURES)
+TYPE_WEIGHT = 1.0
+AREA_WEIGHT = 0.5
+
+DIFFICULTY_LEVELS = {"EASY": 0.0, "MEDIUM": 0.5, "HARD": 1.0}
+DEFAULT_DIFFICULTY = 0.5
+DEFAULT_METS = 3.0
+DEFAULT_PERCENTILE = 50.0  # 측정되지 않은 체력요소는 평균으로 간주
+
+# 점수 = 약점 보완(체력요소 적합도 · 부족도) + 강도 적합도 + 심폐 부족 시 METs 가산 + 동점 해소용 잡음
+INTENSITY_WEIGHT = 0.3
+METS_WEIGHT = 0.2
+TIE_BREAK_NOISE = 0.05
+
+# 다양성 제약: 같은 부위는 1개, 같은 유형은 최대 2개, 유산소 1개 이상 (후보가 있을 때)
+MAX_PER_TYPE = 2
+REQUIRED_TYPES = ("CARDIO",)
+
+
+class RankingEngine:
+    """
+    카탈로그 특성 행렬 (운동 수 x [체력요소 적합도..., 난이도, 정규화 METs])
+    행 순서는 CatalogIndex.exercises 와 같아서 후보군은 행 인덱스 배열로 표현합니다.
+    카탈로그 인덱스가 새로 로드되면 엔진도 새로 만듭니다.
+    """
+
+    def __init__(self, index: CatalogIndex):
+        self.index = index
+        exercises = index.exercises
+        n = len(exercises)
+
+        self.affinity = np.zeros((n, len(COMPONENTS)), dtype=np.float32)
+        for col, component in enumerate(COMPONENTS):
+            features = COMPONENT_FEATURES[component]
+            for row, ex in enumerate(exercises):
+                if ex.get("type") in features["types"]:
+                    self.affinity[row, col] = TYPE_WEIGHT
+                elif ex.get("part") in features["areas"]:
+                    self.affinity[row, col] = AREA_WEIGHT
+
+        self.difficulty = np.array(
+            [DIFFICULTY_LEVELS.get(ex.get("difficulty"), DEFAULT_DIFFICULTY) for ex in exercises],
+            dtype=np.float32
+        )
+        mets = np.array([ex.get("mets") or DEFAULT_METS for ex in exercises], dtype=np.float32)
+        span = float(mets.max() - mets.min()) if n else 0.0
+        self.mets = (mets - mets.min()) / span if span > 0 else np.zeros(n, dtype=np.float32)
+
+        self.types = [ex.get("type") for ex in exercises]
+        self.areas = [ex.get("part") for ex in exercises]
+
+    def rows(self, candidates: Sequence[Dict[str, Any]]) -> np.ndarray:
+        positions = self.index.positions
+        return np.fromiter((positions[ex["id"]] for ex in candidates), dtype=np.intp, count=len(candidates))
+
+    def score(self, rows: np.ndarray, needs: np.ndarray, target_difficulty: np.ndarray, noise: np.ndarray) -> np.ndarray:
+        """
+        사용자 U 명 x 후보 C 개를 한 번에 채점
+        needs: (U, 체력요소) 부족도 0~1, target_difficulty: (U,), noise: (U, C) 동점 해소용 잡음
+        """
+        cardio_need = needs[:, COMPONENTS.index("심폐지구력")]
+        return (
+            needs @ self.affinity[rows].T
+            + INTENSITY_WEIGHT * (1.0 - np.abs(self.difficulty[rows][None, :] - target_difficulty[:, None]))
+            + METS_WEIGHT * cardio_need[:, None] * self.mets[rows][None, :]
+            + noise
+        )
+
+    def select(self, order: Sequence[int], k: int) -> List[int]:
+        """점수 순(order: 카탈로그 행)으로 다양성 제약을 지키며 k개 선택 (제약 때문에 모자라면 남은 상위 후보로 채움)"""
+        picked: List[int] = []
+        areas = set()
+        type_counts: Dict[Optional[str], int] = {}
+
+        for row in order:
+            if len(picked) >= k:
+                break
+            if self.areas[row] in areas or type_counts.get(self.types[row], 0) >= MAX_PER_TYPE:
+                continue
+            picked.append(row)
+            areas.add(self.areas[row])
+            type_counts[self.types[row]] = type_counts.get(self.types[row], 0) + 1
+
+        for row in order:
+            if len(picked) >= k:
+                break
+            if row not in picked:
+                picked.append(row)
+
+        # 필수 유형이 빠졌으면 가장 낮은 순위(첫 번째 약점 운동 제외)를 그 유형의 최상위 후보로 교체
+        # (남는 운동들과 부위가 겹치지 않는 후보만 사용, 없으면 교체하지 않음)
+        for required in REQUIRED_TYPES:
+            if len(picked) < 2 or any(self.types[row] == required for row in picked):
+                continue
+            kept_areas = {self.areas[row] for row in picked[:-1]}
+            best = next(
+                (
+                    row for row in order
+                    if self.types[row] == required and row not in picked and self.areas[row] not in kept_areas
+                ),
+                None
+            )
+            if best is not None:
+                picked[-1] = best
+
+        return [self.index.exercises[row]["id"] for row in picked]
+
+
+_engine: Optional[RankingEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_ranking_engine(index: CatalogIndex) -> RankingEngine:
+    global _engine
+    engine = _engine
+    if engine is not None and engine.index is index:
+        return engine
+    with _engine_lock:
+        if _engine is None or _engine.index is not index:
+            _engine = RankingEngine(index)
+            logger.info(f"추천 랭킹 특성 행렬 생성 ({len(index.exercises)}개, version={index.version})")
+        return _engine
+
+
+def daily_seed(user_id: int, day: Optional[date] = None) -> int:
+    """같은 날 같은 입력이면 같은 추천 (캐시 만료/조기 갱신으로 결과가 바뀌지 않도록)"""
+    day = day or date.today()
+    return user_id * 100_003 + day.toordinal()
+
+
+def user_needs(percentiles: Optional[Dict[str, float]], proficiency: Optional[str], default_component: str = "코어"):
+    """
+    {체력요소: 백분위 0~100} -> (체력요소별 부족도 벡터, 목표 난이도)
+    분석 결과가 없으면 default_component 만 부족한 것으로 간주 (빠진 체력요소는 DEFAULT_PERCENTILE)
+    """
+    if percentiles:
+        values = np.array([
+            percentiles[c] if percentiles.get(c) is not None else DEFAULT_PERCENTILE for c in COMPONENTS
+        ], dtype=np.float32)
+        needs = 1.0 - np.clip(values, 0, 100) / 100.0
+        level = float(values.mean()) / 100.0
+    else:
+        needs = np.array([1.0 if c == default_component else 0.0 for c in COMPONENTS], dtype=np.float32)
+        level = 0.0
+    # 초보자는 쉬운 운동, 그 외에는 평균 백분위에 비례한 난이도를 목표로
+    return needs, 0.0 if proficiency == "BEGINNER" else level
+
+
+def segment_needs(
+    percentiles: np.ndarray,
+    has_analysis: np.ndarray,
+    proficiency: Optional[str],
+    default_component: str = "코어",
+):
+    """
+    user_needs 의 행렬 버전 (배치 작업용)
+    percentiles: (U, 체력요소) 백분위 (측정되지 않은 값은 NaN), has_analysis: (U,) 분석 결과 유무
+    """
+    missing = np.isnan(percentiles)
+    has_analysis = np.asarray(has_analysis, dtype=bool)
+    values = np.where(missing, DEFAULT_PERCENTILE, percentiles).astype(np.float32)
+    default = np.array([1.0 if c == default_component else 0.0 for c in COMPONENTS], dtype=np.float32)
+
+    needs = np.where(has_analysis[:, None], 1.0 - np.clip(values, 0, 100) / 100.0, default[None, :]).astype(np.float32)
+    level = np.where(has_analysis, values.mean(axis=1).astype(np.float64) / 100.0, 0.0)
+    target_difficulty = np.zeros(len(values)) if proficiency == "BEGINNER" else level
+    return needs, target_difficulty
+
+
+def rank_segment(
+    index: CatalogIndex,
+    candidates: Sequence[Dict[str, Any]],
+    needs: np.ndarray,
+    target_difficulty: np.ndarray,
+    seeds: Sequence[Optional[int]],
+    k: int = 3,
+) -> List[List[int]]:
+    """
+    같은 후보군(세그먼트)을 쓰는 사용자 U 명을 행렬 연산 한 번으로 채점하고 사용자별 상위 k개 운동 ID 반환
+    needs: (U, 체력요소), target_difficulty: (U,), seeds: 사용자별 동점 해소 시드
+    """
+    if not candidates:
+        return [[] for _ in seeds]
+    engine = get_ranking_engine(index)
+    rows = engine.rows(candidates)
+    noise = np.stack([np.random.default_rng(seed).uniform(0.0, TIE_BREAK_NOISE, size=len(rows)) for seed in seeds])
+    scores = engine.score(rows, needs, np.asarray(target_difficulty, dtype=np.float32), noise)
+    orders = rows[np.argsort(-scores, axis=1, kind="stable")]
+    k = min(k, len(rows))
+    return [engine.select(order, k) for order in orders.tolist()]
+
+
+def rank_exercises(
+    index: CatalogIndex,
+    candidates: Sequence[Dict[str, Any]],
+    percentiles: Optional[Dict[str, float]],
+    proficiency: Optional[str],
+    k: int = 3,
+    seed: Optional[int] = None,
+    default_component: str = "코어",
+) -> List[int]:
+    """
+    후보 운동을 사용자 체력 백분위에 맞춰 채점하고 상위 k개의 운동 ID 반환 (사용자 1명짜리 rank_segment)
+    후보가 k개보다 적어도 항상 운동 ID 리스트를 반환합니다.
+    """
+    needs, target_difficulty = user_needs(percentiles, proficiency, default_component)
+    return rank_segment(index, candidates, needs[None, :], np.array([target_difficulty]), [seed], k)[0]
@@ -1,14 +1,25 @@
 import json
+import logging
+import time
 from openai import OpenAI
 from src.config import settings
 from src.api.models.routine import WeeklyRoutineResponse
-from langsmith.wrappers import wrap_openai
-from langsmith import traceable
+from src.utils.metrics import LLM_LATENCY, LLM_REFUSALS, record_llm_usage
+from src.utils.tracing import traceable, wrap_llm_client
+from src.utils.circuit_breaker import llm_circuit
+from src.utils.rate_limit import add_llm_usage
+
+logger = logging.getLogger(__name__)
+
+
+class RoutineRefusalError(ValueError):
+    """LLM 이 루틴 생성을 거절함 (정상 응답이므로 서킷 브레이커 실패로 세지 않음)"""
+
 
 class RoutineGeneratorService:
     def __init__(self):
-        raw_client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        self.client = wrap_openai(raw_client)
+        raw_client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
+        self.client = wrap_llm_client(raw_client)
         self.model = settings.OPENAI_MODEL
         self.temperature = settings.OPENAI_TEMPERATURE
 
@@ -64,6 +75,11 @@ class RoutineGeneratorService:
         위 정보를 바탕으로 7일간의 주간 루틴을 JSON 포맷으로 생성해주세요.
         """
 
+        if not llm_circuit.allow():
+            LLM_LATENCY.labels("routine", "circuit_open").observe(0)
+            raise RuntimeError("LLM 응답 장애로 잠시 루틴 생성을 중단했습니다. 잠시 후 다시 시도해주세요.")
+
+        start = time.perf_counter()
         try:
             # 3. OpenAI API 호출 (Structured Output)
             completion = self.client.beta.chat.completions.parse(
@@ -76,13 +92,25 @@ class RoutineGeneratorService:
                 temperature=self.temperature,
             )
 
+            llm_circuit.record_success()
+            record_llm_usage("routine", completion.usage)
+            add_llm_usage(completion.usage)
+
             # 4. 결과 파싱 및 반환
             # 거절(refusal) 여부 체크
             if completion.choices[0].message.refusal:
-                raise ValueError("AI가 루틴 생성을 거절했습니다.")
+                LLM_REFUSALS.labels("routine").inc()
+                LLM_LATENCY.labels("routine", "refusal").observe(time.perf_counter() - start)
+                raise RoutineRefusalError("AI가 루틴 생성을 거절했습니다.")
 
+            LLM_LATENCY.labels("routine", "success").observe(time.perf_counter() - start)
             return completion.choices[0].message.parsed
 
+        except RoutineRefusalError:
+            raise
         except Exception as e:
-            print(f"🔴 LLM Generation Error: {e}")
+            # 응답 파싱/스키마 검증 실패(pydantic ValidationError 등)도 실패로 기록
+            LLM_LATENCY.labels("routine", "error").observe(time.perf_counter() - start)
+            logger.error(f"🔴 LLM Generation Error: {e}")
+            llm_circuit.record_failure(e)
             raise e
\ No newline at end of file
@@ -1,107 +1,128 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import not_, or_, and_
-from typing import List, Dict, Any
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import List, Dict, Any, Iterable, Union
 
 # 우리가 만든 모델들 임포트
-from src.database.models import User, Health, AnalyzeResult, Exercise, ExerciseRestrict, UserRestrict
+from src.database.models import User, Health, AnalyzeResult, UserRestrict
+from src.recommendation.catalog_index import CatalogIndex, get_catalog_index, aget_catalog_index
 
 class RoutinePreparationService:
-    def __init__(self, db: Session):
+    """
+    동기 Session / 비동기 AsyncSession 모두 지원합니다.
+    - 동기: get_user_data, get_candidate_exercises
+    - 비동기: aget_user_data, aget_candidate_exercises
+    - 일괄(비동기): aget_users_data (사전 계산/배치 작업용)
+    """
+    def __init__(self, db: Union[Session, AsyncSession]):
         self.db = db
+        # 요청 단위 메모이제이션 (서비스 인스턴스는 요청마다 생성)
+        self._user_data: Dict[int, Dict[str, Any]] = {}
 
 
     # 1. Data Aggregation (데이터 수집)
     def get_user_data(self, user_id: int) -> Dict[str, Any]:
         """
         사용자의 건강 정보, 체력 진단 결과, 제한 사항을 한 번에 묶어서 반환합니다.
+        (Health + UserRestrict + AnalyzeResult 를 단일 쿼리로 조회, 요청 내 재사용)
         """
-        # Health 정보 (장소, 숙련도 등)
-        health = self.db.query(Health).filter(Health.user_id == user_id).first()
-        if not health:
-            raise ValueError(f"User {user_id}의 건강 정보(Health)가 없습니다. 먼저 설문을 진행해주세요.")
+        if user_id not in self._user_data:
+            row = self.db.execute(self._user_context_query(user_id)).unique().first()
+            self._user_data[user_id] = self._build_user_data(user_id, row)
+        return self._user_data[user_id]
+
+    async def aget_user_data(self, user_id: int) -> Dict[str, Any]:
+        if user_id not in self._user_data:
+            row = (await self.db.execute(self._user_context_query(user_id))).unique().first()
+            self._user_data[user_id] = self._build_user_data(user_id, row)
+        return self._user_data[user_id]
+
+    async def aget_users_data(self, user_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        여러 사용자의 데이터를 사용자 수와 무관하게 쿼리 2번으로 조회
+        (health LEFT JOIN analyze_result WHERE user_id IN (...) + user_restricts IN (...))
+        건강 정보가 없는 사용자는 결과에서 빠지고, 여러 개인 사용자는 health.id 가 가장 작은 것을 사용합니다.
+        """
+        user_ids = list(user_ids)
+        if not user_ids:
+            return {}
+        query = (
+            select(Health, AnalyzeResult)
+            .outerjoin(AnalyzeResult, AnalyzeResult.user_id == Health.user_id)
+            .options(selectinload(Health.restricts))
+            .where(Health.user_id.in_(user_ids))
+            .order_by(Health.id)
+        )
+        for row in (await self.db.execute(query)).all():
+            user_id = row[0].user_id
+            self._user_data.setdefault(user_id, self._build_user_data(user_id, row))
+        return {user_id: self._user_data[user_id] for user_id in user_ids if user_id in self._user_data}
+
+    @staticmethod
+    def _user_context_query(user_id: int):
+        # health LEFT JOIN user_restricts LEFT JOIN analyze_result
+        # 건강 정보가 여러 개면 health.id 가 가장 작은 것을 사용 (일괄 생성 작업과 같은 기준)
+        return (
+            select(Health, AnalyzeResult)
+            .outerjoin(AnalyzeResult, AnalyzeResult.user_id == Health.user_id)
+            .options(joinedload(Health.restricts))
+            .where(Health.user_id == user_id)
+            .order_by(Health.id)
+        )
 
-        # User Restricts
-        user_injuries = [r.user_restrict for r in health.restricts]
+    @staticmethod
+    def _build_user_data(user_id: int, row) -> Dict[str, Any]:
+        if row is None:
+            raise ValueError(f"User {user_id}의 건강 정보(Health)가 없습니다. 먼저 설문을 진행해주세요.")
 
-        # AnalyzeResult
-        analysis = self.db.query(AnalyzeResult).filter(AnalyzeResult.user_id == user_id).first()
-        
+        health, analysis = row
         return {
             "profile": {
                 "place": health.place,
                 "proficiency": health.proficiency,
                 "gender": health.gender
             },
-            "injuries": user_injuries,
+            "injuries": [r.user_restrict for r in health.restricts],
             "analysis": analysis
         }
 
-    # 2. Candidate Filtering (후보군 필터링 - SQL)
+    # 2. Candidate Filtering (후보군 필터링 - 인메모리 카탈로그 인덱스)
     # 사용자가 수행 가능한 운동만 필터링
     def get_candidate_exercises(self, user_data: Dict[str, Any]) -> List[Dict]:
+        index = get_catalog_index(self.db)
+        return self.filter_candidates(index, user_data)
+
+    async def aget_candidate_exercises(self, user_data: Dict[str, Any]) -> List[Dict]:
+        index = await aget_catalog_index(self.db)
+        return self.filter_candidates(index, user_data)
+
+    @staticmethod
+    def filter_candidates(index: CatalogIndex, user_data: Dict[str, Any]) -> List[Dict]:
         profile = user_data["profile"]
-        injuries = user_data["injuries"]
-        
-        query = self.db.query(Exercise)
-
-        if profile["place"] == "HOME":
-            query = query.filter(
-                not_(Exercise.equipment.like("%MACHINE%")),
-                not_(Exercise.equipment.like("%PULL_UP_BAR%")),
-                not_(Exercise.equipment.like("%BARBELL%")),
-                not_(Exercise.equipment.like("%BENCH%")) 
-            )
-
-        # 부상 부위 제외
-        if injuries:
-            bad_exercises = self.db.query(ExerciseRestrict.exercise_id)\
-                .filter(ExerciseRestrict.exercise_restrict.in_(injuries))\
-                .all()
-            
-            bad_exercise_ids = [row[0] for row in bad_exercises]
-
-            if bad_exercise_ids:
-                query = query.filter(Exercise.id.notin_(bad_exercise_ids))
-
-        # 숙련도
-        if profile["proficiency"] == "BEGINNER":
-            query = query.filter(Exercise.difficulty != "HARD")
-        
-        candidates = query.all()
-        
-        return [
-            {
-                "id": ex.id,
-                "name": ex.exercise_name,
-                "part": ex.target_area,
-                "difficulty": ex.difficulty,
-                "equipment": ex.equipment,
-                "type": ex.type,
-                "image": ex.image
-            }
-            for ex in candidates
-        ]
+        # 세그먼트(장소, 숙련도, 부상 부위) 단위로 메모된 후보군 조회
+        # 호출자가 리스트를 수정(remove 등)해도 인덱스에 영향이 없도록 매번 새 리스트로 반환
+        return index.candidates(profile["place"], profile["proficiency"], user_data["injuries"])
 
     # 3. Strategy Weighing (가중치 설정)
     # stamina 백분위 기준 분석
     def determine_strategy(self, user_data: Dict[str, Any]) -> str:
         analysis = user_data["analysis"]
-        
+
         # 분석 데이터가 없거나, 아직 분석 전일 경우 방어 로직
         if not analysis:
-            return "전신 균형 발달 및 기초 체력 증진" 
+            return "전신 균형 발달 및 기초 체력 증진"
 
         scores = {
             "근력 강화": analysis.per_strength,
             "심폐지구력 향상": analysis.per_cardio,
             "코어 안정성 강화": analysis.per_core,
-            "유연성 증진": analysis.per_flexibility,  
-            "민첩성 훈련": analysis.per_agility    
+            "유연성 증진": analysis.per_flexibility,
+            "민첩성 훈련": analysis.per_agility
         }
-        
+
         weakest_area = min(scores, key=scores.get)
         weakest_score = scores[weakest_area]
 
         strategy = f"사용자의 분석 결과, '{weakest_area}'(상위 {weakest_score}%)가 가장 취약합니다. 이번 주 루틴은 {weakest_area} 훈련의 비중을 높여 구성해주세요."
-        
-        return strategy
\ No newline at end of file
+
+        return strategy
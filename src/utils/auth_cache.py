@@ -0,0 +1,70 @@
+import hashlib
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from jose import jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.database.models import User
+from src.utils.cache import auth_login_cache
+from src.utils.metrics import CACHE_REQUESTS
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# 인증 캐시
+# 1) 검증된 JWT claims: 토큰 해시 -> payload (토큰 만료 시각까지, 최대 AUTH_CLAIMS_CACHE_MAX_TTL)
+# 2) login_id -> user_id: 프로세스 내 LRU -> Redis -> DB 순서로 조회 (src/utils/cache.py 의 auth_login_cache)
+#    값은 {"id": user_id, "at": DB 에서 확인한 시각}, 토큰 발급(iat) 전에 확인한 매핑은 DB 에서 다시 확인
+#    -> 사용자가 삭제되고 같은 login_id 로 다시 가입해도 새 토큰이 옛 user_id 로 풀리지 않음
+#    사용자를 관리하는 서비스는 삭제/로그인 ID 변경 시 내부 엔드포인트(/internal/auth/invalidate)로 무효화
+
+_claims_cache = TTLCache(maxsize=settings.AUTH_CLAIMS_CACHE_SIZE, ttl=settings.AUTH_CLAIMS_CACHE_MAX_TTL)
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def decode_token(token: str) -> Dict[str, Any]:
+    """JWT 검증 결과를 캐시. 검증 실패 시 JWTError 를 그대로 올립니다."""
+    key = _token_key(token)
+    now = time.time()
+
+    payload = _claims_cache.get(key)
+    if payload is not None and payload.get("exp", float("inf")) > now:
+        CACHE_REQUESTS.labels("auth_claims", "hit").inc()
+        return payload
+
+    CACHE_REQUESTS.labels("auth_claims", "miss").inc()
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+    ttl = settings.AUTH_CLAIMS_CACHE_MAX_TTL
+    if "exp" in payload:
+        ttl = min(ttl, payload["exp"] - now)
+    if ttl > 0:
+        _claims_cache.set(key, payload, ttl=ttl)
+    return payload
+
+
+async def get_user_id_by_login(db: AsyncSession, login_id: str, issued_at: Optional[float] = None) -> Optional[int]:
+    # 프로세스 내 LRU -> Redis (auth_login_cache) -> DB
+    entry = await auth_login_cache.aget(login_id)
+    if isinstance(entry, dict) and (issued_at is None or entry["at"] >= issued_at):
+        return entry["id"]
+
+    result = await db.execute(select(User.id).where(User.login_id == login_id).limit(1))
+    user_id = result.scalar()
+    if user_id is None:
+        return None
+
+    await auth_login_cache.aset(login_id, {"id": user_id, "at": time.time()})
+    return user_id
+
+
+async def invalidate_login(login_id: str):
+    """사용자 삭제/로그인 ID 변경 시 호출"""
+    await auth_login_cache.adelete(login_id)
@@ -0,0 +1,329 @@
+import logging
+import threading
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+import orjson
+
+from src.config import settings
+from src.database import redis as redis_module
+from src.utils.metrics import CACHE_REQUESTS
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# 2단 캐시 (프로세스 내 LRU/TTL -> Redis)
+# - 코덱: orjson(기본) / msgpack(선택 설치), zstd 압축은 일정 크기 이상 값에만 적용
+# - 네임스페이스마다 키 접두사, 로컬/Redis TTL, 코덱을 따로 지정
+# - Redis 장애 시 미스로 처리하고 로컬 계층만으로 계속 동작
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+class OrjsonCodec:
+    name = "orjson"
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackCodec:
+    name = "msgpack"
+
+    def __init__(self):
+        try:
+            import msgpack
+        except ImportError:
+            raise ValueError("CACHE_CODEC=msgpack 을 사용하려면 msgpack 패키지를 설치해야 합니다.")
+        self._msgpack = msgpack
+
+    def dumps(self, value: Any) -> bytes:
+        return self._msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return self._msgpack.unpackb(data, raw=False)
+
+
+class ZstdCodec:
+    """min_size 이상인 값만 압축. 읽을 때는 zstd 프레임 헤더로 압축 여부를 판단"""
+
+    def __init__(self, inner, level: int = 3, min_size: int = 512):
+        import zstandard
+        self.inner = inner
+        self.name = f"{inner.name}+zstd"
+        self.min_size = min_size
+        self._level = level
+        self._local = threading.local()  # zstd 컨텍스트는 스레드 간 공유 불가
+        self._zstd = zstandard
+
+    def _compressor(self):
+        if not hasattr(self._local, "compressor"):
+            self._local.compressor = self._zstd.ZstdCompressor(level=self._level)
+            self._local.decompressor = self._zstd.ZstdDecompressor()
+        return self._local.compressor, self._local.decompressor
+
+    def dumps(self, value: Any) -> bytes:
+        data = self.inner.dumps(value)
+        if len(data) < self.min_size:
+            return data
+        return self._compressor()[0].compress(data)
+
+    def loads(self, data: bytes) -> Any:
+        if data[:4] == ZSTD_MAGIC:
+            data = self._compressor()[1].decompress(data)
+        return self.inner.loads(data)
+
+
+def make_codec(name: Optional[str] = None, compression: Optional[str] = None):
+    name = name or settings.CACHE_CODEC
+    compression = compression or settings.CACHE_COMPRESSION
+    if name == "orjson":
+        codec = OrjsonCodec()
+    elif name == "msgpack":
+        codec = MsgpackCodec()
+    else:
+        raise ValueError(f"지원하지 않는 캐시 코덱입니다: {name}")
+
+    if compression == "zstd":
+        return ZstdCodec(codec, min_size=settings.CACHE_COMPRESSION_MIN_BYTES)
+    if compression != "none":
+        raise ValueError(f"지원하지 않는 캐시 압축 방식입니다: {compression}")
+    return codec
+
+
+class TieredCache:
+    """
+    네임스페이스 단위 2단 캐시
+    local_ttl=0 이면 로컬 계층 없이 Redis 만, redis_ttl=0 이면 로컬 계층만 사용합니다.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        prefix: str,
+        redis_ttl: int,
+        local_ttl: float = 0,
+        local_maxsize: int = 10000,
+        codec=None,
+    ):
+        self.namespace = namespace
+        self.prefix = prefix
+        self.redis_ttl = redis_ttl
+        self.local_ttl = local_ttl
+        self.codec = codec or make_codec()
+        self._local = TTLCache(maxsize=local_maxsize, ttl=local_ttl) if local_ttl > 0 else None
+        self._stats = {"local_hit": 0, "redis_hit": 0, "miss": 0, "set": 0, "error": 0}
+
+    @property
+    def redis(self):
+        return redis_module.get_redis_binary()
+
+    @property
+    def aredis(self):
+        return redis_module.get_async_redis_binary()
+
+    def key(self, key: Hashable) -> str:
+        return f"{self.prefix}:{key}"
+
+    def record(self, result: str, n: int = 1):
+        self._stats[result] = self._stats.get(result, 0) + n
+        CACHE_REQUESTS.labels(self.namespace, result).inc(n)
+
+    def decode(self, data: Optional[bytes]) -> Any:
+        """Redis 원본 값 -> 객체 (없거나 디코딩 실패 시 None)"""
+        if data is None:
+            return None
+        try:
+            return self.codec.loads(data)
+        except Exception as e:
+            # 코덱 변경 등으로 읽을 수 없는 값은 미스로 처리 (다음 set 에서 덮어씀)
+            self.record("error")
+            logger.warning(f"캐시 디코딩 실패 ({self.namespace}): {e}")
+            return None
+
+    # 로컬 계층
+    def get_local(self, key: Hashable) -> Any:
+        return self._local.get(key) if self._local is not None else None
+
+    def set_local(self, key: Hashable, value: Any):
+        if self._local is not None:
+            self._local.set(key, value)
+
+    # 조회/저장
+    def get(self, key: Hashable) -> Any:
+        value = self.get_local(key)
+        if value is not None:
+            self.record("local_hit")
+            return value
+
+        value = None
+        if self.redis_ttl > 0:
+            try:
+                value = self.decode(self.redis.get(self.key(key)))
+            except Exception as e:
+                self.record("error")
+                logger.warning(f"캐시(Redis) 조회 실패 ({self.namespace}): {e}")
+
+        if value is None:
+            self.record("miss")
+            return None
+        self.record("redis_hit")
+        self.set_local(key, value)
+        return value
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """로컬에 없는 키만 MGET 한 번으로 조회. 찾은 키만 반환"""
+        found: Dict[Hashable, Any] = {}
+        remote: List[Hashable] = []
+        for key in keys:
+            value = self.get_local(key)
+            if value is not None:
+                found[key] = value
+            else:
+                remote.append(key)
+        if found:
+            self.record("local_hit", len(found))
+
+        raw_values = [None] * len(remote)
+        if remote and self.redis_ttl > 0:
+            try:
+                raw_values = self.redis.mget([self.key(k) for k in remote])
+            except Exception as e:
+                self.record("error")
+                logger.warning(f"캐시(Redis) 조회 실패 ({self.namespace}): {e}")
+
+        misses = 0
+        for key, raw in zip(remote, raw_values):
+            value = self.decode(raw)
+            if value is None:
+                misses += 1
+                continue
+            found[key] = value
+            self.set_local(key, value)
+            self.record("redis_hit")
+        if misses:
+            self.record("miss", misses)
+        return found
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[int] = None):
+        self.set_local(key, value)
+        self.record("set")
+        if self.redis_ttl <= 0:
+            return
+        try:
+            self.redis.set(self.key(key), self.codec.dumps(value), ex=ttl or self.redis_ttl)
+        except Exception as e:
+            self.record("error")
+            logger.warning(f"캐시(Redis) 저장 실패 ({self.namespace}): {e}")
+
+    def delete(self, key: Hashable):
+        self.delete_local(key)
+        if self.redis_ttl > 0:
+            try:
+                self.redis.delete(self.key(key))
+            except Exception as e:
+                self.record("error")
+                logger.warning(f"캐시(Redis) 삭제 실패 ({self.namespace}): {e}")
+
+    def delete_local(self, key: Hashable):
+        if self._local is not None:
+            self._local.pop(key)
+
+    def clear_local(self):
+        if self._local is not None:
+            self._local.clear()
+
+    # 비동기 버전 (asyncio 클라이언트, 요청 경로용)
+    async def aget(self, key: Hashable) -> Any:
+        value = self.get_local(key)
+        if value is not None:
+            self.record("local_hit")
+            return value
+
+        value = None
+        if self.redis_ttl > 0:
+            try:
+                value = self.decode(await self.aredis.get(self.key(key)))
+            except Exception as e:
+                self.record("error")
+                logger.warning(f"캐시(Redis) 조회 실패 ({self.namespace}): {e}")
+
+        if value is None:
+            self.record("miss")
+            return None
+        self.record("redis_hit")
+        self.set_local(key, value)
+        return value
+
+    async def aset(self, key: Hashable, value: Any, ttl: Optional[int] = None):
+        await self.aset_many({key: value}, ttl=ttl)
+
+    async def aset_many(self, items: Dict[Hashable, Any], ttl: Optional[int] = None):
+        """여러 키를 파이프라인 한 번(왕복 1회)으로 저장"""
+        for key, value in items.items():
+            self.set_local(key, value)
+        self.record("set", len(items))
+        if self.redis_ttl <= 0 or not items:
+            return
+        try:
+            pipe = self.aredis.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.set(self.key(key), self.codec.dumps(value), ex=ttl or self.redis_ttl)
+            await pipe.execute()
+        except Exception as e:
+            self.record("error")
+            logger.warning(f"캐시(Redis) 저장 실패 ({self.namespace}): {e}")
+
+    async def adelete(self, key: Hashable):
+        self.delete_local(key)
+        if self.redis_ttl > 0:
+            try:
+                await self.aredis.delete(self.key(key))
+            except Exception as e:
+                self.record("error")
+                logger.warning(f"캐시(Redis) 삭제 실패 ({self.namespace}): {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._stats["local_hit"] + self._stats["redis_hit"] + self._stats["miss"]
+        hits = self._stats["local_hit"] + self._stats["redis_hit"]
+        return {
+            **self._stats,
+            "codec": self.codec.name,
+            "local_size": len(self._local) if self._local is not None else 0,
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+        }
+
+
+# 네임스페이스별 캐시 (키 형식은 기존 Redis 키와 동일하게 유지)
+recommend_cache = TieredCache(
+    "recommend", "recommend:user",
+    redis_ttl=settings.RECOMMEND_CACHE_TTL,
+    # 다른 워커의 무효화(버전 증가)는 로컬 TTL 만큼 늦게 반영될 수 있으므로 짧게 유지
+    local_ttl=settings.RECOMMEND_LOCAL_CACHE_TTL,
+)
+auth_login_cache = TieredCache(
+    "auth_login", "auth:login",
+    redis_ttl=settings.AUTH_USER_REDIS_TTL,
+    local_ttl=settings.AUTH_USER_CACHE_TTL,
+    local_maxsize=settings.AUTH_USER_CACHE_SIZE,
+)
+catalog_cache = TieredCache(
+    "catalog", "catalog:index",
+    redis_ttl=settings.CATALOG_CACHE_TTL,
+    codec=make_codec(compression="zstd"),
+)
+report_cache = TieredCache(
+    "report", "report:llm",
+    redis_ttl=settings.REPORT_CACHE_TTL,
+    local_ttl=settings.REPORT_LOCAL_CACHE_TTL,
+    local_maxsize=1000,
+    codec=make_codec(compression="zstd"),
+)
+
+CACHES = (recommend_cache, auth_login_cache, catalog_cache, report_cache)
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    return {cache.namespace: cache.stats() for cache in CACHES}
@@ -0,0 +1,85 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from src.config import settings
+
+
+class CircuitBreaker:
+    """
+    연속 실패 횟수 기반 서킷 브레이커
+    - closed: 정상 호출. failure_threshold 번 연속 실패하면 open
+    - open: reset_timeout 동안 호출을 막음 (호출자는 바로 fallback)
+    - half_open: reset_timeout 이 지나면 시험 호출 1건만 허용, 성공하면 closed / 실패하면 다시 open
+    LLM 호출은 스레드풀에서 실행되므로 상태 변경은 lock 으로 보호합니다.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._last_failure: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._probing = False
+            # half_open: 시험 호출은 동시에 1건만
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self, error: Optional[BaseException] = None):
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if error is not None:
+                self._last_failure = f"{type(error).__name__}: {error}"[:200]
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "last_failure": self._last_failure,
+            }
+
+
+# 온라인 요청(리포트/루틴 생성)이 공유하는 LLM 게이트웨이 서킷
+llm_circuit = CircuitBreaker(
+    "llm",
+    failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout=settings.LLM_CIRCUIT_RESET_SECONDS
+)
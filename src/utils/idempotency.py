@@ -0,0 +1,130 @@
+import asyncio
+import base64
+import hashlib
+import logging
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+from src.config import settings
+from src.database import redis as redis_module
+
+logger = logging.getLogger(__name__)
+
+# Idempotency-Key 처리 (모바일 클라이언트의 타임아웃 재시도로 LLM 호출/DB 쓰기가 반복되지 않도록)
+# - 기록 키는 사용자 + 엔드포인트 + 클라이언트 키 단위: idempotency:{identity}:{path}:{key}
+# - 첫 요청이 SET NX 로 pending 기록을 잡고 처리, 끝나면 응답(상태/헤더/본문)을 RESULT_TTL 동안 저장
+# - 같은 키 + 같은 본문 재시도: 처리 중이면 끝날 때까지 대기, 끝났으면 저장된 응답을 그대로 반환
+# - 같은 키 + 다른 본문: 거절 (422)
+# - 5xx / 429 / 예외로 끝난 요청은 기록을 지워 다음 재시도가 다시 실행되도록
+# - pending 기록에는 처리하는 요청의 owner 토큰을 넣고, 완료/삭제는 토큰이 같을 때만 (Lua compare-and-set)
+#   LOCK_TTL 이 지나 재시도가 기록을 새로 잡았으면 늦게 끝난 원 요청이 그 기록을 덮어쓰거나 지우지 않음
+
+IDEMPOTENT_ENDPOINTS = {
+    ("POST", f"{settings.API_V1_PREFIX}/routine"),
+    ("POST", f"{settings.API_V1_PREFIX}/score"),
+}
+MAX_KEY_LENGTH = 255
+POLL_SECONDS = 0.2
+
+# KEYS[1]: 기록 키, ARGV[1]: owner 토큰, ARGV[2]: 완료 기록, ARGV[3]: 보관 시간(초)
+COMPLETE_SCRIPT = """
+local raw = redis.call('GET', KEYS[1])
+if raw and cjson.decode(raw)['owner'] == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', tonumber(ARGV[3]))
+    return 1
+end
+return 0
+"""
+
+# KEYS[1]: 기록 키, ARGV[1]: owner 토큰
+DISCARD_SCRIPT = """
+local raw = redis.call('GET', KEYS[1])
+if raw and cjson.decode(raw)['owner'] == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class IdempotencyStore:
+    PENDING = "pending"
+    DONE = "done"
+
+    def __init__(self, lock_ttl: int, result_ttl: int, wait_seconds: float):
+        self.lock_ttl = lock_ttl
+        self.result_ttl = result_ttl
+        self.wait_seconds = wait_seconds
+        self._complete_script = None
+        self._discard_script = None
+
+    @property
+    def redis(self):
+        return redis_module.get_async_redis()
+
+    @staticmethod
+    def key(identity: str, path: str, idempotency_key: str) -> str:
+        return f"idempotency:{identity}:{path}:{idempotency_key}"
+
+    @staticmethod
+    def fingerprint(body: bytes) -> str:
+        return hashlib.sha256(body).hexdigest()
+
+    async def acquire(self, key: str, fingerprint: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        처리 권한을 잡으면 (owner 토큰, None), 아니면 (None, 기존 기록) 반환
+        같은 본문의 요청이 처리 중이면 끝나거나(기록이 done 이 되거나 지워질 때까지) wait_seconds 까지 기다립니다.
+        기다린 후에도 처리 중이면 pending 기록을 반환합니다.
+        """
+        owner = uuid.uuid4().hex
+        pending = orjson.dumps({"state": self.PENDING, "fp": fingerprint, "owner": owner})
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            if await self.redis.set(key, pending, nx=True, ex=self.lock_ttl):
+                return owner, None
+            raw = await self.redis.get(key)
+            if raw is None:
+                # 원 요청이 실패해서 기록이 지워짐 -> 이번 요청이 처리
+                continue
+            record = orjson.loads(raw)
+            if record["fp"] != fingerprint or record["state"] == self.DONE or time.monotonic() >= deadline:
+                return None, record
+            await asyncio.sleep(POLL_SECONDS)
+
+    async def complete(
+        self, key: str, owner: str, fingerprint: str, status: int, headers: List[Tuple[str, str]], body: bytes
+    ):
+        record = {
+            "state": self.DONE,
+            "fp": fingerprint,
+            "status": status,
+            "headers": headers,
+            "body": base64.b64encode(body).decode("ascii"),
+        }
+        if self._complete_script is None:
+            self._complete_script = self.redis.register_script(COMPLETE_SCRIPT)
+        try:
+            stored = await self._complete_script(
+                keys=[key], args=[owner, orjson.dumps(record), self.result_ttl], client=self.redis
+            )
+            if not stored:
+                logger.info(f"Idempotency 기록을 다른 요청이 처리 중이어서 응답을 저장하지 않음 ({key})")
+        except Exception as e:
+            logger.warning(f"Idempotency 응답 저장 실패 ({key}): {e}")
+
+    async def discard(self, key: str, owner: str):
+        if self._discard_script is None:
+            self._discard_script = self.redis.register_script(DISCARD_SCRIPT)
+        try:
+            await self._discard_script(keys=[key], args=[owner], client=self.redis)
+        except Exception as e:
+            logger.warning(f"Idempotency 기록 삭제 실패 ({key}): {e}")
+
+
+idempotency_store = IdempotencyStore(
+    lock_ttl=settings.IDEMPOTENCY_LOCK_TTL,
+    result_ttl=settings.IDEMPOTENCY_RESULT_TTL,
+    wait_seconds=settings.IDEMPOTENCY_WAIT_SECONDS,
+)
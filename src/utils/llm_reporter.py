@@ -1,18 +1,27 @@
-from openai import OpenAI
-from typing import Dict, Any
-from langsmith.wrappers import wrap_openai
-from langsmith import traceable
+from openai import OpenAI, AsyncOpenAI
+from typing import Dict, Any, List, Optional
+from src.utils.tracing import traceable, wrap_llm_client
+from src.utils.metrics import LLM_LATENCY, LLM_FALLBACKS, record_llm_usage
+from src.utils.circuit_breaker import llm_circuit
+from src.utils.cache import report_cache
+from src.utils.rate_limit import add_llm_usage, llm_budget_exhausted
+import hashlib
 import logging
+import orjson
+import time
 
 logger = logging.getLogger(__name__)
 
 # 체력 진단 텍스트 생성기
 class FitnessReportGenerator:
     
-    def __init__(self, api_key: str, model: str = "gpt-4o-mini"):
+    def __init__(self, api_key: str, model: str = "gpt-4o-mini", base_url: Optional[str] = None):
         """초기화"""
-        raw_client = OpenAI(api_key=api_key)
-        self.client = wrap_openai(raw_client)
+        raw_client = OpenAI(api_key=api_key, base_url=base_url)
+        self.client = wrap_llm_client(raw_client)
+        self.api_key = api_key
+        self.base_url = base_url
+        self.async_client = None
         self.model = model
         logger.info(f"FitnessReportGenerator 초기화 완료 (model: {model})")
     
@@ -72,6 +81,23 @@ class FitnessReportGenerator:
 
         return prompt
     
+    def create_messages(self, data: dict) -> List[Dict[str, str]]:
+        return [
+            {
+                "role": "system",
+                "content": "당신은 친근하고 전문적인 체력 트레이너입니다. 사용자에게 동기부여가 되는 체력 진단 리포트를 작성합니다."
+            },
+            {
+                "role": "user",
+                "content": self.create_prompt(data)
+            }
+        ]
+    
+    def report_cache_key(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float) -> str:
+        """같은 모델/프롬프트/파라미터면 같은 리포트를 재사용 (프롬프트 해시)"""
+        payload = orjson.dumps([self.model, max_tokens, temperature, messages])
+        return hashlib.sha256(payload).hexdigest()
+    
     @traceable(run_type="chain", name="Generate Fitness Report")
     def generate_report(
         self, 
@@ -80,38 +106,86 @@ class FitnessReportGenerator:
         temperature: float = 0.7
     ) -> str:
         
+        messages = self.create_messages(data)
+        cache_key = self.report_cache_key(messages, max_tokens, temperature)
+        cached_report = report_cache.get(cache_key)
+        if cached_report is not None:
+            return cached_report
+        
+        # 사용자의 오늘 LLM 토큰 예산을 다 썼으면 기본 리포트 (캐시된 리포트는 위에서 그대로 사용)
+        if llm_budget_exhausted():
+            LLM_LATENCY.labels("report", "budget_exceeded").observe(0)
+            LLM_FALLBACKS.labels("report").inc()
+            return self._get_fallback_report(data)
+        
+        # 서킷이 열려 있으면 타임아웃까지 기다리지 않고 바로 기본 리포트
+        if not llm_circuit.allow():
+            LLM_LATENCY.labels("report", "circuit_open").observe(0)
+            LLM_FALLBACKS.labels("report").inc()
+            return self._get_fallback_report(data)
+        
+        start = time.perf_counter()
         try:
-            prompt = self.create_prompt(data)
-            
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "당신은 친근하고 전문적인 체력 트레이너입니다. 사용자에게 동기부여가 되는 체력 진단 리포트를 작성합니다."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+                messages=messages,
                 max_tokens=max_tokens,
                 temperature=temperature,
                 timeout=10.0  # 10초 타임아웃
             )
             
+            llm_circuit.record_success()
             report = response.choices[0].message.content.strip()
             
             # 토큰 사용량 로깅
             logger.info(f"OpenAI 토큰 사용: {response.usage.total_tokens} tokens")
+            record_llm_usage("report", response.usage)
+            add_llm_usage(response.usage)
+            LLM_LATENCY.labels("report", "success").observe(time.perf_counter() - start)
             
+            # 기본(fallback) 리포트는 캐시하지 않음
+            report_cache.set(cache_key, report)
             return report
             
         except Exception as e:
             logger.error(f"LLM 리포트 생성 실패: {str(e)}")
+            llm_circuit.record_failure(e)
+            LLM_LATENCY.labels("report", "error").observe(time.perf_counter() - start)
+            LLM_FALLBACKS.labels("report").inc()
             # Fallback: 기본 메시지
             return self._get_fallback_report(data)
     
+    async def agenerate_report(
+        self,
+        data: Dict[str, Any],
+        max_tokens: int = 800,
+        temperature: float = 0.7,
+        timeout: float = 30.0
+    ) -> str:
+        """
+        비동기 리포트 생성 (배치 작업용)
+        실패 시 fallback 없이 예외를 그대로 올려 호출자가 재시도/스킵을 결정합니다.
+        """
+        if self.async_client is None:
+            self.async_client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
+        
+        start = time.perf_counter()
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=self.model,
+                messages=self.create_messages(data),
+                max_tokens=max_tokens,
+                temperature=temperature,
+                timeout=timeout
+            )
+        except Exception:
+            LLM_LATENCY.labels("report_batch", "error").observe(time.perf_counter() - start)
+            raise
+        
+        record_llm_usage("report_batch", response.usage)
+        LLM_LATENCY.labels("report_batch", "success").observe(time.perf_counter() - start)
+        return response.choices[0].message.content.strip()
+    
     def _get_fallback_report(self, data: Dict[str, Any]) -> str:
         """OpenAI 실패 시 기본 리포트 (안전하게 수정)"""
         
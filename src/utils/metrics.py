@@ -0,0 +1,349 @@
+import copy
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Prometheus text exposition 포맷용 경량 메트릭 레지스트리
+# - 라벨 조합(child) 생성 시에만 락을 잡고, 관측(inc/observe)은 락 없이 누적
+# - GIL 하에서 정수/실수 누적은 사실상 원자적이라 핫패스 오버헤드가 거의 없음
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LLM_LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.5, 10.0, 15.0, 20.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def empty_copy(self) -> "_Metric":
+        """이름/라벨/버킷은 같고 값이 비어 있는 복사본 (워커별 스냅샷 합산용)"""
+        clone = copy.copy(self)
+        clone._children = {}
+        clone._lock = threading.Lock()
+        return clone
+
+    def snapshot(self) -> List[list]:
+        """[[라벨 값들, 값], ...] (JSON 으로 저장할 수 있는 형태)"""
+        return [[list(key), child.snapshot()] for key, child in list(self._children.items())]
+
+    def merge(self, series: Iterable[list]):
+        """다른 프로세스의 snapshot() 결과를 이 메트릭에 합산"""
+        for key, data in series:
+            self.labels(*key).merge(data)
+
+    def labels(self, *values):
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name}: 라벨 개수가 맞지 않습니다. ({self.labelnames})")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def snapshot(self):
+        return self.value
+
+    def merge(self, value):
+        self.value += value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for key, child in list(self._children.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {child.value}")
+        return lines
+
+
+class _GaugeChild:
+    __slots__ = ("value", "updated_at")
+
+    def __init__(self):
+        self.value = 0.0
+        self.updated_at = 0.0
+
+    def set(self, value: float):
+        self.value = value
+        self.updated_at = time.time()
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+        self.updated_at = time.time()
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+        self.updated_at = time.time()
+
+    def snapshot(self):
+        return [self.value, self.updated_at]
+
+    def merge(self, data):
+        # 게이지는 합산하지 않고 가장 최근에 갱신한 프로세스의 값을 사용
+        value, updated_at = data
+        if updated_at >= self.updated_at:
+            self.value, self.updated_at = value, updated_at
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for key, child in list(self._children.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {child.value}")
+        return lines
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        # 마지막 칸은 +Inf
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def snapshot(self):
+        return [list(self.counts), self.sum]
+
+    def merge(self, data):
+        counts, total = data
+        for i, count in enumerate(counts):
+            self.counts[i] += count
+        self.sum += total
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for key, child in list(self._children.items()):
+            counts = list(child.counts)
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = _format_labels(self.labelnames, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            cumulative += counts[-1]
+            le = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {child.sum}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Optional[Tuple[float, ...]] = None) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets or DEFAULT_LATENCY_BUCKETS))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def names(self, kind: str) -> List[str]:
+        return [name for name, metric in list(self._metrics.items()) if metric.kind == kind]
+
+    def snapshot(self) -> Dict[str, List[list]]:
+        return {name: metric.snapshot() for name, metric in list(self._metrics.items())}
+
+    def _merged(self, snapshots: Iterable[Dict[str, List[list]]]) -> List[_Metric]:
+        snapshots = list(snapshots)
+        merged = []
+        for name, metric in list(self._metrics.items()):
+            target = metric.empty_copy()
+            for snapshot in snapshots:
+                target.merge(snapshot.get(name, ()))
+            merged.append(target)
+        return merged
+
+    def merge_snapshots(self, snapshots: Iterable[Dict[str, List[list]]]) -> Dict[str, List[list]]:
+        """여러 snapshot() 을 하나의 snapshot 으로 합침 (카운터/히스토그램은 합산, 게이지는 최근 값)"""
+        return {metric.name: metric.snapshot() for metric in self._merged(snapshots)}
+
+    def render_merged(self, snapshots: Iterable[Dict[str, List[list]]]) -> str:
+        """여러 프로세스의 snapshot() 을 합쳐서 렌더링"""
+        lines: List[str] = []
+        for metric in self._merged(snapshots):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 전역 레지스트리
+registry = MetricsRegistry()
+
+# HTTP
+HTTP_REQUEST_LATENCY = registry.histogram(
+    "http_request_duration_seconds",
+    "엔드포인트별 요청 처리 시간(초)",
+    ("method", "route", "status"),
+)
+
+# LLM
+LLM_LATENCY = registry.histogram(
+    "llm_request_duration_seconds",
+    "용도별 LLM 호출 지연 시간(초)",
+    ("use_case", "outcome"),
+    buckets=LLM_LATENCY_BUCKETS,
+)
+LLM_TOKENS = registry.counter(
+    "llm_tokens_total",
+    "용도별 LLM 토큰 사용량",
+    ("use_case", "kind"),
+)
+LLM_FALLBACKS = registry.counter(
+    "llm_fallback_total",
+    "LLM 실패로 기본 응답을 사용한 횟수",
+    ("use_case",),
+)
+LLM_REFUSALS = registry.counter(
+    "llm_refusal_total",
+    "LLM이 응답을 거절한 횟수",
+    ("use_case",),
+)
+
+# 캐시
+CACHE_REQUESTS = registry.counter(
+    "cache_requests_total",
+    "캐시 조회 결과(hit/miss)",
+    ("cache", "result"),
+)
+
+# 요청 제한
+RATE_LIMIT_DECISIONS = registry.counter(
+    "rate_limit_decisions_total",
+    "LLM 엔드포인트 요청 제한 결과(allowed/limited/budget_exceeded/budget_fallback/error)",
+    ("endpoint", "result"),
+)
+IDEMPOTENCY_REQUESTS = registry.counter(
+    "idempotency_requests_total",
+    "Idempotency-Key 요청 처리 결과(new/replayed/mismatch/in_progress/invalid/error)",
+    ("endpoint", "result"),
+)
+
+
+# 추천 사전 계산 (refresh-ahead)
+PREWARM_USERS = registry.counter(
+    "recommend_prewarm_users_total",
+    "사전 계산 대상 사용자 처리 결과(refreshed/inactive/missing/error)",
+    ("outcome",),
+)
+PREWARM_RUN_DURATION = registry.histogram(
+    "recommend_prewarm_run_duration_seconds",
+    "사전 계산 1회 실행 시간(초)",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+PREWARM_ACTIVE_USERS = registry.gauge(
+    "recommend_prewarm_active_users",
+    "최근 활동 창 안의 사용자 수 (recommend:active)",
+)
+PREWARM_DUE_USERS = registry.gauge(
+    "recommend_prewarm_due_users",
+    "마지막 실행에서 만료가 임박해 갱신 대상이 된 사용자 수",
+)
+
+
+def record_llm_usage(use_case: str, usage) -> None:
+    """OpenAI 응답의 usage 객체를 토큰 카운터에 반영"""
+    if usage is None:
+        return
+    LLM_TOKENS.labels(use_case, "prompt").inc(getattr(usage, "prompt_tokens", 0) or 0)
+    LLM_TOKENS.labels(use_case, "completion").inc(getattr(usage, "completion_tokens", 0) or 0)
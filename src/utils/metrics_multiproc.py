@@ -0,0 +1,152 @@
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.config import settings
+from src.utils.metrics import MetricsRegistry, registry
+
+logger = logging.getLogger(__name__)
+
+# gunicorn 멀티 워커에서 /metrics 를 워커 전체 합계로 응답 (METRICS_MULTIPROC_DIR 이 있을 때만)
+# - 워커마다 레지스트리 스냅샷을 {dir}/{pid}.json 으로 METRICS_FLUSH_INTERVAL 마다 기록
+# - 스크레이프를 받은 워커는 자기 스냅샷을 먼저 쓰고 모든 파일을 합산
+#   (카운터/히스토그램은 합산, 게이지는 가장 최근 값) -> 어느 워커가 받아도 같은 값, 카운터는 단조 증가
+# - 종료된 워커의 카운터/히스토그램은 누적 파일 dead.json 에 합치고 워커 파일은 삭제 (카운터가 줄어들지 않고 파일 수도 일정)
+#   합치는 동안 dead.json 의 _retiring 에 pid 를 적어 두고, 읽는 쪽은 dead.json 의 _generation 이 바뀌면 다시 읽음
+#   -> 한 스크레이프에서 종료된 워커를 빼거나 두 번 세지 않음
+
+
+class MultiprocessMetrics:
+    DEAD = "dead.json"
+    RETIRING = "_retiring"
+    GENERATION = "_generation"
+
+    def __init__(self, registry: MetricsRegistry, directory: str, interval: float):
+        self.registry = registry
+        self.directory = Path(directory) if directory else None
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    def _path(self, pid: int) -> Path:
+        return self.directory / f"{pid}.json"
+
+    @property
+    def _dead_path(self) -> Path:
+        return self.directory / self.DEAD
+
+    @staticmethod
+    def _load(path: Path) -> Optional[Dict[str, List[list]]]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _dead_generation(self) -> int:
+        return (self._load(self._dead_path) or {}).get(self.GENERATION, 0)
+
+    @staticmethod
+    def _write(path: Path, snapshot: Dict[str, List[list]]):
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        tmp.replace(path)
+
+    def write(self):
+        self._write(self._path(os.getpid()), self.registry.snapshot())
+
+    def _read_all(self) -> List[Dict[str, List[list]]]:
+        # 읽는 도중 dead.json 이 바뀌면(워커 종료 처리) 처음부터 다시 읽음
+        for _ in range(5):
+            dead = self._load(self._dead_path) or {}
+            generation = dead.pop(self.GENERATION, 0)
+            retiring = dead.pop(self.RETIRING, None)
+            snapshots = [dead]
+            for path in self.directory.glob("*.json"):
+                if path.name == self.DEAD or path.stem == str(retiring):
+                    continue
+                snapshot = self._load(path)
+                if snapshot is not None:
+                    snapshots.append(snapshot)
+            if self._dead_generation() == generation:
+                return snapshots
+        logger.warning("워커 종료 처리가 계속 진행 중이어서 일부만 합산했을 수 있습니다.")
+        return snapshots
+
+    def render(self) -> str:
+        """모든 워커의 메트릭을 합쳐서 렌더링 (비활성이면 이 프로세스 값만)"""
+        if not self.enabled:
+            return self.registry.render()
+        self.write()
+        return self.registry.render_merged(self._read_all())
+
+    # --- gunicorn 마스터 훅 (gunicorn.conf.py) ---
+
+    def reset_directory(self):
+        """서버 시작 시 이전 실행의 파일 정리"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path in self.directory.iterdir():
+            if path.suffix in (".json", ".tmp"):
+                path.unlink()
+
+    def retire(self, pid: int):
+        """종료된 워커의 카운터/히스토그램을 dead.json 에 합치고 워커 파일 삭제 (게이지는 버림)"""
+        path = self._path(pid)
+        snapshot = self._load(path)
+        if snapshot is None:
+            return
+        gauges = self.registry.names("gauge")
+        for name in gauges:
+            snapshot.pop(name, None)
+
+        dead = self._load(self._dead_path) or {}
+        generation = dead.pop(self.GENERATION, 0)
+        dead.pop(self.RETIRING, None)
+        merged = self.registry.merge_snapshots([dead, snapshot])
+        for name in gauges:
+            merged.pop(name, None)
+
+        # 1) 합친 값 + retiring 표시 기록 -> 2) 워커 파일 삭제 -> 3) 표시 제거 (같은 pid 의 새 워커는 이후에 fork 됨)
+        self._write(self._dead_path, {**merged, self.GENERATION: generation + 1, self.RETIRING: pid})
+        path.unlink()
+        self._write(self._dead_path, {**merged, self.GENERATION: generation + 2})
+
+    # --- 워커 백그라운드 기록 ---
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.write()
+            except Exception as e:
+                logger.error(f"워커 메트릭 기록 실패: {e}")
+
+    def start(self):
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.enabled:
+            # 종료 직전까지의 값을 남김 (이후 마스터의 child_exit 에서 dead.json 에 합침)
+            self.write()
+
+
+multiprocess_metrics = MultiprocessMetrics(
+    registry,
+    directory=settings.METRICS_MULTIPROC_DIR,
+    interval=settings.METRICS_FLUSH_INTERVAL
+)
@@ -15,28 +15,7 @@ class PercentileCalculator:
             return json.load(f)
     
     def get_age_group(self, age, with_suffix=True):
-        if age < 10:
-            age_range = "10-19"
-        elif age < 20:
-            age_range = "10-19"
-        elif age < 30:
-            age_range = "20-29"
-        elif age < 40:
-            age_range = "30-39"
-        elif age < 50:
-            age_range = "40-49"
-        elif age < 60:
-            age_range = "50-59"
-        elif age < 70:
-            age_range = "60-69"
-        elif age < 80:
-            age_range = "70-79"
-        elif age < 90:
-            age_range = "80-89"
-        else:
-            age_range = "90+"
-        
-        return f"{age_range}세" if with_suffix else age_range
+        return get_age_group(age, with_suffix)
     
     def calculate_percentile(self, value, reference_stats):
         """
@@ -105,22 +84,50 @@ class PercentileCalculator:
         # 백분위 계산
         percentile = self.calculate_percentile(value, group_data[component])
         
-        # 등급 판정
-        if percentile is None:
-            grade = None
-        elif percentile < 30:
-            grade = '하위'
-        elif percentile < 70:
-            grade = '평균'
-        else:
-            grade = '상위'
-        
         return {
             'percentile': percentile,
-            'grade': grade
+            'grade': get_grade(percentile)
         }
 
 
+# 연령대 (참조 그룹 키 구성, 계산기 인스턴스 없이도 사용)
+def get_age_group(age, with_suffix=True):
+    if age < 10:
+        age_range = "10-19"
+    elif age < 20:
+        age_range = "10-19"
+    elif age < 30:
+        age_range = "20-29"
+    elif age < 40:
+        age_range = "30-39"
+    elif age < 50:
+        age_range = "40-49"
+    elif age < 60:
+        age_range = "50-59"
+    elif age < 70:
+        age_range = "60-69"
+    elif age < 80:
+        age_range = "70-79"
+    elif age < 90:
+        age_range = "80-89"
+    else:
+        age_range = "90+"
+    
+    return f"{age_range}세" if with_suffix else age_range
+
+
+# 등급 판정
+def get_grade(percentile):
+    if percentile is None:
+        return None
+    elif percentile < 30:
+        return '하위'
+    elif percentile < 70:
+        return '평균'
+    else:
+        return '상위'
+
+
 # 사용자 테스트
 USER_TEST_CONVERSIONS = {
     'plank': {
@@ -266,8 +273,7 @@ def convert_user_test_to_national(test_name, test_value, gender, age):
     conversion_info = USER_TEST_CONVERSIONS[test_name]
     
     # 연령대 계산 ("세" 없는 형식)
-    calculator = PercentileCalculator.__new__(PercentileCalculator)
-    age_group = calculator.get_age_group(age, with_suffix=False)
+    age_group = get_age_group(age, with_suffix=False)
     group_key = f"{gender}_{age_group}"
     
     # 유연성은 특별 처리 (점수 → cm)
@@ -0,0 +1,75 @@
+import asyncio
+import gc
+import logging
+
+from sqlalchemy import text
+
+from src.config import settings
+from src.database.database import SessionLocal, engine, async_engine, read_async_engine, READ_REPLICA_ENABLED
+from src.database.redis import async_redis_client, async_redis_binary_client
+from src.api.endpoints.fitness import get_calculator, get_report_generator
+from src.recommendation.catalog_index import get_catalog_index
+
+logger = logging.getLogger(__name__)
+
+# 멀티 워커 실행 시 공유/워커별 초기화 (gunicorn.conf.py)
+# - 읽기 전용 상태(참조 백분위 테이블, 운동 카탈로그 인덱스, 페르소나 테이블)는 fork 전에 마스터에서 한 번 만들고
+#   gc.freeze() 로 GC 대상에서 빼서 워커들이 copy-on-write 페이지를 그대로 공유
+# - asyncio DB 엔진과 Redis 클라이언트는 import 시점(마스터)에 만들어지지만 fork 전에는 연결을 열지 않음
+#   post_fork 에서 풀을 비워 마스터 상태를 이어받지 않도록 하고, 연결은 워커의 이벤트 루프에서 처음 열림
+# - OpenAI 클라이언트는 fork 후 워커마다 생성 (warm_worker)
+
+
+def preload_shared_state():
+    """fork 전 마스터에서 실행 (실패한 항목은 워커의 첫 요청에서 다시 로드)"""
+    try:
+        get_calculator()
+    except Exception as e:
+        logger.error(f"참조 백분위 테이블 미리 로드 실패: {e}")
+
+    try:
+        with SessionLocal() as db:
+            get_catalog_index(db)
+    except Exception as e:
+        logger.error(f"운동 카탈로그 인덱스 미리 로드 실패: {e}")
+    finally:
+        # 마스터가 연 DB 연결을 워커들이 물려받아 같은 소켓을 쓰지 않도록 정리
+        engine.dispose()
+
+    # 이후 워커에서 GC 가 공유 객체의 헤더를 건드려 페이지가 복사되지 않도록 고정
+    gc.collect()
+    gc.freeze()
+    logger.info(f"공유 상태 미리 로드 완료 (고정 객체 {gc.get_freeze_count()}개)")
+
+
+def reset_after_fork():
+    """fork 직후 워커에서 실행: 마스터에서 만든 asyncio DB/Redis 풀을 비움 (마스터 쪽 연결은 닫지 않음)"""
+    engines = [async_engine, read_async_engine] if READ_REPLICA_ENABLED else [async_engine]
+    for engine_ in engines:
+        engine_.sync_engine.dispose(close=False)
+    for client in (async_redis_client, async_redis_binary_client):
+        client.connection_pool.reset()
+
+
+async def _warm_engine(engine_, connections: int):
+    async def open_one():
+        async with engine_.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # 동시에 열어야 풀에 연결이 connections 개 남음 (순차로 열면 같은 연결을 재사용)
+    await asyncio.gather(*(open_one() for _ in range(connections)))
+
+
+async def warm_worker():
+    """워커 시작 시 실행: LLM 클라이언트 생성, DB 연결 풀 채우기 (첫 요청이 초기화 비용을 내지 않도록)"""
+    try:
+        get_report_generator()
+    except Exception as e:
+        logger.error(f"LLM 클라이언트 초기화 실패: {e}")
+
+    engines = [async_engine, read_async_engine] if READ_REPLICA_ENABLED else [async_engine]
+    for engine_ in engines:
+        try:
+            await _warm_engine(engine_, settings.WORKER_WARM_DB_CONNECTIONS)
+        except Exception as e:
+            logger.error(f"DB 연결 풀 준비 실패: {e}")
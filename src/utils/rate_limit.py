@@ -0,0 +1,155 @@
+import logging
+from contextvars import ContextVar
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+
+from src.config import settings
+from src.database import redis as redis_module
+from src.utils.metrics import RATE_LIMIT_DECISIONS
+
+logger = logging.getLogger(__name__)
+
+# LLM 엔드포인트 요청 제한
+# - 사용자별 토큰 버킷: 보충/차감과 오늘 LLM 토큰 사용량 조회를 Lua 스크립트 1번(왕복 1번)으로 처리
+#   여러 워커/인스턴스가 같은 버킷을 공유하고, 시각은 Redis TIME 기준이라 서버 간 시계 차이와 무관
+# - 하루 LLM 토큰 예산: 응답의 usage 를 요청이 끝난 뒤 INCRBY 로 누적
+#   예산을 넘으면 fallback 이 있는 엔드포인트(/score 리포트)는 기본 리포트, 없는 엔드포인트(/routine)는 429
+
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    allowed = 1
+    tokens = tokens - 1
+else
+    retry_after = math.ceil((1 - tokens) / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+
+local used = tonumber(redis.call('GET', KEYS[2]) or '0')
+return {allowed, math.floor(tokens), retry_after, used}
+"""
+
+# (method, path) -> 제한 설정 (rate: 초당 보충 토큰, burst: 버킷 크기, budget_fallback: 예산 초과 시 non-LLM 경로 여부)
+ENDPOINT_LIMITS: Dict[Tuple[str, str], Dict[str, Any]] = {
+    ("POST", f"{settings.API_V1_PREFIX}/routine"): {
+        "name": "routine",
+        "rate": settings.RATE_LIMIT_ROUTINE_PER_MINUTE / 60.0,
+        "burst": settings.RATE_LIMIT_ROUTINE_BURST,
+        "budget_fallback": False,
+    },
+    ("POST", f"{settings.API_V1_PREFIX}/score"): {
+        "name": "score",
+        "rate": settings.RATE_LIMIT_SCORE_PER_MINUTE / 60.0,
+        "burst": settings.RATE_LIMIT_SCORE_BURST,
+        "budget_fallback": True,
+    },
+}
+
+BUDGET_KEY_TTL = 2 * 86400
+
+
+class LLMQuota:
+    """요청 1건의 LLM 예산 상태 (ContextVar 로 엔드포인트/스레드풀의 LLM 호출까지 전달)"""
+
+    def __init__(self, identity: str, exhausted: bool = False):
+        self.identity = identity
+        self.exhausted = exhausted
+        self.tokens = 0
+
+
+current_llm_quota: ContextVar[Optional[LLMQuota]] = ContextVar("llm_quota", default=None)
+
+
+def llm_budget_exhausted() -> bool:
+    """현재 요청 사용자의 오늘 LLM 토큰 예산이 소진됐는지 (제한 대상 요청이 아니면 False)"""
+    quota = current_llm_quota.get()
+    return quota is not None and quota.exhausted
+
+
+def add_llm_usage(usage) -> None:
+    """OpenAI 응답 usage 를 현재 요청의 예산 사용량에 더함 (요청이 끝나면 RateLimiter.record_usage 로 반영)"""
+    quota = current_llm_quota.get()
+    if quota is None or usage is None:
+        return
+    quota.tokens += getattr(usage, "total_tokens", 0) or 0
+
+
+class RateLimitDecision:
+    def __init__(self, allowed: bool, remaining: int = 0, retry_after: int = 0, budget_exhausted: bool = False):
+        self.allowed = allowed
+        self.remaining = remaining
+        self.retry_after = retry_after
+        self.budget_exhausted = budget_exhausted
+
+
+class RateLimiter:
+    """
+    사용자(식별자) x 엔드포인트 토큰 버킷 + 사용자별 하루 LLM 토큰 예산
+    Redis 장애 시에는 요청을 막지 않습니다 (fail-open).
+    """
+
+    def __init__(self, daily_budget: int):
+        self.daily_budget = daily_budget
+        self._script = None
+
+    @property
+    def redis(self):
+        return redis_module.get_async_redis()
+
+    @staticmethod
+    def bucket_key(name: str, identity: str) -> str:
+        return f"ratelimit:{name}:{identity}"
+
+    @staticmethod
+    def budget_key(identity: str, day: Optional[date] = None) -> str:
+        return f"llm:budget:{identity}:{(day or date.today()):%Y%m%d}"
+
+    async def check(self, identity: str, limit: Dict[str, Any]) -> RateLimitDecision:
+        if self._script is None:
+            # EVALSHA 로 호출하고 스크립트 캐시에 없으면(NOSCRIPT) 자동으로 EVAL
+            self._script = self.redis.register_script(TOKEN_BUCKET_SCRIPT)
+        try:
+            allowed, remaining, retry_after, used = await self._script(
+                keys=[self.bucket_key(limit["name"], identity), self.budget_key(identity)],
+                args=[limit["rate"], limit["burst"]],
+                client=self.redis,
+            )
+        except Exception as e:
+            RATE_LIMIT_DECISIONS.labels(limit["name"], "error").inc()
+            logger.warning(f"요청 제한 확인 실패 (요청 허용): {e}")
+            return RateLimitDecision(True)
+
+        budget_exhausted = 0 < self.daily_budget <= used
+        if not allowed:
+            result = "limited"
+        elif budget_exhausted:
+            result = "budget_fallback" if limit["budget_fallback"] else "budget_exceeded"
+        else:
+            result = "allowed"
+        RATE_LIMIT_DECISIONS.labels(limit["name"], result).inc()
+        return RateLimitDecision(bool(allowed), int(remaining), int(retry_after), budget_exhausted)
+
+    async def record_usage(self, identity: str, tokens: int):
+        """요청에서 사용한 LLM 토큰을 오늘 예산에 누적"""
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.incrby(self.budget_key(identity), tokens)
+            pipe.expire(self.budget_key(identity), BUDGET_KEY_TTL)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"LLM 토큰 사용량 기록 실패 ({identity}, {tokens} tokens): {e}")
+
+
+rate_limiter = RateLimiter(daily_budget=settings.LLM_DAILY_TOKEN_BUDGET)
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from src.config import settings
+from src.database.database import async_engine, read_async_engine, READ_REPLICA_ENABLED
+from src.database.redis import async_redis_client
+from src.recommendation.catalog_index import loaded_catalog_version
+from src.utils.cache import cache_stats
+from src.utils.circuit_breaker import llm_circuit
+
+logger = logging.getLogger(__name__)
+
+# 준비 상태 판단에 필요한 점검 (llm 은 fallback 이 있으므로 실패해도 degraded)
+REQUIRED_CHECKS = ("database", "redis", "reference_table")
+
+
+async def _check_database(engine) -> Dict[str, Any]:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    return {"pool": engine.pool.status()}
+
+
+async def _check_redis() -> Dict[str, Any]:
+    await async_redis_client.ping()
+    return {}
+
+
+async def _check_reference_table() -> Dict[str, Any]:
+    path = Path(settings.REFERENCE_DATA_PATH)
+    stat = path.stat()  # 파일이 없으면 FileNotFoundError -> error
+    return {
+        "path": str(path),
+        "version": datetime.fromtimestamp(stat.st_mtime).isoformat(timespec="seconds"),
+        "size": stat.st_size,
+        "catalog_version": [str(v) for v in loaded_catalog_version() or ()] or None,
+    }
+
+
+async def _check_llm() -> Dict[str, Any]:
+    circuit = llm_circuit.snapshot()
+    if circuit["state"] == llm_circuit.OPEN:
+        raise RuntimeError(f"circuit open ({circuit['last_failure']})")
+    return {"circuit": circuit}
+
+
+class ReadinessMonitor:
+    """
+    백그라운드에서 주기적으로 의존성을 점검하고 마지막 결과(스냅샷)를 보관합니다.
+    /readyz, /health 는 이 스냅샷만 반환하므로 프로브 횟수와 무관하게 DB/Redis 부하가 일정합니다.
+    """
+
+    def __init__(self, interval: float, timeout: float):
+        self.interval = interval
+        self.timeout = timeout
+        self.snapshot: Optional[Dict[str, Any]] = None
+        self._refreshed_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def _checks(self):
+        checks = {
+            "database": lambda: _check_database(async_engine),
+            "redis": _check_redis,
+            "reference_table": _check_reference_table,
+            "llm": _check_llm,
+        }
+        if READ_REPLICA_ENABLED:
+            checks["database_read"] = lambda: _check_database(read_async_engine)
+        return checks
+
+    async def _run_check(self, check) -> Dict[str, Any]:
+        start = time.perf_counter()
+        result = {"status": "ok"}
+        try:
+            result.update(await asyncio.wait_for(check(), timeout=self.timeout))
+        except asyncio.TimeoutError:
+            result = {"status": "error", "error": f"timeout ({self.timeout}s)"}
+        except Exception as e:
+            result = {"status": "error", "error": f"{type(e).__name__}: {e}"[:200]}
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        result["checked_at"] = datetime.now().isoformat(timespec="milliseconds")
+        return result
+
+    async def refresh(self):
+        checks = self._checks()
+        results = await asyncio.gather(*[self._run_check(c) for c in checks.values()])
+        components = dict(zip(checks.keys(), results))
+
+        required = [name for name in REQUIRED_CHECKS if name in components]
+        if any(components[name]["status"] != "ok" for name in required):
+            status = "not_ready"
+        elif any(c["status"] != "ok" for c in components.values()):
+            status = "degraded"
+        else:
+            status = "ready"
+
+        self.snapshot = {
+            "status": status,
+            "refreshed_at": datetime.now().isoformat(timespec="milliseconds"),
+            "components": components,
+            "caches": cache_stats(),
+        }
+        self._refreshed_at = time.monotonic()
+
+    def is_stale(self) -> bool:
+        """백그라운드 갱신이 멈췄는지 (갱신 주기 3배 이상 지남)"""
+        return self.snapshot is None or time.monotonic() - self._refreshed_at > self.interval * 3
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"준비 상태 점검 실패: {e}")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+readiness = ReadinessMonitor(
+    interval=settings.READINESS_REFRESH_INTERVAL,
+    timeout=settings.READINESS_CHECK_TIMEOUT
+)
@@ -0,0 +1,92 @@
+import functools
+import logging
+import random
+import threading
+from typing import Optional
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+# LangSmith 트레이싱 래퍼
+# - LANGSMITH_API_KEY 가 없으면 데코레이터/클라이언트 래핑 모두 원본을 그대로 반환 (오버헤드 0)
+# - 요청 단위로 샘플링하고, 샘플링되지 않은 호출은 하위 OpenAI 호출까지 트레이싱을 끔
+# - 전송은 langsmith Client 의 백그라운드 배치 큐에서 처리하며,
+#   큐 적체가 LANGSMITH_MAX_PENDING_RUNS 를 넘으면 새 트레이스를 버려 메모리를 제한
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def tracing_enabled() -> bool:
+    return bool(
+        settings.LANGSMITH_TRACING
+        and settings.LANGSMITH_API_KEY
+        and settings.LANGSMITH_TRACING_SAMPLE_RATE > 0
+    )
+
+
+def get_tracing_client():
+    """백그라운드 배치 전송을 사용하는 LangSmith 클라이언트 (최초 사용 시 생성)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from langsmith import Client
+                _client = Client(
+                    api_url=settings.LANGSMITH_ENDPOINT,
+                    api_key=settings.LANGSMITH_API_KEY,
+                    auto_batch_tracing=True,
+                )
+                logger.info(
+                    f"LangSmith 트레이싱 활성화 (sample_rate={settings.LANGSMITH_TRACING_SAMPLE_RATE})"
+                )
+    return _client
+
+
+def _has_capacity() -> bool:
+    queue = getattr(_client, "tracing_queue", None)
+    if queue is None:
+        return True
+    return queue.qsize() < settings.LANGSMITH_MAX_PENDING_RUNS
+
+
+def _should_sample() -> bool:
+    return random.random() < settings.LANGSMITH_TRACING_SAMPLE_RATE and _has_capacity()
+
+
+def traceable(run_type: str = "chain", name: Optional[str] = None):
+    """샘플링이 적용된 langsmith.traceable"""
+
+    def decorator(func):
+        if not tracing_enabled():
+            return func
+
+        from langsmith import traceable as ls_traceable, tracing_context
+
+        traced = None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal traced
+            if not _should_sample():
+                # 하위 wrap_openai 호출도 트레이싱하지 않도록 컨텍스트에서 비활성화
+                with tracing_context(enabled=False):
+                    return func(*args, **kwargs)
+            client = get_tracing_client()
+            if traced is None:
+                traced = ls_traceable(run_type=run_type, name=name, client=client)(func)
+            with tracing_context(enabled=True, client=client, project_name=settings.LANGSMITH_PROJECT):
+                return traced(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def wrap_llm_client(client):
+    """트레이싱이 켜져 있을 때만 OpenAI 클라이언트를 wrap_openai 로 감쌈"""
+    if not tracing_enabled():
+        return client
+    from langsmith.wrappers import wrap_openai
+    return wrap_openai(client)
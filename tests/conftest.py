@@ -0,0 +1,6 @@
+import os
+
+# src.config / src.database.database 는 import 시점에 환경변수를 읽으므로 테스트 모듈보다 먼저 지정
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
@@ -0,0 +1,109 @@
+"""
+서비스 쿼리 실행 계획 점검 (scripts/check_query_plans.py 의 SQLite 버전)
+
+임시 SQLite DB 를 Base.metadata + 마이그레이션으로 만들고 몇 행을 넣은 뒤,
+서비스가 실행하는 SQL 중 카탈로그 외 테이블을 전체 스캔(SCAN)하는 쿼리가 없는지 확인합니다.
+Redis 는 사용하지 않습니다 (캐시는 DB 조회까지 내려가도록 Redis 단계를 끔).
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from scripts.check_query_plans import collect_plans
+from src.database.migrations import upgrade
+from src.database.models import (
+    Base, User, Health, UserRestrict, Exercise, ExerciseRestrict, ExercisePlan, ExerciseList, AnalyzeResult
+)
+from src.utils.cache import auth_login_cache, catalog_cache
+
+# AnalyzeResultRepository.save 는 upsert(INSERT) 한 번이라 점검 대상 쿼리가 없음
+EXPECTED_LABELS = {
+    "auth.get_user_id_by_login",
+    "routine_preparation.aget_user_data",
+    "routine_preparation.aget_candidate_exercises",
+    "AnalysisHistoryRepository.list_before",
+    "ExercisePlanRepository.replace_weekly_routine",
+}
+
+
+def _seed(conn):
+    now = datetime.now()
+    conn.execute(insert(User), [
+        {"id": i, "login_id": f"user{i}", "name": f"사용자{i}", "user_role": "USER", "created_at": now}
+        for i in range(1, 4)
+    ])
+    conn.execute(insert(Health), [
+        {"id": i, "user_id": i, "birth": "1995-01-01", "gender": "M", "height": 175.0, "weight": 70.0,
+         "place": "home", "proficiency": "beginner", "created_at": now}
+        for i in range(1, 4)
+    ])
+    conn.execute(insert(UserRestrict), [
+        {"health_id": 1, "user_restrict": "knee"},
+        {"health_id": 2, "user_restrict": "waist"},
+    ])
+    conn.execute(insert(Exercise), [
+        {"id": i, "exercise_name": f"운동{i}", "reps": 10, "sets": 3, "duration_sec": 30, "rest_sec": 30,
+         "mets": 3.5, "difficulty": "beginner", "equipment": "none", "target_area": "전신",
+         "primary_muscle": "전신", "type": "strength", "created_at": now}
+        for i in range(1, 6)
+    ])
+    conn.execute(insert(ExerciseRestrict), [{"exercise_id": 1, "exercise_restrict": "knee"}])
+    conn.execute(insert(AnalyzeResult), [
+        {"user_id": 1, "average_score": 50.0, "per_agility": 40, "per_body_composition": 60, "per_cardio": 50,
+         "per_core": 30, "per_flexibility": 70, "per_strength": 45, "persona": "BEGINNER"}
+    ])
+    conn.execute(insert(ExercisePlan), [
+        {"id": day, "user_id": 1 + day % 3, "day": day, "title": "", "progress": False}
+        for day in range(1, 8)
+    ])
+    conn.execute(insert(ExerciseList), [
+        {"exercise_plan_id": day, "exercise_id": 1 + day % 5, "sequence": 1}
+        for day in range(1, 8)
+    ])
+
+
+@pytest.fixture
+def database_path(tmp_path, monkeypatch):
+    path = tmp_path / "query_plans.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    upgrade(engine)
+    with engine.begin() as conn:
+        _seed(conn)
+    engine.dispose()
+
+    # Redis 없이 DB 까지 조회하도록 캐시의 Redis 단계를 끔
+    monkeypatch.setattr(auth_login_cache, "redis_ttl", 0)
+    monkeypatch.setattr(catalog_cache, "redis_ttl", 0)
+    return path
+
+
+def _collect(path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        try:
+            session_factory = async_sessionmaker(
+                bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+            )
+            return await collect_plans(engine, session_factory)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def test_service_queries_do_not_scan_non_catalog_tables(database_path):
+    plans = _collect(database_path)
+
+    # 모든 서비스 경로가 실제로 쿼리를 실행했는지 (시드 데이터가 빠지면 점검 없이 통과하지 않도록)
+    assert EXPECTED_LABELS <= {label for label, _, _, _ in plans}
+
+    violations = [
+        f"{label}: {', '.join(bad)}\n    {' '.join(statement.split())}\n    " + "\n    ".join(lines)
+        for label, statement, lines, bad in plans
+        if bad
+    ]
+    assert not violations, "전체 스캔 쿼리:\n" + "\n".join(violations)